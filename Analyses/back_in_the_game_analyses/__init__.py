@@ -1,14 +1,136 @@
+from importlib import import_module
+from typing import Any
+
 from .version import __version__
 
-from .data import Data, DataAxis, DataTag, DataType
-from .data_extraction import data_extraction, DataMetrics, DataIndicesExtraction
+from .data import (
+    Data,
+    DataAxis,
+    DataBackend,
+    DataTag,
+    DataType,
+    DerivativeMethod,
+    binary_recording_path,
+    convert_to_binary,
+)
+from .sampling import SamplingReport, estimate_sampling_rate, resample_uniform, sampling_report
+from .data_extraction import data_extraction, jump_segmentation, required_tags, DataMetrics, JumpEpisode, CORE_METRICS
+from .events import DataIndicesExtraction, JumpCrossings, JumpCrossingsGrid, jump_events, jump_episodes, all_jump_events
+from .registry import MetricDefinition, MetricRegistry, MetricWindow
+from .profiling import Profiler, active_profiler, profile, profiled_stage
+from .cohort import Cohort
+from .rolling import (
+    rolling_metrics,
+    rolling_horizontal_dispersion,
+    rolling_acceleration_peak,
+    rolling_traveled_distance,
+    rolling_window_starts,
+)
+
+# The modules running the analyses over many recordings (batches, stores, reports, live ingestion, sweeps and
+# figures) are only imported when one of their names is first used (PEP 562), so the worker processes and the scripts
+# analysing single recordings do not pay for them
+_LAZY_NAMES = {
+    "extract_many": "batch",
+    "iter_extract_many": "batch",
+    "ExtractionResult": "batch",
+    "ReportFormat": "report",
+    "ReportWriter": "report",
+    "iter_report_rows": "report",
+    "report_to_xlsx": "report",
+    "MetricsStore": "metrics_store",
+    "RecordingFingerprint": "metrics_store",
+    "StreamingData": "streaming",
+    "StreamingJumpDetector": "streaming",
+    "StreamingEvent": "streaming",
+    "CsvTail": "ingest",
+    "RecordingWatcher": "ingest",
+    "threshold_sweep": "sweep",
+    "threshold_sweep_many": "sweep",
+    "PlotFormat": "plotting",
+    "HeadKinematicsPlot": "plotting",
+    "head_kinematics_plot": "plotting",
+    "draw_head_kinematics": "plotting",
+    "save_head_kinematics": "plotting",
+    "render_head_kinematics_many": "plotting",
+    "iter_extract_and_render_many": "plotting",
+    "minmax_decimation_indices": "plotting",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_LAZY_NAMES[name]}", __name__), name)
+    # Cached, so the next accesses do not go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
 
 __all__ = [
     Data.__name__,
     DataAxis.__name__,
+    DataBackend.__name__,
     DataTag.__name__,
     DataType.__name__,
+    DerivativeMethod.__name__,
+    binary_recording_path.__name__,
+    convert_to_binary.__name__,
+    SamplingReport.__name__,
+    estimate_sampling_rate.__name__,
+    resample_uniform.__name__,
+    sampling_report.__name__,
     data_extraction.__name__,
+    jump_segmentation.__name__,
+    required_tags.__name__,
     DataMetrics.__name__,
+    JumpEpisode.__name__,
+    "CORE_METRICS",
+    MetricDefinition.__name__,
+    MetricRegistry.__name__,
+    MetricWindow.__name__,
     DataIndicesExtraction.__name__,
+    JumpCrossings.__name__,
+    JumpCrossingsGrid.__name__,
+    jump_events.__name__,
+    jump_episodes.__name__,
+    all_jump_events.__name__,
+    "extract_many",
+    "iter_extract_many",
+    "ExtractionResult",
+    "ReportFormat",
+    "ReportWriter",
+    "iter_report_rows",
+    "report_to_xlsx",
+    Profiler.__name__,
+    active_profiler.__name__,
+    profile.__name__,
+    profiled_stage.__name__,
+    Cohort.__name__,
+    rolling_metrics.__name__,
+    rolling_horizontal_dispersion.__name__,
+    rolling_acceleration_peak.__name__,
+    rolling_traveled_distance.__name__,
+    rolling_window_starts.__name__,
+    "MetricsStore",
+    "RecordingFingerprint",
+    "StreamingData",
+    "StreamingJumpDetector",
+    "StreamingEvent",
+    "CsvTail",
+    "RecordingWatcher",
+    "threshold_sweep",
+    "threshold_sweep_many",
+    "PlotFormat",
+    "HeadKinematicsPlot",
+    "head_kinematics_plot",
+    "draw_head_kinematics",
+    "save_head_kinematics",
+    "render_head_kinematics_many",
+    "iter_extract_and_render_many",
+    "minmax_decimation_indices",
 ]
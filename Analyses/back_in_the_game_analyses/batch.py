@@ -0,0 +1,266 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import traceback
+from typing import Any, Callable, Iterable, Iterator
+
+import numpy as np
+
+from .data import Data, DataBackend, DerivativeMethod
+from .data_extraction import data_extraction, required_tags, DataMetrics, JumpEpisode
+from .metrics_store import MetricsStore, RecordingFingerprint
+from .profiling import active_profiler, profile, Profiler, record_cache
+
+
+class ExtractionResult:
+    def __init__(
+        self,
+        path: Path,
+        metrics: dict[DataMetrics, Any] | list[JumpEpisode] | None = None,
+        error: str | None = None,
+        from_store: bool = False,
+        profile: dict[str, Any] | None = None,
+    ):
+        """
+        The outcome of the extraction of a single recording.
+
+        Parameters
+        ----------
+        path : Path
+            Path to the recording.
+        metrics : dict[DataMetrics, Any] | list[JumpEpisode] | None
+            The output of the extraction function (`data_extraction` by default), None if the extraction failed.
+        error : str | None
+            The formatted traceback of the exception raised while processing the recording, None if it succeeded.
+        from_store : bool
+            Whether the metrics were read from a MetricsStore instead of being computed.
+        profile : dict[str, Any] | None
+            The statistics collected while processing the recording (see `Profiler.to_dict`), None if the profiling
+            was disabled.
+        """
+        self._path = Path(path)
+        self._metrics = metrics
+        self._error = error
+        self._from_store = from_store
+        self._profile = profile
+
+    @property
+    def path(self) -> Path:
+        """Returns the path to the recording."""
+        return self._path
+
+    @property
+    def metrics(self) -> dict[DataMetrics, Any] | list[JumpEpisode] | None:
+        """Returns the extracted metrics, None if the extraction failed."""
+        return self._metrics
+
+    @property
+    def error(self) -> str | None:
+        """Returns the traceback of the failure, None if the extraction succeeded."""
+        return self._error
+
+    @property
+    def succeeded(self) -> bool:
+        """Returns whether the metrics were successfully extracted."""
+        return self._error is None
+
+    @property
+    def from_store(self) -> bool:
+        """Returns whether the metrics were read from a MetricsStore instead of being computed."""
+        return self._from_store
+
+    @property
+    def profile(self) -> dict[str, Any] | None:
+        """Returns the statistics collected while processing the recording, None if the profiling was disabled."""
+        return self._profile
+
+
+def _extract_one(
+    path: Path, extraction: Callable[[Data], Any], data_kwargs: dict[str, Any], profiling: bool = False
+) -> ExtractionResult:
+    """Loads and extracts a single recording. Any exception is captured so it does not abort the whole batch."""
+    if profiling:
+        # The statistics are collected apart, as the worker processes do not share the profiler of the caller
+        with profile() as profiler:
+            result = _extract_one(path, extraction, data_kwargs)
+        return ExtractionResult(result.path, result.metrics, result.error, profile=profiler.to_dict())
+
+    try:
+        data_kwargs = {"tags": required_tags(), **data_kwargs}
+        return ExtractionResult(path, metrics=extraction(Data(path, **data_kwargs)))
+    except Exception:
+        return ExtractionResult(path, error=traceback.format_exc())
+
+
+def _extract_all(
+    paths: list[Path], workers: int, chunksize: int, extraction: Callable[[Data], Any], data_kwargs: dict[str, Any]
+) -> Iterator[ExtractionResult]:
+    """Extracts the recordings, in parallel if requested, yielding the results in the same order as paths."""
+    profiler = active_profiler()
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield _merge_profile(_extract_one(path, extraction, data_kwargs, profiling=profiler is not None), profiler)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        results = executor.map(
+            _extract_one,
+            paths,
+            [extraction] * len(paths),
+            [data_kwargs] * len(paths),
+            [profiler is not None] * len(paths),
+            chunksize=chunksize,
+        )
+        for result in results:
+            yield _merge_profile(result, profiler)
+
+
+def _merge_profile(result: ExtractionResult, profiler: Profiler | None) -> ExtractionResult:
+    """Adds the statistics collected while processing the recording to the profiler of the caller."""
+    if profiler is not None and result.profile is not None:
+        profiler.merge(result.profile)
+    return result
+
+
+def _stored_result(store: MetricsStore, path: Path) -> ExtractionResult | RecordingFingerprint:
+    """
+    Returns the stored metrics of a recording, or its fingerprint if they must be computed. As for the extraction, any
+    exception (e.g. the file was removed) is captured so it does not abort the whole batch.
+    """
+    try:
+        metrics, fingerprint = store.lookup(path)
+    except Exception:
+        return ExtractionResult(path, error=traceback.format_exc())
+
+    record_cache("MetricsStore.get", hit=metrics is not None)
+    return fingerprint if metrics is None else ExtractionResult(path, metrics=metrics, from_store=True)
+
+
+def _metric_options(data_kwargs: dict[str, Any]) -> list[str]:
+    """
+    Returns the Data options of data_kwargs that change the values of the metrics. The entries of a MetricsStore are
+    not keyed on them, so the stored metrics would be returned whatever their values.
+    """
+    options = []
+    if data_kwargs.get("backend", DataBackend.PANDAS) == DataBackend.COMPACT:
+        options.append("backend=COMPACT")
+    if data_kwargs.get("dtype", np.float64) != np.float64:
+        options.append(f"dtype={data_kwargs['dtype'].__name__}")
+    if data_kwargs.get("derivative_method", DerivativeMethod.CENTRAL_DIFFERENCE) != DerivativeMethod.CENTRAL_DIFFERENCE:
+        options.append(f"derivative_method={data_kwargs['derivative_method'].name}")
+    if data_kwargs.get("resample", False):
+        options.append("resample=True")
+    return options
+
+
+def iter_extract_many(
+    paths: Iterable[Path],
+    workers: int = 1,
+    chunksize: int = 1,
+    store: MetricsStore | None = None,
+    extraction: Callable[[Data], Any] = data_extraction,
+    **data_kwargs,
+) -> Iterator[ExtractionResult]:
+    """
+    Lazily extracts the metrics of several recordings, yielding the results in the same order as paths.
+
+    Parameters
+    ----------
+    paths : Iterable[Path]
+        The recordings to process.
+    workers : int
+        The number of worker processes. If 1 (or less), the recordings are processed in the current process.
+    chunksize : int
+        The number of recordings sent at once to each worker. Larger values reduce the inter-process overhead
+        for large batches of short recordings.
+    store : MetricsStore | None
+        If provided, the recordings already analysed (and unchanged since) are read from the store, and only the new
+        or modified recordings are processed. Their metrics are then added to the store.
+    extraction : Callable[[Data], Any]
+        The function applied to each recording, e.g. `jump_segmentation` to get one set of metrics per jump. It must
+        be defined at the top level of a module so it can be sent to the workers. A store can only be used with
+        `data_extraction` and the Data options that do not change the metrics (e.g. not the COMPACT backend).
+    **data_kwargs
+        Additional keyword arguments forwarded to the `Data` constructor (e.g. backend). Unless specified, only the
+        DataTag groups needed by `data_extraction` are loaded.
+
+    Yields
+    ------
+    ExtractionResult
+        The outcome for each recording, in the order of paths.
+    """
+    if store is not None and extraction is not data_extraction:
+        raise ValueError("A MetricsStore only holds the outputs of data_extraction")
+    if store is not None and _metric_options(data_kwargs):
+        raise ValueError(
+            f"A MetricsStore only holds the metrics computed with the default Data options, it cannot be used with "
+            f"{', '.join(_metric_options(data_kwargs))}"
+        )
+
+    paths = [Path(path) for path in paths]
+    # The recordings to analyse are fingerprinted before their analysis, so a recording modified in the meantime is
+    # stored under its analysed content and analysed again by the next batch
+    stored = [None if store is None else _stored_result(store, path) for path in paths]
+
+    computed = _extract_all(
+        [path for path, result in zip(paths, stored) if not isinstance(result, ExtractionResult)],
+        workers,
+        chunksize,
+        extraction,
+        data_kwargs,
+    )
+    for path, result in zip(paths, stored):
+        if isinstance(result, ExtractionResult):
+            yield result
+            continue
+
+        fingerprint = result
+        result = next(computed)
+        if store is not None and result.succeeded:
+            store.put(path, result.metrics, fingerprint=fingerprint)
+        yield result
+
+
+def extract_many(
+    paths: Iterable[Path],
+    workers: int = 1,
+    chunksize: int = 1,
+    on_result: Callable[[ExtractionResult], None] | None = None,
+    store: MetricsStore | None = None,
+    extraction: Callable[[Data], Any] = data_extraction,
+    **data_kwargs,
+) -> list[ExtractionResult]:
+    """
+    Extracts the metrics of several recordings, optionally in parallel. A failing recording does not interrupt the
+    batch, its error is reported in the corresponding ExtractionResult instead.
+
+    Parameters
+    ----------
+    paths : Iterable[Path]
+        The recordings to process.
+    workers : int
+        The number of worker processes. If 1 (or less), the recordings are processed in the current process.
+    chunksize : int
+        The number of recordings sent at once to each worker.
+    on_result : Callable[[ExtractionResult], None] | None
+        Called with each result as soon as it is available (in the order of paths), e.g. to report progress.
+    store : MetricsStore | None
+        If provided, only the recordings that are not already in the store are processed (see `iter_extract_many`).
+    extraction : Callable[[Data], Any]
+        The function applied to each recording (see `iter_extract_many`).
+    **data_kwargs
+        Additional keyword arguments forwarded to the `Data` constructor (e.g. backend).
+
+    Returns
+    -------
+    list[ExtractionResult]
+        The outcome for each recording, in the order of paths.
+    """
+    results = []
+    results_iterator = iter_extract_many(
+        paths, workers=workers, chunksize=chunksize, store=store, extraction=extraction, **data_kwargs
+    )
+    for result in results_iterator:
+        if on_result is not None:
+            on_result(result)
+        results.append(result)
+    return results
@@ -0,0 +1,161 @@
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from .data import Data, DataAxis, DataBackend, DataTag, DataType
+from .data_extraction import DataMetrics, required_tags
+from .maths import central_derivative_array, compute_norm_array, fit_confidence_ellipse_batch
+
+
+class Cohort:
+    def __init__(self, data: Iterable[Data], tags: Iterable[DataTag] | None = None):
+        """
+        Many trials stacked into 3D arrays of shape (n_frames, n_trials, n_columns), so the metrics of the whole cohort
+        are computed by a handful of NumPy operations instead of one Python call chain per trial. The trials shorter
+        than the longest one are padded with NaN at the end, their actual number of frames is given by `lengths`.
+
+        Parameters
+        ----------
+        data : Iterable[Data]
+            The trials of the cohort.
+        tags : Iterable[DataTag] | None
+            The DataTag groups to stack. If None, the groups loaded in all the trials are stacked.
+        """
+        data = list(data)
+        if tags is None:
+            tags = [tag for tag in DataTag if tag != DataTag.FRAME and all(tag in trial.tags for trial in data)]
+        self._tags = list(tags)
+
+        self._lengths = np.array([trial.shape[0] for trial in data], dtype=np.int64)
+        periods = [np.nan if trial.sampling_period is None else trial.sampling_period for trial in data]
+        self._sampling_periods = np.array(periods, dtype=np.float64)
+        n_frames = int(self._lengths.max(initial=0))
+        self._time = np.full((n_frames, len(data)), np.nan)
+        self._arrays = {tag: np.full((n_frames, len(data), len(tag.value)), np.nan) for tag in self._tags}
+        for i, (trial, length) in enumerate(zip(data, self._lengths)):
+            self._time[:length, i] = trial.time_array
+            for tag in self._tags:
+                self._arrays[tag][:length, i] = trial.get_array(tag)
+        self._derivatives = {}
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[Path], tags: Iterable[DataTag] | None = None, **data_kwargs) -> "Cohort":
+        """
+        Loads and stacks the trials.
+
+        Parameters
+        ----------
+        paths : Iterable[Path]
+            The recordings of the cohort.
+        tags : Iterable[DataTag] | None
+            The DataTag groups to load. If None, the groups needed by `metrics` are loaded.
+        **data_kwargs
+            Additional keyword arguments forwarded to the `Data` constructor (e.g. prefer_binary).
+
+        Returns
+        -------
+        Cohort
+            The stacked trials.
+        """
+        tags = sorted(required_tags(_COHORT_METRICS) if tags is None else tags, key=lambda tag: tag.name)
+        data_kwargs = {"backend": DataBackend.NUMPY, **data_kwargs}
+        return cls((Data(path, tags=tags, **data_kwargs) for path in paths), tags=tags)
+
+    @property
+    def tags(self) -> list[DataTag]:
+        """Returns the stacked DataTag groups."""
+        return self._tags
+
+    @property
+    def n_trials(self) -> int:
+        """Returns the number of trials of the cohort."""
+        return self._lengths.shape[0]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Returns the number of frames of each trial, of shape (n_trials,)."""
+        return self._lengths
+
+    @property
+    def sampling_periods(self) -> np.ndarray:
+        """
+        Returns the period (s) of the uniform timebase of each trial, of shape (n_trials,), NaN for the trials that
+        were not resampled (see `Data.sampling_period`).
+        """
+        return self._sampling_periods
+
+    @property
+    def time(self) -> np.ndarray:
+        """Returns the time of each frame of each trial, of shape (n_frames, n_trials)."""
+        return self._time
+
+    def get(
+        self, tag: DataTag, data_type: DataType = DataType.VALUE, axis: DataAxis = DataAxis.ALL, window: int = 10
+    ) -> np.ndarray:
+        """Returns the specified data type of all the trials, of shape (n_frames, n_trials, n_axes)."""
+        return self._derivative(tag, data_type.derivative_order, window)[:, :, axis.value]
+
+    def _derivative(self, tag: DataTag, order: int, window: int) -> np.ndarray:
+        """Returns the derivative of the requested order of all the trials, computing (and caching) it if needed."""
+        if order == 0:
+            if tag not in self._arrays:
+                raise ValueError(f"The tag {tag.name} was not stacked in the cohort")
+            return self._arrays[tag]
+
+        key = (tag, order, window)
+        if key not in self._derivatives:
+            # The padding is NaN, so the frames whose window reaches past the end of a trial are NaN, as for a
+            # single trial. As for a single trial, the resampled trials are differentiated with their period.
+            periods = None if np.isnan(self._sampling_periods).all() else self._sampling_periods
+            self._derivatives[key] = central_derivative_array(
+                self._derivative(tag, order - 1, window), self._time, window, period=periods
+            )
+        return self._derivatives[key]
+
+    def horizontal_dispersion(self, tag: DataTag) -> np.ndarray:
+        """Returns the horizontal dispersion (area of the confidence ellipse) of each trial, of shape (n_trials,)."""
+        return fit_confidence_ellipse_batch(self.get(tag, axis=DataAxis.HORIZONTAL), self._lengths).area
+
+    def acceleration_peak(self, tag: DataTag, axis: DataAxis = DataAxis.ALL) -> np.ndarray:
+        """Returns the peak acceleration of each trial, of shape (n_trials,)."""
+        peaks = compute_norm_array(self.get(tag, data_type=DataType.ACCELERATION, axis=axis)).max(axis=1)
+        peaks[self._lengths == 0] = np.nan
+        return peaks
+
+    def traveled_distance(self, tag: DataTag) -> np.ndarray:
+        """Returns the total traveled distance of each trial, of shape (n_trials,)."""
+        position = self.get(tag)
+        diffs = np.zeros_like(position)
+        diffs[1:] = np.diff(position, axis=0)
+        distances = compute_norm_array(diffs**2).sum(axis=1)
+        distances[self._lengths == 0] = np.nan
+        return distances
+
+    def metrics(self) -> dict[DataMetrics, np.ndarray]:
+        """
+        Returns the metrics of the whole trials (the OVERALL metrics of `data_extraction`) of each trial. They match
+        the values of `data_extraction` up to floating point rounding, as the sums are not accumulated in the same
+        order.
+
+        Returns
+        -------
+        dict[DataMetrics, np.ndarray]
+            The value of each metric for each trial, of shape (n_trials,).
+        """
+        return {
+            DataMetrics.OVERALL_HEAD_HORIZONTAL_DISPERSION: self.horizontal_dispersion(DataTag.HEAD_POSITION),
+            DataMetrics.OVERALL_LEFT_HAND_ACCELERATION_PEAK: self.acceleration_peak(DataTag.LEFT_HAND_POSITION),
+            DataMetrics.OVERALL_RIGHT_HAND_ACCELERATION_PEAK: self.acceleration_peak(DataTag.RIGHT_HAND_POSITION),
+            DataMetrics.OVERALL_LEFT_HAND_TRAVELED_DISTANCE: self.traveled_distance(DataTag.LEFT_HAND_POSITION),
+            DataMetrics.OVERALL_RIGHT_HAND_TRAVELED_DISTANCE: self.traveled_distance(DataTag.RIGHT_HAND_POSITION),
+        }
+
+
+_COHORT_METRICS = (
+    DataMetrics.OVERALL_HEAD_HORIZONTAL_DISPERSION,
+    DataMetrics.OVERALL_LEFT_HAND_ACCELERATION_PEAK,
+    DataMetrics.OVERALL_RIGHT_HAND_ACCELERATION_PEAK,
+    DataMetrics.OVERALL_LEFT_HAND_TRAVELED_DISTANCE,
+    DataMetrics.OVERALL_RIGHT_HAND_TRAVELED_DISTANCE,
+)
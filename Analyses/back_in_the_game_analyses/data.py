@@ -1,9 +1,12 @@
 from enum import Enum
 import numpy as np
 from pathlib import Path
+from typing import Iterable
 import pandas as pd
 
-from .maths import central_derivative
+from .maths import central_derivative, central_derivative_array, recursive_derivatives, savitzky_golay_derivatives
+from .profiling import profiled, profiled_stage, record_cache
+from .sampling import SamplingReport, resample_uniform, sampling_report
 
 
 class DataAxis(Enum):
@@ -32,41 +35,559 @@ class DataType(Enum):
     VELOCITY = "velocity"
     ACCELERATION = "acceleration"
 
+    @property
+    def derivative_order(self) -> int:
+        """Returns the number of time derivatives separating this data type from the raw values."""
+        if self == DataType.VALUE:
+            return 0
+        elif self == DataType.VELOCITY:
+            return 1
+        elif self == DataType.ACCELERATION:
+            return 2
+        else:
+            raise ValueError(f"Unsupported data type: {self}")
+
+
+class DataBackend(Enum):
+    PANDAS = "pandas"
+    NUMPY = "numpy"
+    COMPACT = "compact"
+
+
+class DerivativeMethod(Enum):
+    CENTRAL_DIFFERENCE = "central_difference"
+    SAVITZKY_GOLAY = "savitzky_golay"
+    RECURSIVE = "recursive"
+
+
+BINARY_RECORDING_SUFFIX = ".npyrec"
+
+
+def binary_recording_path(data_path: Path) -> Path:
+    """Returns the path of the binary recording associated with a CSV recording."""
+    return Path(data_path).with_suffix(BINARY_RECORDING_SUFFIX)
+
+
+def is_binary_recording(data_path: Path) -> bool:
+    """Returns whether the path points to a binary recording (see `convert_to_binary`)."""
+    data_path = Path(data_path)
+    return data_path.suffix == BINARY_RECORDING_SUFFIX and data_path.is_dir()
+
+
+def convert_to_binary(data_path: Path, output_path: Path | None = None) -> Path:
+    """
+    Converts a CSV recording into a binary recording. A binary recording is a folder holding one `.npy` file per
+    DataTag group (plus the frames), so each group can be memory-mapped independently when the recording is loaded.
+
+    Parameters
+    ----------
+    data_path : Path
+        Path to the CSV file exported by the Unity application.
+    output_path : Path | None
+        Path of the binary recording. Defaults to the CSV path with the BINARY_RECORDING_SUFFIX suffix.
+
+    Returns
+    -------
+    Path
+        The path of the binary recording.
+    """
+    data = Data(data_path, backend=DataBackend.NUMPY)
+    output_path = binary_recording_path(data_path) if output_path is None else Path(output_path)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    np.save(output_path / f"{DataTag.FRAME.name}.npy", data._frame)
+    for tag, values in data._arrays.items():
+        np.save(output_path / f"{tag.name}.npy", values)
+    return output_path
+
 
 class Data:
-    def __init__(self, data_path: Path):
+    @profiled("Data.__init__")
+    def __init__(
+        self,
+        data_path: Path,
+        use_cache: bool = True,
+        backend: DataBackend = DataBackend.PANDAS,
+        prefer_binary: bool = False,
+        tags: Iterable[DataTag] | None = None,
+        dtype: type = np.float64,
+        engine: str = "c",
+        derivative_method: DerivativeMethod = DerivativeMethod.CENTRAL_DIFFERENCE,
+        resample: bool = False,
+        sampling_rate: float | None = None,
+        max_gap: float | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        data_path : Path
+            Path to the CSV file exported by the Unity application, or to a binary recording (see `convert_to_binary`).
+        use_cache : bool
+            If True, the derived signals (velocity, acceleration) are computed once over the full recording and
+            reused for every subsequent call to `get`. Set to False to recompute them at each call.
+        backend : DataBackend
+            How the recording is stored in memory. PANDAS keeps the DataFrame as read from the file. NUMPY loads each
+            DataTag group into a contiguous (n_frames, 3) float64 array at construction, the derivatives are then
+            computed on the raw arrays and DataFrames are only produced when `get` or `time` is called. Binary
+            recordings are memory-mapped by the NUMPY backend, so a DataTag group is only read from the disk when it
+            is accessed. COMPACT stores the values and their derivatives as float32 arrays, which halves the memory used
+            by the NUMPY backend. Only the groups read by the metrics are loaded (if tags is None) and the derivatives
+            are computed into buffers allocated once per DataTag group, derivative order and window, so recomputing them does
+            not allocate memory. The frames are kept in float64. See the README for the accuracy of each metric.
+        prefer_binary : bool
+            If True and data_path is a CSV file whose binary recording exists and is more recent than the CSV, the
+            binary recording is loaded instead.
+        tags : Iterable[DataTag] | None
+            The DataTag groups to load (the frames are always loaded). Only these columns are read from the file,
+            which reduces the loading time and the memory footprint. If None, all the groups are loaded. See
+            `required_tags` to get the groups needed by a set of metrics.
+        dtype : type
+            The type used to parse the values of the DataTag groups (the frames are always parsed as float64). The
+            COMPACT backend always uses float32.
+        engine : str
+            The parser engine used by `pd.read_csv` ("c" or, if installed, "pyarrow").
+        derivative_method : DerivativeMethod
+            How the velocities and accelerations are computed. CENTRAL_DIFFERENCE differentiates the values, then the
+            velocities, by `central_derivative`. SAVITZKY_GOLAY (see `savitzky_golay_derivatives`) and RECURSIVE (a
+            causal filter, see `recursive_derivatives`) compute both derivatives of a tag in the same pass. The window
+            passed to `get` is the half-width of the central difference and of the Savitzky-Golay filter, and the
+            span of the recursive filter. As the central difference divides by the time spanned by two frames only,
+            its velocities (accelerations) are window (window squared) times the physical ones: the filtered
+            derivatives are scaled the same way, so all the methods give the metrics in the same units. The jump
+            events are always detected on the central difference, whose thresholds they were tuned on.
+        resample : bool
+            If True, the DataTag groups are linearly interpolated onto a uniform timebase at sampling_rate when the
+            recording is loaded (see `resample_uniform`), so the frames dropped or delayed by the headset do not
+            distort the derivatives. The frame-drop statistics measured before the resampling are kept in `sampling`.
+            The resampled groups of a binary recording are held in memory.
+        sampling_rate : float | None
+            The rate (Hz) of the uniform timebase. Defaults to the nominal rate of the recording (see
+            `estimate_sampling_rate`), so the windows keep the same duration.
+        max_gap : float | None
+            The frames of the uniform timebase falling in a gap longer than max_gap seconds are left missing (NaN)
+            instead of being interpolated. If None, all the gaps are interpolated.
+        """
+        data_path = Path(data_path)
+        if prefer_binary and not is_binary_recording(data_path):
+            binary_path = binary_recording_path(data_path)
+            if is_binary_recording(binary_path) and binary_path.stat().st_mtime >= data_path.stat().st_mtime:
+                data_path = binary_path
         self._data_path = data_path
-        self._df = pd.read_csv(data_path)
+        self._backend = backend
+        self._derivative_method = derivative_method
+        if backend == DataBackend.COMPACT:
+            dtype = np.float32
+            if tags is None:
+                from .data_extraction import required_tags
+
+                tags = required_tags()
+
+        project_columns = tags is not None
+        tags = [tag for tag in (DataTag if tags is None else dict.fromkeys(tags)) if tag != DataTag.FRAME]
+        if is_binary_recording(data_path):
+            frame, arrays = self._load_binary(data_path, tags)
+            df = None
+        else:
+            df = self._read_csv(data_path, tags, dtype, engine, usecols=project_columns)
+            frame = df[DataTag.FRAME.value].to_numpy(dtype=np.float64) if backend != DataBackend.PANDAS else None
+            # Column-major storage keeps each axis contiguous (as in the DataFrame blocks), so per-axis accesses
+            # and reductions along the frames are as fast, and as precise, as their pandas counterparts
+            arrays = {
+                tag: np.asfortranarray(df[tag.value].to_numpy(dtype=dtype))
+                for tag in tags
+                if backend != DataBackend.PANDAS and all(column in df.columns for column in tag.value)
+            }
+            if backend == DataBackend.COMPACT:
+                del df
+                df = None
+        if backend == DataBackend.COMPACT:
+            # The memory-mapped float64 groups of a binary recording are loaded in memory as float32
+            frame = np.asarray(frame, dtype=np.float64)
+            arrays = {tag: np.asfortranarray(values, dtype=np.float32) for tag, values in arrays.items()}
+        sampling = None
+        if resample:
+            if df is not None:
+                frame = df[DataTag.FRAME.value].to_numpy(dtype=np.float64)
+                arrays = {
+                    tag: np.asfortranarray(df[tag.value].to_numpy(dtype=dtype))
+                    for tag in tags
+                    if all(column in df.columns for column in tag.value)
+                }
+                df = None
+            frame, arrays, sampling = self._resample(frame, arrays, sampling_rate, max_gap)
+
+        if backend == DataBackend.PANDAS:
+            if df is None:
+                columns = {DataTag.FRAME.value: frame}
+                for tag, values in arrays.items():
+                    columns.update({column: values[:, i] for i, column in enumerate(tag.value)})
+                df = pd.DataFrame(columns)
+            self._df = df
+            self._header_values = df.columns
+            self._tags = [tag for tag in tags if all(column in df.columns for column in tag.value)]
+        elif backend in (DataBackend.NUMPY, DataBackend.COMPACT):
+            self._df = None
+            self._frame = frame
+            self._arrays = arrays
+            if df is None:
+                self._header_values = pd.Index([DataTag.FRAME.value] + [c for tag in arrays for c in tag.value])
+            else:
+                self._header_values = df.columns
+            self._tags = list(arrays.keys())
+        else:
+            raise ValueError(f"Unsupported backend: {backend}")
+        self._initialize_state(use_cache)
+        if sampling is not None:
+            self._sampling = sampling
+            self._sampling_period = sampling.period
+
+    @classmethod
+    def from_arrays(
+        cls,
+        frame: np.ndarray,
+        arrays: dict[DataTag, np.ndarray],
+        data_path: Path = Path(""),
+        use_cache: bool = True,
+        backend: DataBackend = DataBackend.NUMPY,
+        derivative_method: DerivativeMethod = DerivativeMethod.CENTRAL_DIFFERENCE,
+    ) -> "Data":
+        """
+        Creates a recording from arrays already in memory, e.g. the rows read so far from a CSV file that is still
+        being recorded (see `extend`). Only the array backends (NUMPY and COMPACT) are supported.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            The "Frame" column, of shape (n_frames,).
+        arrays : dict[DataTag, np.ndarray]
+            The values of each DataTag group, of shape (n_frames, 3).
+        data_path : Path
+            The path of the recording, used in the error messages.
+        use_cache, backend, derivative_method
+            See `Data`.
+
+        Returns
+        -------
+        Data
+            The recording.
+        """
+        if backend == DataBackend.PANDAS:
+            raise ValueError("A recording can only be created from arrays with the NUMPY or COMPACT backend")
+
+        dtype = np.float32 if backend == DataBackend.COMPACT else np.float64
+        data = cls.__new__(cls)
+        data._data_path = Path(data_path)
+        data._backend = backend
+        data._derivative_method = derivative_method
+        data._df = None
+        data._frame = np.asarray(frame, dtype=np.float64)
+        data._arrays = {tag: np.asfortranarray(values, dtype=dtype) for tag, values in arrays.items()}
+        data._header_values = pd.Index([DataTag.FRAME.value] + [c for tag in data._arrays for c in tag.value])
+        data._tags = list(data._arrays.keys())
+        data._initialize_state(use_cache)
+        return data
+
+    def _initialize_state(self, use_cache: bool) -> None:
+        """Initializes what is computed from the loaded values (the cached signals and the storage of `extend`)."""
+        self._use_cache = use_cache
+        self._time: pd.Series | None = None
+        self._time_array: np.ndarray | None = None
+        self._derivatives: dict[tuple[DataTag, int, int], pd.DataFrame | np.ndarray] = {}
+        self._buffers: dict[tuple[DataTag, int, int], np.ndarray] = {}
+        self._frame_storage: np.ndarray | None = None
+        self._array_storage: dict[DataTag, np.ndarray] = {}
+        self._sampling: SamplingReport | None = None
+        self._sampling_period: float | None = None
+
+    @staticmethod
+    @profiled("Data._resample")
+    def _resample(
+        frame: np.ndarray, arrays: dict[DataTag, np.ndarray], sampling_rate: float | None, max_gap: float | None
+    ) -> tuple[np.ndarray, dict[DataTag, np.ndarray], SamplingReport]:
+        """Resamples the DataTag groups onto a uniform timebase and measures the frame drops of the recording."""
+        frame = np.asarray(frame, dtype=np.float64)
+        report = sampling_report(frame, sampling_rate)
+        frame, arrays, n_missing_frames = resample_uniform(frame, arrays, 1 / report.sampling_rate, max_gap=max_gap)
+        sampling = SamplingReport(
+            report.sampling_rate,
+            report.n_frames,
+            report.n_dropped_frames,
+            report.gaps,
+            report.jitter,
+            n_missing_frames=n_missing_frames,
+        )
+        return frame, arrays, sampling
+
+    @staticmethod
+    @profiled("Data._read_csv")
+    def _read_csv(data_path: Path, tags: list[DataTag], dtype: type, engine: str, usecols: bool) -> pd.DataFrame:
+        """Reads the frames and the columns of the requested DataTag groups with explicit types."""
+        dtypes = {DataTag.FRAME.value: np.float64}
+        dtypes.update({column: dtype for tag in tags for column in tag.value})
+        if not usecols:
+            return pd.read_csv(data_path, dtype=dtypes, engine=engine)
+        return pd.read_csv(data_path, usecols=list(dtypes.keys()), dtype=dtypes, engine=engine)
+
+    @staticmethod
+    @profiled("Data._load_binary")
+    def _load_binary(data_path: Path, tags: list[DataTag]) -> tuple[np.ndarray, dict[DataTag, np.ndarray]]:
+        """Memory-maps the frames and the requested DataTag groups of a binary recording."""
+        frame = np.load(data_path / f"{DataTag.FRAME.name}.npy", mmap_mode="r")
+        arrays = {}
+        for tag in tags:
+            tag_path = data_path / f"{tag.name}.npy"
+            if tag_path.exists():
+                arrays[tag] = np.load(tag_path, mmap_mode="r")
+        return frame, arrays
+
+    @property
+    def data_path(self) -> Path:
+        """Returns the path the recording was loaded from."""
+        return Path(self._data_path)
+
+    @property
+    def sampling(self) -> SamplingReport:
+        """Returns the frame-drop statistics of the recording, as recorded (i.e. before the resampling, if any)."""
+        if self._sampling is None:
+            self._sampling = sampling_report(self.time_array)
+        return self._sampling
+
+    @property
+    def sampling_period(self) -> float | None:
+        """Returns the period (s) of the uniform timebase of a resampled recording, None if it was not resampled."""
+        return self._sampling_period
+
+    @property
+    def tags(self) -> list[DataTag]:
+        """Returns the DataTag groups available in the recording."""
+        return self._tags
+
+    @property
+    def derivative_method(self) -> DerivativeMethod:
+        """Returns how the velocities and accelerations are computed."""
+        return self._derivative_method
+
+    @property
+    def backend(self) -> DataBackend:
+        """Returns the backend used to store the recording."""
+        return self._backend
 
     @property
     def shape(self) -> tuple[int, int]:
         """Returns the shape of the DataFrame."""
+        if self._backend != DataBackend.PANDAS:
+            return self._frame.shape[0], len(self._header_values)
         return self._df.shape
 
     @property
     def _header(self) -> pd.Index:
-        return self._df.columns
+        return self._header_values
+
+    @property
+    def use_cache(self) -> bool:
+        """Returns whether the derived signals are cached between calls to `get`."""
+        return self._use_cache
+
+    @use_cache.setter
+    def use_cache(self, value: bool) -> None:
+        self._use_cache = value
+        if not value:
+            self.clear_cache()
+
+    def clear_cache(self, tag: DataTag | None = None) -> None:
+        """
+        Invalidates the cached time and derived signals.
+
+        Parameters
+        ----------
+        tag : DataTag | None
+            If provided, only the derived signals of this tag are invalidated. Otherwise, the whole cache is cleared.
+        """
+        if tag is None:
+            self._time = None
+            self._time_array = None
+            self._derivatives.clear()
+            return
+
+        for key in [key for key in self._derivatives if key[0] == tag]:
+            del self._derivatives[key]
+
+    def extend(self, frame: np.ndarray, values: dict[DataTag, np.ndarray]) -> None:
+        """
+        Appends frames at the end of the recording (NUMPY and COMPACT backends only), e.g. the rows appended to a CSV
+        file while it is recorded. The storage grows geometrically, so appending the frames of a whole recording
+        costs O(n_frames) overall. As the derivatives of the last frames depend on the new ones, the cached signals
+        are invalidated.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            The "Frame" column of the new frames, of shape (n_new_frames,).
+        values : dict[DataTag, np.ndarray]
+            The values of each DataTag group of the recording for the new frames, of shape (n_new_frames, 3).
+        """
+        if self._backend == DataBackend.PANDAS:
+            raise ValueError("Only the recordings of the NUMPY or COMPACT backends can be extended")
+        if self._sampling_period is not None:
+            raise ValueError("A resampled recording cannot be extended, resample it once it is complete")
+
+        n_frames = self._frame.shape[0]
+        n_total = n_frames + frame.shape[0]
+        if self._frame_storage is None or self._frame_storage.shape[0] < n_total:
+            capacity = max(n_total, 2 * n_frames, 1024)
+            self._frame_storage = np.empty(capacity)
+            self._frame_storage[:n_frames] = self._frame
+            for tag, array in self._arrays.items():
+                self._array_storage[tag] = np.empty((capacity, array.shape[1]), dtype=array.dtype, order="F")
+                self._array_storage[tag][:n_frames] = array
+
+        self._frame_storage[n_frames:n_total] = frame
+        self._frame = self._frame_storage[:n_total]
+        for tag in self._tags:
+            self._array_storage[tag][n_frames:n_total] = values[tag]
+            self._arrays[tag] = self._array_storage[tag][:n_total]
+        self.clear_cache()
+        self._buffers.clear()
+        self._sampling = None
 
     @property
     def time(self) -> pd.Series:
         """Returns the time in seconds since the start of the recording."""
-        return self._df[DataTag.FRAME.value] - self._df[DataTag.FRAME.value].min()
+        if self._time is not None:
+            return self._time
+
+        if self._backend != DataBackend.PANDAS:
+            time = pd.Series(self.time_array, name=DataTag.FRAME.value)
+        else:
+            time = self._df[DataTag.FRAME.value] - self._df[DataTag.FRAME.value].min()
+        if self._use_cache:
+            self._time = time
+        return time
+
+    @property
+    def time_array(self) -> np.ndarray:
+        """Returns the time in seconds since the start of the recording as a NumPy array."""
+        if self._time_array is not None:
+            return self._time_array
+
+        if self._backend != DataBackend.PANDAS:
+            time = self._frame - self._frame.min()
+        else:
+            time = self.time.to_numpy(dtype=np.float64)
+        if self._use_cache:
+            self._time_array = time
+        return time
 
+    @profiled("Data.get")
     def get(
-        self, tag: DataTag, t: slice = slice(None), data_type: DataType = DataType.VALUE, axis: DataAxis = DataAxis.ALL
+        self,
+        tag: DataTag,
+        t: slice = slice(None),
+        data_type: DataType = DataType.VALUE,
+        axis: DataAxis = DataAxis.ALL,
+        window: int = 10,
     ) -> pd.DataFrame:
         """Returns the specified data type."""
-        value = self._df[tag.value]
+        derivative = self._derivative(tag, data_type.derivative_order, window)
+        if self._backend != DataBackend.PANDAS:
+            return pd.DataFrame(
+                derivative[t, axis.value],
+                index=pd.RangeIndex(derivative.shape[0])[t],
+                columns=[tag.value[i] for i in axis.value],
+            )
+        return derivative.iloc[t, axis.value]
+
+    @profiled("Data.get_array")
+    def get_array(
+        self,
+        tag: DataTag,
+        t: slice = slice(None),
+        data_type: DataType = DataType.VALUE,
+        axis: DataAxis = DataAxis.ALL,
+        window: int = 10,
+    ) -> np.ndarray:
+        """Returns the specified data type as a NumPy array of shape (n_frames, n_axes)."""
+        derivative = self._derivative(tag, data_type.derivative_order, window)
+        if self._backend == DataBackend.PANDAS:
+            # Only the requested frames are converted, so slicing short windows of long recordings stays cheap
+            return derivative.iloc[t, axis.value].to_numpy(dtype=np.float64)
+        return derivative[t, axis.value]
+
+    def _derivative(self, tag: DataTag, order: int, window: int) -> pd.DataFrame | np.ndarray:
+        """Returns the full-length derivative of the requested order, computing (and caching) it if needed."""
+        if order == 0:
+            if tag not in self._tags:
+                raise ValueError(f"The tag {tag.name} was not loaded from {self._data_path}")
+            if self._backend != DataBackend.PANDAS:
+                return self._arrays[tag]
+            return self._df[tag.value]
+
+        key = (tag, order, window)
+        record_cache("Data._derivative", hit=key in self._derivatives)
+        if key in self._derivatives:
+            return self._derivatives[key]
+
+        if self._derivative_method != DerivativeMethod.CENTRAL_DIFFERENCE:
+            return self._filtered_derivatives(tag, window)[order - 1]
+
+        lower_order = self._derivative(tag, order - 1, window)
+        with profiled_stage("Data._derivative"):
+            if self._backend == DataBackend.COMPACT:
+                derivative = central_derivative_array(
+                    lower_order,
+                    self.time_array,
+                    window,
+                    out=self._derivative_buffer(tag, order, window),
+                    period=self._sampling_period,
+                )
+            elif self._backend == DataBackend.NUMPY:
+                derivative = central_derivative_array(
+                    lower_order, self.time_array, window, period=self._sampling_period
+                )
+            else:
+                derivative = central_derivative(lower_order, self.time, window=window)
+        if self._use_cache:
+            self._derivatives[key] = derivative
+        return derivative
 
-        if data_type == DataType.VALUE:
-            return value.iloc[t, axis.value]
+    def _filtered_derivatives(self, tag: DataTag, window: int) -> list[pd.DataFrame | np.ndarray]:
+        """Returns (and caches) the first and second derivatives of the tag, computed together by the filter."""
+        values = self._derivative(tag, 0, window)
+        if self._backend == DataBackend.PANDAS:
+            values = values.to_numpy(dtype=np.float64)
 
-        velocity = central_derivative(value, self.time, window=10)
-        if data_type == DataType.VELOCITY:
-            return velocity.iloc[t, axis.value]
+        with profiled_stage("Data._derivative"):
+            if self._derivative_method == DerivativeMethod.SAVITZKY_GOLAY:
+                derivatives = savitzky_golay_derivatives(values, self.time_array, window)
+            elif self._derivative_method == DerivativeMethod.RECURSIVE:
+                derivatives = recursive_derivatives(values, self.time_array, window)
+            else:
+                raise ValueError(f"Unsupported derivative method: {self._derivative_method}")
+            # Scaled as the central difference, which divides by the time spanned by two frames only
+            for order, derivative in enumerate(derivatives, start=1):
+                derivative *= window**order
 
-        acceleration = central_derivative(velocity, self.time, window=10)
-        if data_type == DataType.ACCELERATION:
-            return acceleration.iloc[t, axis.value]
+        if self._backend == DataBackend.PANDAS:
+            derivatives = [pd.DataFrame(d, index=self._df.index, columns=tag.value) for d in derivatives]
+        elif self._backend == DataBackend.COMPACT:
+            for order, derivative in enumerate(derivatives, start=1):
+                np.copyto(self._derivative_buffer(tag, order, window), derivative, casting="same_kind")
+            derivatives = [self._derivative_buffer(tag, order, window) for order in (1, 2)]
+        else:
+            derivatives = [np.asfortranarray(d) for d in derivatives]
+        if self._use_cache:
+            for order, derivative in enumerate(derivatives, start=1):
+                self._derivatives[(tag, order, window)] = derivative
+        return derivatives
 
-        raise ValueError(f"Unsupported data type: {data_type}")
+    def _derivative_buffer(self, tag: DataTag, order: int, window: int) -> np.ndarray:
+        """
+        Returns the float32 buffer the derivative of the tag is computed into by the COMPACT backend. A buffer is
+        allocated per derivative order and window at its first use, then reused when the same derivative is
+        recomputed (e.g. when the cache is disabled), so the arrays returned for the other windows are never
+        overwritten.
+        """
+        key = (tag, order, window)
+        if key not in self._buffers:
+            self._buffers[key] = np.empty(self._arrays[tag].shape, dtype=np.float32, order="F")
+        return self._buffers[key]
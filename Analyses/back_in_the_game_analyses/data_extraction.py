@@ -1,14 +1,22 @@
 from enum import Enum
+from functools import partial
+from typing import Any, Callable, Hashable, Iterable
 
 import numpy as np
-import pandas as pd
 
-from .data import Data, DataTag, DataAxis, DataType
-from .maths import fit_confidence_ellipse, compute_norm
-
-
-def _first_where(series: pd.Series) -> int:
-    return series.idxmax().iloc[0]
+from .data import Data, DataTag, DataAxis, DataType, DerivativeMethod
+from .events import (
+    GRAVITY,
+    VELOCITY_SAFETY_THRESHOLD,
+    VELOCITY_THRESHOLD,
+    DataIndicesExtraction,
+    JumpCrossings,
+    jump_episodes,
+    jump_events,
+)
+from .maths import central_derivative_array, fit_confidence_ellipse_array, compute_norm_array
+from .profiling import profiled
+from .registry import MetricDefinition, MetricRegistry, MetricWindow
 
 
 class DataMetrics(Enum):
@@ -80,184 +88,206 @@ class DataMetrics(Enum):
         else:
             raise ValueError("Unknown DataMetric")
 
+    @property
+    def tags(self) -> set[DataTag]:
+        """Returns the DataTag groups needed to compute the metric."""
+        return set(CORE_METRICS[self].tags)
+
+
+def required_tags(metrics: Iterable[Hashable] | None = None, registry: MetricRegistry | None = None) -> set[DataTag]:
+    """
+    Returns the DataTag groups that must be loaded to compute the metrics.
+
+    Parameters
+    ----------
+    metrics : Iterable[Hashable] | None
+        The metrics to compute. If None, all the metrics of the registry are considered.
+    registry : MetricRegistry | None
+        The registry the metrics are defined in. Defaults to CORE_METRICS.
+
+    Returns
+    -------
+    set[DataTag]
+        The DataTag groups to pass to the `Data` constructor.
+    """
+    return (CORE_METRICS if registry is None else registry).required_tags(metrics)
+
+
+@profiled("data_extraction")
+def data_extraction(
+    data: Data, metrics: Iterable[Hashable] | None = None, registry: MetricRegistry | None = None
+) -> dict[DataMetrics, Any]:
+    """
+    Extracts the metrics of a recording. Only the jump events and derived signals needed by the requested metrics are
+    computed.
+
+    Parameters
+    ----------
+    data : Data
+        The recording.
+    metrics : Iterable[Hashable] | None
+        The metrics to compute. If None, all the metrics of the registry are computed.
+    registry : MetricRegistry | None
+        The registry the metrics are defined in. Defaults to CORE_METRICS, a copy of it can be extended with
+        site-specific metrics.
+
+    Returns
+    -------
+    dict[DataMetrics, Any]
+        The value of each metric.
+    """
+    registry = CORE_METRICS if registry is None else registry
+    return registry.compute(data, keys=metrics, detect_events=_jump_indices_extraction)
+
+
+class JumpEpisode:
+    def __init__(self, t: slice, indices: dict[DataIndicesExtraction, int], metrics: dict[DataMetrics, Any]):
+        """
+        A single jump of a recording, as returned by `jump_segmentation`.
+
+        Parameters
+        ----------
+        t : slice
+            The frames of the recording the episode spans.
+        indices : dict[DataIndicesExtraction, int]
+            The indices (in the whole recording) of the events of the jump.
+        metrics : dict[DataMetrics, Any]
+            The metrics of the episode. The OVERALL metrics are computed over the frames of the episode, the PRE_JUMP
+            ones from the start of the episode to the toe-off and the POST_JUMP ones from the reception to the end of
+            the episode.
+        """
+        self._t = t
+        self._indices = indices
+        self._metrics = metrics
+
+    @property
+    def t(self) -> slice:
+        """Returns the frames of the recording the episode spans."""
+        return self._t
+
+    @property
+    def indices(self) -> dict[DataIndicesExtraction, int]:
+        """Returns the indices (in the whole recording) of the events of the jump."""
+        return self._indices
 
-class DataIndicesExtraction(Enum):
-    SQUAT_START = "squat_start"
-    SQUAT_DEEPEST = "squat_deepest"
-    SQUAT_END = "squat_end"
-    TOE_OFF = "toe_off"
-    HIGHEST_POINT = "highest_point"
-    RECEPTION = "reception"
-
-
-def data_extraction(data: Data) -> dict[DataMetrics, float]:
-    overall_head_horizontal_dispersion = _horizontal_dispersion(data, DataTag.HEAD_POSITION)
-    overall_left_hand_acceleration_peak = _acceleration_peak(data, DataTag.LEFT_HAND_POSITION)
-    overall_right_hand_acceleration_peak = _acceleration_peak(data, DataTag.RIGHT_HAND_POSITION)
-    overall_left_hand_traveled_distance = _traveled_distance(data, DataTag.LEFT_HAND_POSITION)
-    overall_right_hand_traveled_distance = _traveled_distance(data, DataTag.RIGHT_HAND_POSITION)
-
-    jump_indices = _jump_indices_extraction(data)
-    squat_height = _squat_height(data, jump_indices)
-    jump_height = _jump_height(data, jump_indices)
-    jump_distance = _jump_distance(data, jump_indices)
-    jump_time = _flight_time(data, jump_indices)
-
-    if jump_indices[DataIndicesExtraction.TOE_OFF] is None:
-        pre_jump_head_horizontal_dispersion = np.nan
-        pre_jump_left_hand_acceleration_peak = np.nan
-        pre_jump_right_hand_acceleration_peak = np.nan
-        pre_jump_left_hand_traveled_distance = np.nan
-        pre_jump_right_hand_traveled_distance = np.nan
-    else:
-        t = slice(None, jump_indices[DataIndicesExtraction.TOE_OFF])
-        pre_jump_head_horizontal_dispersion = _horizontal_dispersion(data, DataTag.HEAD_POSITION, t=t)
-        pre_jump_left_hand_acceleration_peak = _acceleration_peak(data, DataTag.LEFT_HAND_POSITION, t=t)
-        pre_jump_right_hand_acceleration_peak = _acceleration_peak(data, DataTag.RIGHT_HAND_POSITION, t=t)
-        pre_jump_left_hand_traveled_distance = _traveled_distance(data, DataTag.LEFT_HAND_POSITION, t=t)
-        pre_jump_right_hand_traveled_distance = _traveled_distance(data, DataTag.RIGHT_HAND_POSITION, t=t)
-
-    if jump_indices[DataIndicesExtraction.RECEPTION] is None:
-        post_jump_head_horizontal_dispersion = np.nan
-        post_jump_left_hand_acceleration_peak = np.nan
-        post_jump_right_hand_acceleration_peak = np.nan
-        post_jump_left_hand_traveled_distance = np.nan
-        post_jump_right_hand_traveled_distance = np.nan
-    else:
-        t = slice(jump_indices[DataIndicesExtraction.RECEPTION], None)
-        post_jump_head_horizontal_dispersion = _horizontal_dispersion(data, DataTag.HEAD_POSITION, t=t)
-        post_jump_left_hand_acceleration_peak = _acceleration_peak(data, DataTag.LEFT_HAND_POSITION, t=t)
-        post_jump_right_hand_acceleration_peak = _acceleration_peak(data, DataTag.RIGHT_HAND_POSITION, t=t)
-        post_jump_left_hand_traveled_distance = _traveled_distance(data, DataTag.LEFT_HAND_POSITION, t=t)
-        post_jump_right_hand_traveled_distance = _traveled_distance(data, DataTag.RIGHT_HAND_POSITION, t=t)
-
-    return {
-        DataMetrics.OVERALL_HEAD_HORIZONTAL_DISPERSION: overall_head_horizontal_dispersion,
-        DataMetrics.OVERALL_LEFT_HAND_ACCELERATION_PEAK: overall_left_hand_acceleration_peak,
-        DataMetrics.OVERALL_RIGHT_HAND_ACCELERATION_PEAK: overall_right_hand_acceleration_peak,
-        DataMetrics.OVERALL_LEFT_HAND_TRAVELED_DISTANCE: overall_left_hand_traveled_distance,
-        DataMetrics.OVERALL_RIGHT_HAND_TRAVELED_DISTANCE: overall_right_hand_traveled_distance,
-        DataMetrics.SQUAT_HEIGHT: squat_height,
-        DataMetrics.JUMP_HEIGHT: jump_height,
-        DataMetrics.JUMP_DISTANCE: jump_distance,
-        DataMetrics.JUMP_FLIGHT_TIME: jump_time,
-        DataMetrics.PRE_JUMP_HEAD_HORIZONTAL_DISPERSION: pre_jump_head_horizontal_dispersion,
-        DataMetrics.PRE_JUMP_LEFT_HAND_ACCELERATION_PEAK: pre_jump_left_hand_acceleration_peak,
-        DataMetrics.PRE_JUMP_RIGHT_HAND_ACCELERATION_PEAK: pre_jump_right_hand_acceleration_peak,
-        DataMetrics.PRE_JUMP_LEFT_HAND_TRAVELED_DISTANCE: pre_jump_left_hand_traveled_distance,
-        DataMetrics.PRE_JUMP_RIGHT_HAND_TRAVELED_DISTANCE: pre_jump_right_hand_traveled_distance,
-        DataMetrics.POST_JUMP_HEAD_HORIZONTAL_DISPERSION: post_jump_head_horizontal_dispersion,
-        DataMetrics.POST_JUMP_LEFT_HAND_ACCELERATION_PEAK: post_jump_left_hand_acceleration_peak,
-        DataMetrics.POST_JUMP_RIGHT_HAND_ACCELERATION_PEAK: post_jump_right_hand_acceleration_peak,
-        DataMetrics.POST_JUMP_LEFT_HAND_TRAVELED_DISTANCE: post_jump_left_hand_traveled_distance,
-        DataMetrics.POST_JUMP_RIGHT_HAND_TRAVELED_DISTANCE: post_jump_right_hand_traveled_distance,
-        DataMetrics.JUMP_INDICES: jump_indices,
-    }
-
-
-def _squat_indices_extraction(data: Data) -> dict[DataIndicesExtraction, float]:
-    #   1) Find the first time the velocity is more negative that a large threshold (-5m/s) (start_squat_idx_tp)
-    #   2) From start_squat_idx_tp, walk backwards to find the first time the velocity threshold (-2m/s) (start_squat_idx)
-    #   3) From start_squat_idx, walk forward to find the first time the velocity becomes positive (deepest_squat_idx)
-    #   4) From deepest_squat_idx, walk forwards for the first time the velocity becomes negative again (end_squat_idx)
-
-    try:
-        velocity_safety_threshold = -5.0  # m/s
-        velocity_threshold = -2.0  # m/s
-        head_vel = data.get(DataTag.HEAD_POSITION, data_type=DataType.VELOCITY, axis=DataAxis.VERTICAL)
-
-        start_squat_idx_tp = _first_where(head_vel < velocity_safety_threshold)
-        start_squat_idx = _first_where(head_vel.loc[:start_squat_idx_tp].iloc[::-1] >= velocity_threshold)
-        deepest_squat_idx = _first_where(head_vel.loc[start_squat_idx:] >= 0)
-        end_squat_idx = _first_where(head_vel.loc[deepest_squat_idx:] < 0)
-
-        if np.isnan(start_squat_idx) or np.isnan(deepest_squat_idx) or np.isnan(end_squat_idx) or start_squat_idx < 10:
-            raise ValueError("Invalid squat indices")
-
-        return {
-            DataIndicesExtraction.SQUAT_START: start_squat_idx,
-            DataIndicesExtraction.SQUAT_DEEPEST: deepest_squat_idx,
-            DataIndicesExtraction.SQUAT_END: end_squat_idx,
-        }
-    except:
-        return {
-            DataIndicesExtraction.SQUAT_START: None,
-            DataIndicesExtraction.SQUAT_DEEPEST: None,
-            DataIndicesExtraction.SQUAT_END: None,
-        }
-
-
-def _jump_indices_extraction(data: Data) -> dict[DataIndicesExtraction, float]:
-    # Jump specific metrics
-    # Strategy:
-    #   1) Find the squat data
-    #   4) From deepest_squat_idx, walk forwards for the first time the acceleration becomes less than -9.81 (toe_off_idx)
-    #   5) From toe_off_idx, find the first point the velocity becomes negative (highest_point_idx)
-    #   6) From highest_point_idx, walk forwards for the first time the acceleration is larger than -9.81 (reception_idx)
-    squat_data = _squat_indices_extraction(data)
-
-    try:
-        head_vel = data.get(DataTag.HEAD_POSITION, data_type=DataType.VELOCITY, axis=DataAxis.VERTICAL)
-        head_acc = data.get(DataTag.HEAD_POSITION, data_type=DataType.ACCELERATION, axis=DataAxis.VERTICAL)
-        gravity = -9.81  # m/s/s
-        if squat_data[DataIndicesExtraction.SQUAT_DEEPEST] is None:
-            raise ValueError("Invalid squat data")
-
-        # Get useful aliases
-        toe_off_idx = _first_where(head_acc.loc[squat_data[DataIndicesExtraction.SQUAT_DEEPEST] :] <= gravity)
-        highest_point_idx = _first_where(head_vel.loc[toe_off_idx:] <= 0)
-        reception_idx = _first_where(head_acc.loc[highest_point_idx:] >= gravity)
-
-        if np.isnan(toe_off_idx) or np.isnan(highest_point_idx) or np.isnan(reception_idx):
-            raise ValueError("Invalid jump indices")
-
-        return {
-            **squat_data,
-            DataIndicesExtraction.TOE_OFF: toe_off_idx,
-            DataIndicesExtraction.HIGHEST_POINT: highest_point_idx,
-            DataIndicesExtraction.RECEPTION: reception_idx,
-        }
-    except:
-        return {
-            **squat_data,
-            DataIndicesExtraction.TOE_OFF: None,
-            DataIndicesExtraction.HIGHEST_POINT: None,
-            DataIndicesExtraction.RECEPTION: None,
-        }
+    @property
+    def metrics(self) -> dict[DataMetrics, Any]:
+        """Returns the metrics of the episode."""
+        return self._metrics
 
 
+@profiled("jump_segmentation")
+def jump_segmentation(
+    data: Data, metrics: Iterable[Hashable] | None = None, registry: MetricRegistry | None = None
+) -> list[JumpEpisode]:
+    """
+    Splits a recording containing several jumps into consecutive episodes, one per jump, and extracts the metrics of
+    each of them. The threshold crossings are computed once for the whole recording and the metrics of each episode
+    only look at its own frames, so the cost scales with the length of the recording, not with the number of jumps.
+
+    Parameters
+    ----------
+    data : Data
+        The recording to segment.
+    metrics : Iterable[Hashable] | None
+        The metrics to compute for each episode. If None, all the metrics of the registry are computed.
+    registry : MetricRegistry | None
+        The registry the metrics are defined in. Defaults to CORE_METRICS.
+
+    Returns
+    -------
+    list[JumpEpisode]
+        The jumps of the recording, in chronological order. It is empty if no valid jump was found.
+    """
+    registry = CORE_METRICS if registry is None else registry
+    return [
+        JumpEpisode(t, jump_indices, registry.compute(data, keys=metrics, t=t, jump_indices=jump_indices))
+        for t, jump_indices in jump_episodes(_jump_crossings(data))
+    ]
+
+
+@profiled("_jump_crossings")
+def _jump_crossings(data: Data) -> JumpCrossings:
+    """Returns the threshold crossings of the vertical head velocity and acceleration of the recording."""
+    head_vel, head_acc = _jump_signals(data)
+    return JumpCrossings(
+        head_vel,
+        head_acc,
+        velocity_safety_threshold=VELOCITY_SAFETY_THRESHOLD,
+        velocity_threshold=VELOCITY_THRESHOLD,
+        gravity=GRAVITY,
+    )
+
+
+def _jump_signals(data: Data, window: int = 10) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the vertical head velocity and acceleration the jump events are detected on, of shape (n_frames,). They
+    are always computed by the central difference, whatever the derivative method of the recording: the thresholds
+    were tuned on it, and the filtered derivatives do not reproduce its events whatever their thresholds (the
+    Savitzky-Golay filter detects the toe-off a few frames late, the causal recursive filter lags by about window
+    frames).
+    """
+    if data.derivative_method == DerivativeMethod.CENTRAL_DIFFERENCE:
+        head_vel = data.get_array(
+            DataTag.HEAD_POSITION, data_type=DataType.VELOCITY, axis=DataAxis.VERTICAL, window=window
+        )
+        head_acc = data.get_array(
+            DataTag.HEAD_POSITION, data_type=DataType.ACCELERATION, axis=DataAxis.VERTICAL, window=window
+        )
+        return head_vel[:, 0], head_acc[:, 0]
+
+    head_position = data.get_array(DataTag.HEAD_POSITION, data_type=DataType.VALUE, axis=DataAxis.VERTICAL)[:, 0]
+    time = data.time_array
+    head_vel = central_derivative_array(head_position, time, window, period=data.sampling_period)
+    head_acc = central_derivative_array(head_vel, time, window, period=data.sampling_period)
+    return head_vel, head_acc
+
+
+@profiled("_jump_indices_extraction")
+def _jump_indices_extraction(data: Data) -> dict[DataIndicesExtraction, int | None]:
+    """Returns the indices of the events of the first squat and jump (see events.jump_events)."""
+    return jump_events(_jump_crossings(data))
+
+
+@profiled("_horizontal_dispersion")
 def _horizontal_dispersion(data: Data, tag: DataTag, t: slice = slice(None)) -> np.float64:
     """Returns the horizontal dispersion (2D) of the specified tag."""
-    position = data.get(tag=tag, t=t, data_type=DataType.VALUE, axis=DataAxis.HORIZONTAL)
-    if position.empty:
+    position = data.get_array(tag=tag, t=t, data_type=DataType.VALUE, axis=DataAxis.HORIZONTAL)
+    if position.size == 0:
         return np.nan
 
     # Return the area of the ellipse as a measure of dispersion (π * a * b)
-    ellipse_params = fit_confidence_ellipse(position, confidence=0.95)
-    return (ellipse_params["a"] * ellipse_params["b"] * np.pi).values[0]
+    return fit_confidence_ellipse_array(position, confidence=0.95).area
 
 
-def _acceleration_peak(data: Data, tag: DataTag, t: slice = slice(None), axis: DataAxis = DataAxis.ALL) -> np.float64:
+@profiled("_acceleration_peak")
+def _acceleration_peak(
+    data: Data, tag: DataTag, t: slice = slice(None), axis: DataAxis = DataAxis.ALL, window: int = 10
+) -> np.float64:
     """Returns the peak acceleration of the specified tag."""
-    acceleration = data.get(tag=tag, t=t, data_type=DataType.ACCELERATION, axis=axis)
-    if acceleration.empty:
+    acceleration = data.get_array(tag=tag, t=t, data_type=DataType.ACCELERATION, axis=axis, window=window)
+    if acceleration.size == 0:
         return np.nan
 
-    acceleration = compute_norm(acceleration)
+    acceleration = compute_norm_array(acceleration)
     return acceleration.max()
 
 
+@profiled("_traveled_distance")
 def _traveled_distance(data: Data, tag: DataTag, t: slice = slice(None)) -> np.float64:
     """Returns the total traveled distance of the specified tag."""
-    position = data.get(tag=tag, t=t, data_type=DataType.VALUE, axis=DataAxis.ALL)
-    if position.empty:
+    position = data.get_array(tag=tag, t=t, data_type=DataType.VALUE, axis=DataAxis.ALL)
+    if position.size == 0:
         return np.nan
 
-    diffs = position.diff().fillna(0)
-    distances = compute_norm(diffs**2)
-    return (distances.cumsum()).values[-1]
+    # The first difference is kept (as a zero) so the reduction is performed on as many frames as the position
+    diffs = np.zeros_like(position)
+    diffs[1:] = np.diff(position, axis=0)
+    distances = compute_norm_array(diffs**2)
+    return distances.cumsum()[-1]
 
 
+@profiled("_squat_height")
 def _squat_height(data: Data, squat_indices: dict[DataIndicesExtraction, float]) -> np.float64:
     """
     Returns the squat height based on the head position.
@@ -268,12 +298,13 @@ def _squat_height(data: Data, squat_indices: dict[DataIndicesExtraction, float])
     if squat_start_idx is None or squat_deepest_idx is None:
         return np.nan
 
-    head_vertical_position = data.get(DataTag.HEAD_POSITION, data_type=DataType.VALUE, axis=DataAxis.VERTICAL)
-    if head_vertical_position.empty:
+    head_vertical_position = data.get_array(DataTag.HEAD_POSITION, data_type=DataType.VALUE, axis=DataAxis.VERTICAL)
+    if head_vertical_position.size == 0:
         return np.nan
-    return compute_norm(head_vertical_position.iloc[squat_start_idx] - head_vertical_position.iloc[squat_deepest_idx])
+    return compute_norm_array(head_vertical_position[squat_start_idx] - head_vertical_position[squat_deepest_idx])
 
 
+@profiled("_jump_distance")
 def _jump_distance(data: Data, jump_indices: dict[DataIndicesExtraction, float]) -> np.float64:
     """
     Returns the horizontal jump distance based on the head position.
@@ -284,12 +315,13 @@ def _jump_distance(data: Data, jump_indices: dict[DataIndicesExtraction, float])
     if toe_off_idx is None or reception_idx is None:
         return np.nan
 
-    head_horizontal_position = data.get(DataTag.HEAD_POSITION, data_type=DataType.VALUE, axis=DataAxis.HORIZONTAL)
-    if head_horizontal_position.empty:
+    head_horizontal_position = data.get_array(DataTag.HEAD_POSITION, data_type=DataType.VALUE, axis=DataAxis.HORIZONTAL)
+    if head_horizontal_position.size == 0:
         return np.nan
-    return compute_norm(head_horizontal_position.iloc[reception_idx] - head_horizontal_position.iloc[toe_off_idx])
+    return compute_norm_array(head_horizontal_position[reception_idx] - head_horizontal_position[toe_off_idx])
 
 
+@profiled("_jump_height")
 def _jump_height(data: Data, jump_indices: dict[DataIndicesExtraction, float]) -> np.float64:
     """
     Returns the vertical jump height based on the head position.
@@ -300,12 +332,13 @@ def _jump_height(data: Data, jump_indices: dict[DataIndicesExtraction, float]) -
     if highest_point_idx is None or toe_off_idx is None:
         return np.nan
 
-    head_vertical_position = data.get(DataTag.HEAD_POSITION, data_type=DataType.VALUE, axis=DataAxis.VERTICAL)
-    if head_vertical_position.empty:
+    head_vertical_position = data.get_array(DataTag.HEAD_POSITION, data_type=DataType.VALUE, axis=DataAxis.VERTICAL)
+    if head_vertical_position.size == 0:
         return np.nan
-    return compute_norm(head_vertical_position.iloc[highest_point_idx] - head_vertical_position.iloc[toe_off_idx])
+    return compute_norm_array(head_vertical_position[highest_point_idx] - head_vertical_position[toe_off_idx])
 
 
+@profiled("_flight_time")
 def _flight_time(data: Data, jump_indices: dict[DataIndicesExtraction, float]) -> np.float64:
     """
     Returns the duration of the jump based on the time stamps.
@@ -316,7 +349,91 @@ def _flight_time(data: Data, jump_indices: dict[DataIndicesExtraction, float]) -
     if toe_off_idx is None or reception_idx is None:
         return np.nan
 
-    time = data.time
-    if time.empty:
+    time = data.time_array
+    if time.size == 0:
         return np.nan
-    return data.time.iloc[[toe_off_idx, reception_idx]].diff().values[1]
+    return time[reception_idx] - time[toe_off_idx]
+
+
+def _windowed_metric(
+    helper: Callable[[Data, DataTag, slice], Any],
+    tag: DataTag,
+    data: Data,
+    t: slice,
+    jump_indices: None,
+    derivative_window: int,
+) -> Any:
+    """Adapts the helpers computing a metric of a tag over some frames to the MetricDefinition signature."""
+    return helper(data, tag, t=t)
+
+
+def _windowed_derivative_metric(
+    helper: Callable[..., Any], tag: DataTag, data: Data, t: slice, jump_indices: None, derivative_window: int
+) -> Any:
+    """As `_windowed_metric`, for the helpers reading the derivatives of the tag, computed over derivative_window."""
+    return helper(data, tag, t=t, window=derivative_window)
+
+
+def _event_metric(
+    helper: Callable[[Data, dict[DataIndicesExtraction, int | None]], Any],
+    data: Data,
+    t: slice,
+    jump_indices: dict[DataIndicesExtraction, int | None],
+    derivative_window: int,
+) -> Any:
+    """Adapts the helpers computing a metric from the jump events to the MetricDefinition signature."""
+    return helper(data, jump_indices)
+
+
+def _jump_indices(
+    data: Data, t: slice, jump_indices: dict[DataIndicesExtraction, int | None], derivative_window: int
+) -> dict[DataIndicesExtraction, int | None]:
+    """Returns the jump events themselves, as the JUMP_INDICES metric."""
+    return jump_indices
+
+
+def _core_metrics() -> MetricRegistry:
+    """Returns the registry of the metrics of DataMetrics, in the order of the enum."""
+    hands = (("LEFT", DataTag.LEFT_HAND_POSITION), ("RIGHT", DataTag.RIGHT_HAND_POSITION))
+    jump_metrics = (
+        (
+            DataMetrics.SQUAT_HEIGHT,
+            _squat_height,
+            (DataIndicesExtraction.SQUAT_START, DataIndicesExtraction.SQUAT_DEEPEST),
+        ),
+        (DataMetrics.JUMP_HEIGHT, _jump_height, (DataIndicesExtraction.TOE_OFF, DataIndicesExtraction.HIGHEST_POINT)),
+        (DataMetrics.JUMP_DISTANCE, _jump_distance, (DataIndicesExtraction.TOE_OFF, DataIndicesExtraction.RECEPTION)),
+        (DataMetrics.JUMP_FLIGHT_TIME, _flight_time, (DataIndicesExtraction.TOE_OFF, DataIndicesExtraction.RECEPTION)),
+    )
+
+    registry = MetricRegistry()
+    for window in MetricWindow:
+        metric = DataMetrics[f"{window.name}_HEAD_HORIZONTAL_DISPERSION"]
+        function = partial(_windowed_metric, _horizontal_dispersion, DataTag.HEAD_POSITION)
+        registry.add(MetricDefinition(metric, function, metric.description, (DataTag.HEAD_POSITION,), window=window))
+        for side, tag in hands:
+            metric = DataMetrics[f"{window.name}_{side}_HAND_ACCELERATION_PEAK"]
+            function = partial(_windowed_derivative_metric, _acceleration_peak, tag)
+            registry.add(
+                MetricDefinition(metric, function, metric.description, (tag,), (DataType.ACCELERATION,), window=window)
+            )
+        for side, tag in hands:
+            metric = DataMetrics[f"{window.name}_{side}_HAND_TRAVELED_DISTANCE"]
+            function = partial(_windowed_metric, _traveled_distance, tag)
+            registry.add(MetricDefinition(metric, function, metric.description, (tag,), window=window))
+
+        if window == MetricWindow.OVERALL:
+            for metric, helper, events in jump_metrics:
+                function = partial(_event_metric, helper)
+                tags = () if metric == DataMetrics.JUMP_FLIGHT_TIME else (DataTag.HEAD_POSITION,)
+                registry.add(MetricDefinition(metric, function, metric.description, tags, events=events))
+
+    metric = DataMetrics.JUMP_INDICES
+    registry.add(
+        MetricDefinition(metric, _jump_indices, metric.description, (), (), events=tuple(DataIndicesExtraction))
+    )
+    return registry
+
+
+# The metrics computed by data_extraction (and the source of the DataMetrics requirements)
+CORE_METRICS = _core_metrics()
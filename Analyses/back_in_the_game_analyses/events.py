@@ -0,0 +1,318 @@
+from enum import Enum
+from typing import Iterable, Iterator
+
+import numpy as np
+
+# Thresholds of the jump events detection
+VELOCITY_SAFETY_THRESHOLD = -5.0  # m/s
+VELOCITY_THRESHOLD = -2.0  # m/s
+GRAVITY = -9.81  # m/s/s
+MINIMUM_SQUAT_START_INDEX = 10
+
+
+class DataIndicesExtraction(Enum):
+    SQUAT_START = "squat_start"
+    SQUAT_DEEPEST = "squat_deepest"
+    SQUAT_END = "squat_end"
+    TOE_OFF = "toe_off"
+    HIGHEST_POINT = "highest_point"
+    RECEPTION = "reception"
+
+
+class ThresholdCrossings:
+    def __init__(self, mask: np.ndarray):
+        """
+        The runs of consecutive frames where a condition holds, found in a single pass over the signal. Queries for
+        the first (or last) frame meeting the condition after (or before) a given frame are then answered by a binary
+        search over the runs instead of scanning the signal again.
+
+        Parameters
+        ----------
+        mask : np.ndarray
+            Whether the condition holds at each frame (NaN values of the signal must compare as False).
+        """
+        edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+        self._starts = np.flatnonzero(edges == 1)
+        self._ends = np.flatnonzero(edges == -1) - 1
+        self._n_frames = mask.shape[0]
+
+    @property
+    def n_runs(self) -> int:
+        """Returns the number of runs where the condition holds."""
+        return self._starts.shape[0]
+
+    def first_from(self, start: int) -> int | None:
+        """Returns the first frame from start (inclusive) where the condition holds, None if there is none."""
+        run = np.searchsorted(self._ends, start)
+        if run == self.n_runs:
+            return None
+        return max(int(self._starts[run]), start)
+
+    def last_until(self, stop: int, start: int = 0) -> int | None:
+        """Returns the last frame between start and stop (both inclusive) where the condition holds, None if none."""
+        run = np.searchsorted(self._starts, stop, side="right") - 1
+        if run < 0:
+            return None
+        last = min(int(self._ends[run]), stop)
+        return last if last >= start else None
+
+
+class JumpCrossings:
+    def __init__(
+        self,
+        velocity: np.ndarray,
+        acceleration: np.ndarray,
+        velocity_safety_threshold: float = VELOCITY_SAFETY_THRESHOLD,
+        velocity_threshold: float = VELOCITY_THRESHOLD,
+        gravity: float = GRAVITY,
+    ):
+        """
+        All the threshold crossings of the vertical head velocity and acceleration used by the jump events detection.
+        They are computed once, so the events of any number of jumps are then resolved in O(number of events).
+
+        Parameters
+        ----------
+        velocity : np.ndarray
+            The vertical velocity of the head, of shape (n_frames,).
+        acceleration : np.ndarray
+            The vertical acceleration of the head, of shape (n_frames,).
+        velocity_safety_threshold : float
+            The velocity a squat must reach to be detected.
+        velocity_threshold : float
+            The velocity defining the start of the squat.
+        gravity : float
+            The acceleration defining the flight phase.
+        """
+        self.n_frames = velocity.shape[0]
+        self.below_safety_threshold = ThresholdCrossings(velocity < velocity_safety_threshold)
+        self.above_threshold = ThresholdCrossings(velocity >= velocity_threshold)
+        self.velocity_non_negative = ThresholdCrossings(velocity >= 0)
+        self.velocity_negative = ThresholdCrossings(velocity < 0)
+        self.velocity_non_positive = ThresholdCrossings(velocity <= 0)
+        self.free_falling = ThresholdCrossings(acceleration <= gravity)
+        self.not_free_falling = ThresholdCrossings(acceleration >= gravity)
+
+    @classmethod
+    def from_crossings(
+        cls,
+        n_frames: int,
+        below_safety_threshold: ThresholdCrossings,
+        above_threshold: ThresholdCrossings,
+        velocity_non_negative: ThresholdCrossings,
+        velocity_negative: ThresholdCrossings,
+        velocity_non_positive: ThresholdCrossings,
+        free_falling: ThresholdCrossings,
+        not_free_falling: ThresholdCrossings,
+    ) -> "JumpCrossings":
+        """
+        Assembles the JumpCrossings from crossings already computed (e.g. shared by several combinations of
+        thresholds, see `JumpCrossingsGrid`), without comparing the signals again.
+        """
+        crossings = cls.__new__(cls)
+        crossings.n_frames = n_frames
+        crossings.below_safety_threshold = below_safety_threshold
+        crossings.above_threshold = above_threshold
+        crossings.velocity_non_negative = velocity_non_negative
+        crossings.velocity_negative = velocity_negative
+        crossings.velocity_non_positive = velocity_non_positive
+        crossings.free_falling = free_falling
+        crossings.not_free_falling = not_free_falling
+        return crossings
+
+
+class JumpCrossingsGrid:
+    def __init__(
+        self,
+        velocity: np.ndarray,
+        acceleration: np.ndarray,
+        velocity_safety_thresholds: Iterable[float],
+        velocity_thresholds: Iterable[float],
+        gravities: Iterable[float],
+    ):
+        """
+        The JumpCrossings of every combination of thresholds. Each threshold is broadcast against the signal it is
+        compared to, so the crossings are computed once per threshold value instead of once per combination, and the
+        crossings that do not depend on the thresholds are shared by all the combinations.
+
+        Parameters
+        ----------
+        velocity : np.ndarray
+            The vertical velocity of the head, of shape (n_frames,).
+        acceleration : np.ndarray
+            The vertical acceleration of the head, of shape (n_frames,).
+        velocity_safety_thresholds : Iterable[float]
+            The velocities a squat must reach to be detected.
+        velocity_thresholds : Iterable[float]
+            The velocities defining the start of the squat.
+        gravities : Iterable[float]
+            The accelerations defining the flight phase.
+        """
+        velocity_safety_thresholds = np.unique(np.asarray(list(velocity_safety_thresholds), dtype=np.float64))
+        velocity_thresholds = np.unique(np.asarray(list(velocity_thresholds), dtype=np.float64))
+        gravities = np.unique(np.asarray(list(gravities), dtype=np.float64))
+
+        # The crossings of the sign of the velocity do not depend on the thresholds
+        self._n_frames = velocity.shape[0]
+        self._velocity_non_negative = ThresholdCrossings(velocity >= 0)
+        self._velocity_negative = ThresholdCrossings(velocity < 0)
+        self._velocity_non_positive = ThresholdCrossings(velocity <= 0)
+        below = velocity[:, np.newaxis] < velocity_safety_thresholds[np.newaxis, :]
+        above = velocity[:, np.newaxis] >= velocity_thresholds[np.newaxis, :]
+        falling = acceleration[:, np.newaxis] <= gravities[np.newaxis, :]
+        not_falling = acceleration[:, np.newaxis] >= gravities[np.newaxis, :]
+        self._below_safety_threshold = {
+            float(threshold): ThresholdCrossings(below[:, i]) for i, threshold in enumerate(velocity_safety_thresholds)
+        }
+        self._above_threshold = {
+            float(threshold): ThresholdCrossings(above[:, i]) for i, threshold in enumerate(velocity_thresholds)
+        }
+        self._free_falling = {float(gravity): ThresholdCrossings(falling[:, i]) for i, gravity in enumerate(gravities)}
+        self._not_free_falling = {
+            float(gravity): ThresholdCrossings(not_falling[:, i]) for i, gravity in enumerate(gravities)
+        }
+
+    def crossings(self, velocity_safety_threshold: float, velocity_threshold: float, gravity: float) -> JumpCrossings:
+        """Returns the JumpCrossings of a combination of the thresholds of the grid."""
+        return JumpCrossings.from_crossings(
+            self._n_frames,
+            below_safety_threshold=self._below_safety_threshold[float(velocity_safety_threshold)],
+            above_threshold=self._above_threshold[float(velocity_threshold)],
+            velocity_non_negative=self._velocity_non_negative,
+            velocity_negative=self._velocity_negative,
+            velocity_non_positive=self._velocity_non_positive,
+            free_falling=self._free_falling[float(gravity)],
+            not_free_falling=self._not_free_falling[float(gravity)],
+        )
+
+
+def _first_or(crossings: ThresholdCrossings, start: int) -> int:
+    # When no frame meets the condition, the search falls back to the frame it started from
+    found = crossings.first_from(start)
+    return start if found is None else found
+
+
+def jump_events(
+    crossings: JumpCrossings, start: int = 0, minimum_squat_start_index: int = MINIMUM_SQUAT_START_INDEX
+) -> dict[DataIndicesExtraction, int | None]:
+    """
+    Resolves the squat and jump events following the first squat from start. The sequence of events is:
+        1) The first time the velocity is more negative than the safety threshold (start_squat_idx_tp)
+        2) From start_squat_idx_tp, walk backwards to the last time the velocity was above the threshold (SQUAT_START)
+        3) From SQUAT_START, the first time the velocity becomes positive (SQUAT_DEEPEST)
+        4) From SQUAT_DEEPEST, the first time the velocity becomes negative again (SQUAT_END)
+        5) From SQUAT_DEEPEST, the first time the acceleration becomes less than gravity (TOE_OFF)
+        6) From TOE_OFF, the first time the velocity becomes negative (HIGHEST_POINT)
+        7) From HIGHEST_POINT, the first time the acceleration is larger than gravity (RECEPTION)
+    As in the original scan-based detection, an event that is never reached falls back to the event its search
+    started from.
+
+    Parameters
+    ----------
+    crossings : JumpCrossings
+        The precomputed threshold crossings of the recording.
+    start : int
+        The frame from which the squat is searched.
+    minimum_squat_start_index : int
+        Squats starting before this frame are considered invalid (the start of the recording is not reliable).
+
+    Returns
+    -------
+    dict[DataIndicesExtraction, int | None]
+        The indices of the events, all None if the squat is invalid.
+    """
+    if crossings.n_frames == 0 or start >= crossings.n_frames:
+        return {idx: None for idx in DataIndicesExtraction}
+
+    start_squat_idx_tp = _first_or(crossings.below_safety_threshold, start)
+    start_squat_idx = crossings.above_threshold.last_until(start_squat_idx_tp, start=start)
+    if start_squat_idx is None:
+        start_squat_idx = start_squat_idx_tp
+    if start_squat_idx < minimum_squat_start_index:
+        return {idx: None for idx in DataIndicesExtraction}
+
+    deepest_squat_idx = _first_or(crossings.velocity_non_negative, start_squat_idx)
+    end_squat_idx = _first_or(crossings.velocity_negative, deepest_squat_idx)
+    toe_off_idx = _first_or(crossings.free_falling, deepest_squat_idx)
+    highest_point_idx = _first_or(crossings.velocity_non_positive, toe_off_idx)
+    reception_idx = _first_or(crossings.not_free_falling, highest_point_idx)
+    return {
+        DataIndicesExtraction.SQUAT_START: start_squat_idx,
+        DataIndicesExtraction.SQUAT_DEEPEST: deepest_squat_idx,
+        DataIndicesExtraction.SQUAT_END: end_squat_idx,
+        DataIndicesExtraction.TOE_OFF: toe_off_idx,
+        DataIndicesExtraction.HIGHEST_POINT: highest_point_idx,
+        DataIndicesExtraction.RECEPTION: reception_idx,
+    }
+
+
+def jump_episodes(
+    crossings: JumpCrossings, minimum_squat_start_index: int = MINIMUM_SQUAT_START_INDEX
+) -> Iterator[tuple[slice, dict[DataIndicesExtraction, int]]]:
+    """
+    Resolves the events of every jump of the recording, in a single forward pass over the crossings. Each squat is
+    searched once the previous jump is over, i.e. once the head goes up again after both its reception and the end of
+    its squat. The recording is split into consecutive episodes: each one spans from the frame its squat was searched
+    from up to the frame the next squat is searched from (or the end of the recording).
+
+    Parameters
+    ----------
+    crossings : JumpCrossings
+        The precomputed threshold crossings of the recording.
+    minimum_squat_start_index : int
+        Squats starting before this frame are considered invalid (the start of the recording is not reliable).
+
+    Yields
+    ------
+    tuple[slice, dict[DataIndicesExtraction, int]]
+        The frames of the episode and the indices of the events of its jump, in chronological order.
+    """
+    start = 0
+    episode_start = 0
+    events = None
+    while True:
+        start_squat_idx_tp = crossings.below_safety_threshold.first_from(start)
+        if start_squat_idx_tp is None:
+            break
+
+        squat_events = jump_events(crossings, start=start, minimum_squat_start_index=minimum_squat_start_index)
+        if squat_events[DataIndicesExtraction.SQUAT_START] is None:
+            # The squat started too early to be trusted, resume the search once it is over
+            start = crossings.velocity_non_negative.first_from(start_squat_idx_tp)
+            if start is None:
+                break
+            continue
+
+        if events is not None:
+            yield slice(episode_start, start), events
+            episode_start = start
+        events = squat_events
+
+        # The head keeps going down while the landing is absorbed, which must not be mistaken for the next squat
+        landing = max(events[DataIndicesExtraction.RECEPTION], events[DataIndicesExtraction.SQUAT_END])
+        start = crossings.velocity_non_negative.first_from(landing + 1)
+        if start is None:
+            break
+
+    if events is not None:
+        yield slice(episode_start, crossings.n_frames), events
+
+
+def all_jump_events(
+    crossings: JumpCrossings, minimum_squat_start_index: int = MINIMUM_SQUAT_START_INDEX
+) -> list[dict[DataIndicesExtraction, int]]:
+    """
+    Resolves the events of every jump of the recording (see `jump_episodes`).
+
+    Parameters
+    ----------
+    crossings : JumpCrossings
+        The precomputed threshold crossings of the recording.
+    minimum_squat_start_index : int
+        Squats starting before this frame are considered invalid (the start of the recording is not reliable).
+
+    Returns
+    -------
+    list[dict[DataIndicesExtraction, int]]
+        The indices of the events of each valid jump, in chronological order.
+    """
+    return [events for _, events in jump_episodes(crossings, minimum_squat_start_index=minimum_squat_start_index)]
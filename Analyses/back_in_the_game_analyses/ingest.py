@@ -0,0 +1,272 @@
+import asyncio
+import io
+from pathlib import Path
+import time
+import traceback
+from typing import Any, AsyncIterator, Callable
+
+import numpy as np
+import pandas as pd
+
+from .batch import ExtractionResult
+from .data import Data, DataBackend, DataTag
+from .data_extraction import data_extraction, required_tags
+
+# The number of frames the CsvWriter of the patient application buffers before writing them (see
+# Assets/RealtimeNetworking/Common/CsvWriter.cs)
+CSV_WRITER_FRAMES_PER_FLUSH = 100
+
+
+class CsvTail:
+    def __init__(self, path: Path, tags: list[DataTag]):
+        """
+        Follows a CSV file while it is written, reading only the rows appended since the previous read. A row is only
+        read once its line is complete, so the rows being written are never parsed twice or partially.
+
+        Parameters
+        ----------
+        path : Path
+            The path to the CSV file.
+        tags : list[DataTag]
+            The DataTag groups to read (the frames are always read).
+        """
+        self._path = Path(path)
+        self._tags = [tag for tag in tags if tag != DataTag.FRAME]
+        self._offset = 0
+        self._header: list[str] | None = None
+
+    @property
+    def path(self) -> Path:
+        """Returns the path to the CSV file."""
+        return self._path
+
+    @property
+    def tags(self) -> list[DataTag]:
+        """Returns the DataTag groups read from the file (the ones missing from its header are removed once read)."""
+        return self._tags
+
+    def read(self) -> tuple[np.ndarray, dict[DataTag, np.ndarray]] | None:
+        """
+        Reads the rows completed since the previous read.
+
+        Returns
+        -------
+        tuple[np.ndarray, dict[DataTag, np.ndarray]] | None
+            The frames and the values of each DataTag group of the new rows, None if no row was completed.
+        """
+        with open(self._path, "rb") as file:
+            if file.seek(0, io.SEEK_END) < self._offset:
+                raise ValueError(f"{self._path} was truncated while it was followed")
+            file.seek(self._offset)
+            chunk = file.read()
+
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return None
+        self._offset += end
+        chunk = chunk[:end]
+
+        if self._header is None:
+            header_end = chunk.index(b"\n") + 1
+            self._header = chunk[:header_end].decode().strip().split(",")
+            self._tags = [tag for tag in self._tags if all(column in self._header for column in tag.value)]
+            chunk = chunk[header_end:]
+            if not chunk.strip():
+                return None
+
+        columns = [DataTag.FRAME.value] + [column for tag in self._tags for column in tag.value]
+        df = pd.read_csv(
+            io.BytesIO(chunk), header=None, names=self._header, usecols=columns, dtype=np.float64, engine="c"
+        )
+        return df[DataTag.FRAME.value].to_numpy(), {tag: df[tag.value].to_numpy() for tag in self._tags}
+
+
+class _FollowedRecording:
+    def __init__(self, path: Path, tags: list[DataTag], backend: DataBackend):
+        """A recording being written, the rows read so far and the time it last grew."""
+        self.tail = CsvTail(path, tags)
+        self.backend = backend
+        self.data: Data | None = None
+        self.last_growth = time.monotonic()
+
+    def read(self) -> int:
+        """Adds the new rows of the file to the recording and returns their number."""
+        rows = self.tail.read()
+        if rows is None:
+            return 0
+
+        frame, values = rows
+        if self.data is None:
+            self.data = Data.from_arrays(frame, values, data_path=self.tail.path, backend=self.backend)
+        else:
+            self.data.extend(frame, values)
+        self.last_growth = time.monotonic()
+        return frame.shape[0]
+
+
+class RecordingWatcher:
+    def __init__(
+        self,
+        data_path: Path,
+        extraction: Callable[[Data], Any] = data_extraction,
+        poll_interval: float = 0.5,
+        idle_timeout: float = 5.0,
+        include_existing: bool = False,
+        backend: DataBackend = DataBackend.NUMPY,
+    ):
+        """
+        Watches the recordings of a data folder (<data_path>/<subject>/*.csv, as read by the runner) while the
+        patient application writes them. The rows appended to each file are read incrementally (see `CsvTail`) into
+        a `Data` of the file, and the metrics are extracted as soon as the file stops growing, so they are available
+        a few seconds after the end of each trial.
+
+        Parameters
+        ----------
+        data_path : Path
+            The folder holding one folder of recordings per subject.
+        extraction : Callable[[Data], Any]
+            The function extracting the metrics of a recording (`data_extraction` or `jump_segmentation`).
+        poll_interval : float
+            The time (s) between two scans of the files.
+        idle_timeout : float
+            The time (s) a file must stop growing for its recording to be considered finished. It must be longer than
+            the time the patient application takes to write a flush of CSV_WRITER_FRAMES_PER_FLUSH frames.
+        include_existing : bool
+            If False, the files that had already stopped growing (for idle_timeout) when the watcher started are
+            ignored, as they are analysed by the runner.
+        backend : DataBackend
+            The backend of the recordings, NUMPY or COMPACT.
+        """
+        if backend == DataBackend.PANDAS:
+            raise ValueError("The followed recordings are stored with the NUMPY or COMPACT backend")
+
+        self._data_path = Path(data_path)
+        self._extraction = extraction
+        self._poll_interval = poll_interval
+        self._idle_timeout = idle_timeout
+        self._backend = backend
+        self._tags = list(required_tags())
+        self._followed: dict[Path, _FollowedRecording] = {}
+        self._finished: set[Path] = set()
+        self._stopped = False
+
+        if not include_existing:
+            now = time.time()
+            for path in self._recording_paths():
+                if now - path.stat().st_mtime >= idle_timeout:
+                    self._finished.add(path)
+
+    def _recording_paths(self) -> list[Path]:
+        if not self._data_path.exists():
+            return []
+        return sorted(self._data_path.glob("*/*.csv"))
+
+    def stop(self) -> None:
+        """Stops `watch` after the current scan."""
+        self._stopped = True
+
+    async def poll(self) -> list[ExtractionResult]:
+        """
+        Reads the rows appended to the recordings since the previous poll and returns the results of the recordings
+        that stopped growing.
+
+        Returns
+        -------
+        list[ExtractionResult]
+            The outcome of the extraction of each recording that finished since the previous poll.
+        """
+        for path in self._recording_paths():
+            if path not in self._finished and path not in self._followed:
+                self._followed[path] = _FollowedRecording(path, self._tags, self._backend)
+
+        results = []
+        now = time.monotonic()
+        for path, recording in list(self._followed.items()):
+            try:
+                n_rows = await asyncio.to_thread(recording.read)
+            except Exception:
+                results.append(self._finish(path, ExtractionResult(path, error=traceback.format_exc())))
+                continue
+
+            if n_rows == 0 and now - recording.last_growth >= self._idle_timeout:
+                results.append(self._finish(path, await asyncio.to_thread(self._extract, recording)))
+        return results
+
+    def _extract(self, recording: _FollowedRecording) -> ExtractionResult:
+        path = recording.tail.path
+        if recording.data is None:
+            return ExtractionResult(path, error=f"{path} holds no frame")
+        try:
+            return ExtractionResult(path, metrics=self._extraction(recording.data))
+        except Exception:
+            return ExtractionResult(path, error=traceback.format_exc())
+
+    def _finish(self, path: Path, result: ExtractionResult) -> ExtractionResult:
+        del self._followed[path]
+        self._finished.add(path)
+        return result
+
+    async def watch(self) -> AsyncIterator[ExtractionResult]:
+        """
+        Polls the recordings until `stop` is called, yielding the result of each recording as soon as it finishes.
+
+        Yields
+        ------
+        ExtractionResult
+            The outcome of the extraction of a finished recording.
+        """
+        self._stopped = False
+        while not self._stopped:
+            for result in await self.poll():
+                yield result
+            await asyncio.sleep(self._poll_interval)
+
+
+async def simulate_csv_writer(
+    source_path: Path,
+    destination_path: Path,
+    frames_per_flush: int = CSV_WRITER_FRAMES_PER_FLUSH,
+    speed: float | None = 1.0,
+) -> Path:
+    """
+    Stands in for the CsvWriter of the patient application: copies the rows of a recorded CSV file to a new file,
+    appending them by flushes of frames_per_flush frames at the pace they were recorded.
+
+    Parameters
+    ----------
+    source_path : Path
+        Path to the CSV file to copy.
+    destination_path : Path
+        Path to the CSV file to write (its folder is created if needed).
+    frames_per_flush : int
+        The number of frames appended by each write.
+    speed : float | None
+        The writing speed relative to the recording (1.0 is real time). If None, the flushes are written without
+        waiting.
+
+    Returns
+    -------
+    Path
+        The path to the written CSV file.
+    """
+    with open(source_path) as file:
+        header = file.readline()
+        lines = [line if line.endswith("\n") else line + "\n" for line in file.readlines() if line.strip()]
+    frames = [float(line.split(",", 1)[0]) for line in lines]
+
+    destination_path = Path(destination_path)
+    destination_path.parent.mkdir(parents=True, exist_ok=True)
+    start = time.monotonic()
+    with open(destination_path, "w") as file:
+        file.write(header)
+        file.flush()
+        for i in range(0, len(lines), frames_per_flush):
+            flush = lines[i : i + frames_per_flush]
+            if speed is not None:
+                # The flush is written once its last frame has been recorded
+                delay = (frames[i + len(flush) - 1] - frames[0]) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            file.writelines(flush)
+            file.flush()
+    return destination_path
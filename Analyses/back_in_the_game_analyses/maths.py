@@ -1,6 +1,10 @@
+from functools import lru_cache
+from typing import NamedTuple
+
 import numpy as np
 import pandas as pd
-from scipy.stats import chi2
+
+from .profiling import profiled
 
 
 def compute_norm(df: pd.DataFrame) -> np.float64:
@@ -20,6 +24,24 @@ def compute_norm(df: pd.DataFrame) -> np.float64:
     return np.sqrt((df**2).sum())
 
 
+def compute_norm_array(values: np.ndarray) -> np.ndarray | np.float64:
+    """
+    NumPy counterpart of `compute_norm`. As for the DataFrame version, the sum is performed along the first axis
+    and NaN values are ignored.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Array of shape (n_frames,) or (n_frames, n_columns).
+
+    Returns
+    -------
+    np.ndarray | np.float64
+        The norm of each column (or a scalar if values is 1D).
+    """
+    return np.sqrt(np.nansum(values**2, axis=0))
+
+
 def central_derivative(df: pd.DataFrame, time: pd.Series, window: int) -> pd.DataFrame:
     """
     Compute the central finite difference derivative of a DataFrame
@@ -44,6 +66,204 @@ def central_derivative(df: pd.DataFrame, time: pd.Series, window: int) -> pd.Dat
     return numerator.div(denominator, axis=0)
 
 
+def central_derivative_array(
+    values: np.ndarray, time: np.ndarray, window: int, out: np.ndarray | None = None, period: float | None = None
+) -> np.ndarray:
+    """
+    NumPy counterpart of `central_derivative`. The same finite difference is applied along the first axis so the
+    results are identical to the pandas implementation (including the NaN padding at both ends).
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Values to differentiate, of shape (n_frames,) or (n_frames, n_columns), or (n_frames, n_trials, n_columns) for
+        several stacked trials.
+    time : np.ndarray
+        Time values of shape (n_frames,), or (n_frames, n_trials) for several stacked trials.
+    window : int
+        The number of points to use for the central difference.
+    out : np.ndarray | None
+        The array, of the same shape as values, the derivatives are written to (e.g. a preallocated float32 buffer).
+        If None, a new float64 array is allocated.
+    period : float | np.ndarray | None
+        The period (s) of a uniformly sampled recording (see `resample_uniform`). The difference is then divided by
+        the constant time spanned by two frames instead of being aligned with the time of each frame. For several
+        stacked trials, an array of shape (n_trials,) holding the period of each trial, NaN if it was not resampled.
+
+    Returns
+    -------
+    np.ndarray
+        Approximate derivatives of values with respect to time, with the same shape and memory layout as values.
+    """
+    n_frames = values.shape[0]
+    if out is None:
+        derivative = np.full_like(values, np.nan, dtype=np.float64)
+    else:
+        derivative = out
+        derivative[:window] = np.nan
+        derivative[max(n_frames - window, window) :] = np.nan
+    if n_frames <= 2 * window:
+        return derivative
+
+    if period is None or np.ndim(period) > 0:
+        denominator = time[2 * window :] - time[2 * window - 2 : n_frames - 2]
+        if period is not None:
+            # The stacked trials that were resampled use their period, the others (NaN period) their time
+            denominator = np.where(np.isnan(period), denominator, 2 * np.asarray(period))
+        denominator = denominator.reshape(denominator.shape + (1,) * (values.ndim - time.ndim))
+    else:
+        denominator = 2 * period
+    if out is None:
+        derivative[window : n_frames - window] = (values[2 * window :] - values[: n_frames - 2 * window]) / denominator
+    else:
+        # Computed in place, so no temporary of the size of the recording is allocated
+        np.subtract(values[2 * window :], values[: n_frames - 2 * window], out=derivative[window : n_frames - window])
+        derivative[window : n_frames - window] /= denominator
+    return derivative
+
+
+def savitzky_golay_derivatives(
+    values: np.ndarray, time: np.ndarray, window: int, polyorder: int = 3
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the first and second time derivatives with a Savitzky-Golay filter, i.e. by fitting a polynomial over
+    the 2 * window + 1 frames centered on each frame. Both derivatives are obtained from the same sliding windows in
+    a single pass. The sampling is assumed uniform, at the median period of time.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Values to differentiate, of shape (n_frames,) or (n_frames, n_columns).
+    time : np.ndarray
+        Time values of shape (n_frames,).
+    window : int
+        The number of frames on each side of the fitted frame.
+    polyorder : int
+        The order of the fitted polynomial (at least 2).
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The first and second derivatives, with the same shape as values and NaN for the first and last window frames.
+    """
+    n_frames = values.shape[0]
+    first = np.full_like(values, np.nan, dtype=np.float64)
+    second = np.full_like(values, np.nan, dtype=np.float64)
+    window_length = 2 * window + 1
+    if n_frames < window_length:
+        return first, second
+
+    # scipy is imported at the first use, as it dominates the import time of the package
+    from scipy.signal import savgol_coeffs
+
+    delta = np.median(np.diff(time))
+    coefficients = np.stack(
+        [savgol_coeffs(window_length, polyorder, deriv=order, delta=delta, use="dot") for order in (1, 2)]
+    )
+    windows = np.lib.stride_tricks.sliding_window_view(values, window_length, axis=0)
+    derivatives = np.einsum("...w,kw->k...", windows, coefficients)
+    first[window : n_frames - window] = derivatives[0]
+    second[window : n_frames - window] = derivatives[1]
+    return first, second
+
+
+def recursive_derivatives(values: np.ndarray, time: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the first and second time derivatives with a causal recursive filter: each derivative is the backward
+    finite difference smoothed by an exponential moving average spanning window frames. As each frame only depends
+    on the previous ones, the filter can be used online, at the cost of a delay of about window / 2 frames.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Values to differentiate, of shape (n_frames,) or (n_frames, n_columns).
+    time : np.ndarray
+        Time values of shape (n_frames,).
+    window : int
+        The span (in frames) of the exponential moving average.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The first and second derivatives, with the same shape as values and NaN for the first frame (first
+        derivative) and the first two frames (second derivative).
+    """
+    alpha = 2 / (window + 1)
+    period = np.diff(time)
+    if values.ndim > 1:
+        period = period[:, np.newaxis]
+
+    first = np.full_like(values, np.nan, dtype=np.float64)
+    second = np.full_like(values, np.nan, dtype=np.float64)
+    if values.shape[0] > 1:
+        first[1:] = _smoothed_difference(values, period, alpha)
+    if values.shape[0] > 2:
+        second[2:] = _smoothed_difference(first[1:], period[1:], alpha)
+    return first, second
+
+
+def _smoothed_difference(signal: np.ndarray, period: np.ndarray, alpha: float) -> np.ndarray:
+    """Returns the backward finite difference of signal smoothed by an exponential moving average of factor alpha."""
+    from scipy.signal import lfilter, lfilter_zi
+
+    difference = np.diff(signal, axis=0) / period
+    # The filter starts in its steady state for the first difference, so there is no transient towards zero
+    initial = lfilter_zi([alpha], [1, alpha - 1]) * difference[:1]
+    smoothed, _ = lfilter([alpha], [1, alpha - 1], difference, axis=0, zi=initial)
+    return smoothed
+
+
+class EllipseParameters(NamedTuple):
+    """
+    The parameters of a confidence ellipse. For the batched fits (see `fit_confidence_ellipse_batch`), each field is
+    an array holding the parameter of each ellipse.
+    """
+
+    center_x: float | np.ndarray
+    center_y: float | np.ndarray
+    a: float | np.ndarray
+    b: float | np.ndarray
+    theta: float | np.ndarray
+
+    @property
+    def area(self) -> float | np.ndarray:
+        """Returns the area of the ellipse (π * a * b), used as a measure of dispersion."""
+        return self.a * self.b * np.pi
+
+
+@lru_cache(maxsize=None)
+def confidence_scale(confidence: float) -> float:
+    """
+    Returns the factor scaling the standard deviations of 2D data to the semi-axes of the confidence ellipse, i.e.
+    the square root of the chi-square quantile with two degrees of freedom. It is cached per confidence level.
+    """
+    from scipy.stats import chi2
+
+    return float(np.sqrt(chi2.ppf(confidence, df=2)))
+
+
+def _symmetric_eigen_2x2(
+    cov_xx: float | np.ndarray, cov_yy: float | np.ndarray, cov_xy: float | np.ndarray
+) -> tuple[float | np.ndarray, float | np.ndarray, float | np.ndarray]:
+    """
+    Returns the largest and smallest eigenvalues of the symmetric 2x2 matrices [[cov_xx, cov_xy], [cov_xy, cov_yy]]
+    and the angle of the eigenvector of the largest one, in closed form.
+    """
+    half_trace = (cov_xx + cov_yy) / 2
+    radius = np.hypot((cov_xx - cov_yy) / 2, cov_xy)
+    largest = half_trace + radius
+    # The product of the eigenvalues is the determinant, which avoids the cancellation of half_trace - radius when the
+    # ellipse is elongated
+    with np.errstate(invalid="ignore", divide="ignore"):
+        smallest = np.where(largest == 0, 0.0, (cov_xx * cov_yy - cov_xy * cov_xy) / largest)
+    smallest = np.clip(smallest, 0.0, None)
+    theta = np.arctan2(2 * cov_xy, cov_xx - cov_yy) / 2
+    if np.ndim(largest) == 0:
+        return float(largest), float(smallest), float(theta)
+    return largest, smallest, theta
+
+
+@profiled("fit_confidence_ellipse")
 def fit_confidence_ellipse(data: pd.DataFrame, confidence: float = 0.95) -> pd.DataFrame:
     """
     Fit a confidence ellipse to 2D data using PCA.
@@ -63,30 +283,130 @@ def fit_confidence_ellipse(data: pd.DataFrame, confidence: float = 0.95) -> pd.D
         - center_y: y-coordinate of the ellipse center
         - a: semi-major axis length
         - b: semi-minor axis length
-        - theta: rotation angle of the ellipse in radians
+        - theta: rotation angle of the ellipse in radians, in [-π/2, π/2]
     """
     if data.shape[1] != 2:
         raise ValueError("Data must contain exactly two columns for x and y coordinates.")
 
-    # Compute mean (ellipse center)
-    center = data.mean().values
+    # The DataFrame is only a boundary: the ellipse is fitted on the array, with the missing values ignored pairwise
+    ellipse = fit_confidence_ellipse_array(data.to_numpy(dtype=np.float64), confidence=confidence)
+    return pd.DataFrame({parameter: [float(value)] for parameter, value in ellipse._asdict().items()})
+
+
+def _variance(x: np.ndarray) -> tuple[float, float]:
+    """Returns the mean and the unbiased variance of x (NaN if it holds less than two values)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = x.mean() if x.size else np.nan
+        centered = x - mean
+        return mean, np.dot(centered, centered) / (x.size - 1)
+
+
+def _covariance(x: np.ndarray, y: np.ndarray) -> float:
+    """Returns the unbiased covariance of x and y (NaN if they hold less than two values)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if x.size == 0:
+            return np.nan
+        return np.dot(x - x.mean(), y - y.mean()) / (x.size - 1)
+
+
+@profiled("fit_confidence_ellipse_array")
+def fit_confidence_ellipse_array(data: np.ndarray, confidence: float = 0.95) -> EllipseParameters:
+    """
+    NumPy implementation of `fit_confidence_ellipse`, which only converts its DataFrame to and from arrays. The
+    covariance is computed in float64 and its eigen decomposition is solved in closed form, so fitting an ellipse
+    costs a few vector operations.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        Array of shape (n_points, 2) containing the x and y coordinates of the points.
+    confidence : float
+        Confidence level for the ellipse (default is 0.95).
+
+    Returns
+    -------
+    EllipseParameters
+        The parameters of the fitted ellipse (center_x, center_y, a, b, theta), see `fit_confidence_ellipse`.
+    """
+    if data.ndim != 2 or data.shape[1] != 2:
+        raise ValueError("Data must contain exactly two columns for x and y coordinates.")
+
+    x = np.asarray(data[:, 0], dtype=np.float64)
+    y = np.asarray(data[:, 1], dtype=np.float64)
+    missing_x = np.isnan(x)
+    missing_y = np.isnan(y)
+    if missing_x.any() or missing_y.any():
+        # As with pandas, the missing values are ignored pairwise (e.g. the gaps left by `resample_uniform`)
+        center_x, cov_xx = _variance(x[~missing_x])
+        center_y, cov_yy = _variance(y[~missing_y])
+        both = ~(missing_x | missing_y)
+        cov_xy = _covariance(x[both], y[both])
+    else:
+        center_x, cov_xx = _variance(x)
+        center_y, cov_yy = _variance(y)
+        cov_xy = _covariance(x, y)
+    major, minor, theta = _symmetric_eigen_2x2(cov_xx, cov_yy, cov_xy)
+
+    k = confidence_scale(confidence)
+    return EllipseParameters(center_x, center_y, np.sqrt(major) * k, np.sqrt(minor) * k, theta)
+
 
-    # Compute the covariance matrix
-    cov = data.cov().values
-    eigenvalues, eigenvectors = np.linalg.eigh(cov)
-    sorted_indices = np.argsort(eigenvalues)[::-1]
-    eigenvalues = eigenvalues[sorted_indices]
-    eigenvectors = eigenvectors[:, sorted_indices]
+@profiled("fit_confidence_ellipse_batch")
+def fit_confidence_ellipse_batch(
+    data: np.ndarray, lengths: np.ndarray | None = None, confidence: float = 0.95
+) -> EllipseParameters:
+    """
+    Batched counterpart of `fit_confidence_ellipse_array`, fitting one ellipse per set of points at once.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        Array of shape (n_points, n_sets, 2) containing the x and y coordinates of the points of each set. The sets
+        shorter than n_points are padded at the end. The NaN values are ignored pairwise.
+    lengths : np.ndarray | None
+        The number of points of each set, of shape (n_sets,). If None, all the sets have n_points points.
+    confidence : float
+        Confidence level for the ellipses (default is 0.95).
 
-    # Confidence scaling factor
-    k = np.sqrt(chi2.ppf(confidence, df=2))
+    Returns
+    -------
+    EllipseParameters
+        The parameters (center_x, center_y, a, b, theta) of each ellipse, each of shape (n_sets,). They are NaN for
+        the sets of less than two valid points.
+    """
+    if data.ndim != 3 or data.shape[2] != 2:
+        raise ValueError("Data must contain exactly two columns for x and y coordinates.")
 
-    # Compute the semi-major and semi-minor axes
-    a = np.sqrt(eigenvalues[0]) * k
-    b = np.sqrt(eigenvalues[1]) * k
+    n_points, n_sets, _ = data.shape
+    if lengths is None:
+        lengths = np.full(n_sets, n_points)
+    in_set = np.arange(n_points)[:, np.newaxis] < lengths[np.newaxis, :]
+    # As in `fit_confidence_ellipse_array`, the missing values are ignored pairwise
+    valid_x = in_set & ~np.isnan(data[:, :, 0])
+    valid_y = in_set & ~np.isnan(data[:, :, 1])
+    both = valid_x & valid_y
+    n_x, n_y, n_both = valid_x.sum(axis=0), valid_y.sum(axis=0), both.sum(axis=0)
+    x = np.where(valid_x, data[:, :, 0], 0.0)
+    y = np.where(valid_y, data[:, :, 1], 0.0)
 
-    # Compute the angle of rotation
-    theta = np.arctan2(eigenvectors[1, 0], eigenvectors[0, 0])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        center = np.column_stack([x.sum(axis=0) / n_x, y.sum(axis=0) / n_y])
+        x_both = np.where(both, x - np.where(both, x, 0.0).sum(axis=0) / n_both, 0.0)
+        y_both = np.where(both, y - np.where(both, y, 0.0).sum(axis=0) / n_both, 0.0)
+        x = np.where(valid_x, x - center[:, 0], 0.0)
+        y = np.where(valid_y, y - center[:, 1], 0.0)
+        # Only the three distinct terms of the symmetric covariance matrices are computed
+        cov_xx = np.einsum("ts,ts->s", x, x) / (n_x - 1)
+        cov_yy = np.einsum("ts,ts->s", y, y) / (n_y - 1)
+        cov_xy = np.einsum("ts,ts->s", x_both, y_both) / (n_both - 1)
 
-    # Return the parameters of the fitted ellipse
-    return pd.DataFrame({"center_x": [center[0]], "center_y": [center[1]], "a": [a], "b": [b], "theta": [theta]})
+    a = np.full(n_sets, np.nan)
+    b = np.full(n_sets, np.nan)
+    theta = np.full(n_sets, np.nan)
+    fitted = (n_x > 1) & (n_y > 1) & (n_both > 1) & np.isfinite(cov_xx) & np.isfinite(cov_yy) & np.isfinite(cov_xy)
+    if fitted.any():
+        major, minor, theta[fitted] = _symmetric_eigen_2x2(cov_xx[fitted], cov_yy[fitted], cov_xy[fitted])
+        k = confidence_scale(confidence)
+        a[fitted] = np.sqrt(major) * k
+        b[fitted] = np.sqrt(minor) * k
+    return EllipseParameters(center[:, 0], center[:, 1], a, b, theta)
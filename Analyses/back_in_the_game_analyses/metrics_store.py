@@ -0,0 +1,183 @@
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+from typing import Any, NamedTuple
+
+from .data_extraction import DataMetrics, DataIndicesExtraction
+from .version import __version__
+
+
+class RecordingFingerprint(NamedTuple):
+    """The stats and the content hash of a recording, which identify the content its metrics were computed from."""
+
+    size: int
+    mtime_ns: int
+    content_hash: str
+
+
+class MetricsStore:
+    def __init__(self, db_path: Path, version: str = __version__):
+        """
+        A persistent cache of the `data_extraction` outputs, stored in a SQLite database. Each entry is keyed by the
+        path of the recording, the hash of its content and the version of the package, so a recording is only
+        analysed again when it changed or when the analyses were updated.
+
+        Parameters
+        ----------
+        db_path : Path
+            Path to the SQLite database. It is created if it does not exist.
+        version : str
+            The version of the analyses the stored metrics belong to.
+        """
+        self._db_path = Path(db_path)
+        self._version = version
+        self._connection = sqlite3.connect(self._db_path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS metrics ("
+            "path TEXT NOT NULL, "
+            "content_hash TEXT NOT NULL, "
+            "version TEXT NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "metrics TEXT NOT NULL, "
+            "PRIMARY KEY (path, content_hash, version))"
+        )
+        self._connection.commit()
+
+    def __enter__(self) -> "MetricsStore":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the connection to the database."""
+        self._connection.close()
+
+    @property
+    def version(self) -> str:
+        """Returns the version of the analyses the stored metrics belong to."""
+        return self._version
+
+    @staticmethod
+    def content_hash(path: Path) -> str:
+        """Returns the SHA-256 hash of the content of the file."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def fingerprint(cls, path: Path) -> RecordingFingerprint:
+        """
+        Returns the fingerprint of the recording. The file is stat-ed before it is hashed, so if it is modified in
+        between, the stored mtime is older than the file and the next lookup hashes it again instead of trusting it.
+        """
+        stat = Path(path).stat()
+        return RecordingFingerprint(stat.st_size, stat.st_mtime_ns, cls.content_hash(path))
+
+    def get(self, path: Path) -> dict[DataMetrics, Any] | None:
+        """
+        Returns the stored metrics of the recording, or None if the recording was never analysed, if it changed since
+        or if it was analysed by another version of the package.
+        """
+        return self.lookup(path)[0]
+
+    def lookup(self, path: Path) -> tuple[dict[DataMetrics, Any] | None, RecordingFingerprint | None]:
+        """
+        Returns the stored metrics of the recording as `get`, along with the fingerprint of the recording when it must
+        be analysed (None otherwise). This fingerprint is taken before the analysis, so passing it to `put` stores the
+        metrics against the content they were computed from, even if the file is modified during the analysis.
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        key = str(path)
+
+        # Fast path: the file was not touched since it was stored, there is no need to hash it again
+        row = self._connection.execute(
+            "SELECT metrics FROM metrics WHERE path = ? AND version = ? AND size = ? AND mtime_ns = ?",
+            (key, self._version, stat.st_size, stat.st_mtime_ns),
+        ).fetchone()
+        if row is not None:
+            return self._deserialize(row[0]), None
+
+        fingerprint = RecordingFingerprint(stat.st_size, stat.st_mtime_ns, self.content_hash(path))
+        row = self._connection.execute(
+            "SELECT metrics FROM metrics WHERE path = ? AND content_hash = ? AND version = ?",
+            (key, fingerprint.content_hash, self._version),
+        ).fetchone()
+        if row is None:
+            return None, fingerprint
+
+        # The file was touched but its content is the same, refresh its stats so the next lookup is fast
+        self._connection.execute(
+            "UPDATE metrics SET size = ?, mtime_ns = ? WHERE path = ? AND content_hash = ? AND version = ?",
+            (*fingerprint, key, self._version),
+        )
+        self._connection.commit()
+        return self._deserialize(row[0]), None
+
+    def put(self, path: Path, metrics: dict[DataMetrics, Any], fingerprint: RecordingFingerprint | None = None) -> None:
+        """
+        Stores the metrics of the recording, replacing any previous entry of the same path and version.
+
+        Parameters
+        ----------
+        path : Path
+            The recording the metrics were computed from.
+        metrics : dict[DataMetrics, Any]
+            The output of `data_extraction` for this recording.
+        fingerprint : RecordingFingerprint | None
+            The fingerprint of the recording taken before its analysis (see `lookup`). If None, it is taken now, which
+            stores wrong metrics for the new content if the file was modified during the analysis.
+        """
+        path = Path(path).resolve()
+        if fingerprint is None:
+            fingerprint = self.fingerprint(path)
+        key = str(path)
+
+        with self._connection:
+            self._connection.execute("DELETE FROM metrics WHERE path = ? AND version = ?", (key, self._version))
+            self._connection.execute(
+                "INSERT INTO metrics (path, content_hash, version, size, mtime_ns, metrics) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    fingerprint.content_hash,
+                    self._version,
+                    fingerprint.size,
+                    fingerprint.mtime_ns,
+                    self._serialize(metrics),
+                ),
+            )
+
+    def remove(self, path: Path) -> None:
+        """Removes all the entries of the recording, whatever their version."""
+        with self._connection:
+            self._connection.execute("DELETE FROM metrics WHERE path = ?", (str(Path(path).resolve()),))
+
+    def __len__(self) -> int:
+        query = "SELECT COUNT(*) FROM metrics WHERE version = ?"
+        return self._connection.execute(query, (self._version,)).fetchone()[0]
+
+    @staticmethod
+    def _serialize(metrics: dict[DataMetrics, Any]) -> str:
+        values = {}
+        for metric, value in metrics.items():
+            if metric == DataMetrics.JUMP_INDICES:
+                values[metric.name] = {idx.name: None if i is None else int(i) for idx, i in value.items()}
+            else:
+                values[metric.name] = float(value)
+        return json.dumps(values)
+
+    @staticmethod
+    def _deserialize(serialized: str) -> dict[DataMetrics, Any]:
+        metrics = {}
+        for name, value in json.loads(serialized).items():
+            metric = DataMetrics[name]
+            if metric == DataMetrics.JUMP_INDICES:
+                metrics[metric] = {DataIndicesExtraction[idx]: i for idx, i in value.items()}
+            else:
+                metrics[metric] = value
+        return metrics
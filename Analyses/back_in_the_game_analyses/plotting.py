@@ -0,0 +1,393 @@
+from enum import Enum
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+import numpy as np
+
+from .batch import ExtractionResult, iter_extract_many
+from .data import Data, DataAxis, DataTag, DataType
+from .data_extraction import DataMetrics, JumpEpisode, _jump_crossings, data_extraction
+from .events import DataIndicesExtraction, all_jump_events
+
+# The number of bins the signals are decimated to, about the width in pixels of the axes of a figure
+PLOT_BINS = 1000
+# The size (in inches) and resolution of the figures
+FIGURE_SIZE = (10.0, 8.0)
+FIGURE_DPI = 100
+
+
+class PlotFormat(Enum):
+    PNG = ".png"
+    SVG = ".svg"
+    PDF = ".pdf"
+
+    @staticmethod
+    def from_path(path: Path) -> "PlotFormat":
+        """Returns the format of a figure from the suffix of its path."""
+        for plot_format in PlotFormat:
+            if Path(path).suffix == plot_format.value:
+                return plot_format
+        raise ValueError(f"Unsupported figure format: {path} (expected one of {[f.value for f in PlotFormat]})")
+
+
+def minmax_decimation_indices(values: np.ndarray, bins: int) -> np.ndarray:
+    """
+    Returns the frames to draw so a signal keeps its shape once drawn over about bins pixels: the frames are split
+    into bins consecutive bins and the smallest and largest values of each column are kept in each bin, along with the
+    first and last frames. The envelope of the signal, and thus its peaks, are preserved exactly, while the number of
+    points drawn is bounded regardless of the length of the recording.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The signal, of shape (n_frames,) or (n_frames, n_columns). The missing values (NaN) are only kept in the bins
+        holding no other value, so the gaps of the signal remain visible.
+    bins : int
+        The number of bins.
+
+    Returns
+    -------
+    np.ndarray
+        The sorted indices of the frames to draw, at most 2 * bins * n_columns + 2 of them.
+    """
+    if bins < 1:
+        raise ValueError(f"The number of bins must be positive, got {bins}")
+    values = np.asarray(values).reshape(values.shape[0], -1)
+    n_frames = values.shape[0]
+    if n_frames <= 2 * bins:
+        return np.arange(n_frames)
+
+    # The frames are padded with missing values so all the bins have the same size
+    size = -(-n_frames // bins)
+    padded = np.full((bins * size, values.shape[1]), np.nan)
+    padded[:n_frames] = values
+    padded = padded.reshape(bins, size, values.shape[1])
+    missing = np.isnan(padded)
+    offsets = np.arange(bins)[:, np.newaxis] * size
+    minima = np.where(missing, np.inf, padded).argmin(axis=1) + offsets
+    maxima = np.where(missing, -np.inf, padded).argmax(axis=1) + offsets
+
+    indices = np.concatenate([[0, n_frames - 1], minima.ravel(), maxima.ravel()])
+    return np.unique(indices[indices < n_frames])
+
+
+class HeadKinematicsPlot:
+    def __init__(
+        self,
+        title: str,
+        signals: dict[DataType, tuple[np.ndarray, np.ndarray]],
+        events: list[tuple[float, ...]],
+    ):
+        """
+        The decimated head kinematics of a recording and the time of its jump events, i.e. all that is needed to draw
+        its figure. It is small enough to be sent from a worker process whatever the length of the recording.
+
+        Parameters
+        ----------
+        title : str
+            The title of the figure.
+        signals : dict[DataType, tuple[np.ndarray, np.ndarray]]
+            The time (s) and the values of the three axes of the position, velocity and acceleration of the head, at
+            the frames kept by `minmax_decimation_indices`.
+        events : list[tuple[float, ...]]
+            The time (s) of the DataIndicesExtraction events of each jump.
+        """
+        self._title = title
+        self._signals = signals
+        self._events = events
+
+    @property
+    def title(self) -> str:
+        """Returns the title of the figure."""
+        return self._title
+
+    @property
+    def signals(self) -> dict[DataType, tuple[np.ndarray, np.ndarray]]:
+        """Returns the time and the values of the decimated signals."""
+        return self._signals
+
+    @property
+    def events(self) -> list[tuple[float, ...]]:
+        """Returns the time of the events of each jump."""
+        return self._events
+
+
+def head_kinematics_plot(
+    data: Data,
+    title: str | None = None,
+    bins: int = PLOT_BINS,
+    jump_indices: Iterable[dict[DataIndicesExtraction, int | None]] | None = None,
+) -> HeadKinematicsPlot:
+    """
+    Decimates the head kinematics of a recording and gets the time of the events of its jumps.
+
+    Parameters
+    ----------
+    data : Data
+        The recording.
+    title : str | None
+        The title of the figure. Defaults to "<subject> - <trial>", from the path of the recording.
+    bins : int
+        The number of bins the signals are decimated to (see `minmax_decimation_indices`).
+    jump_indices : Iterable[dict[DataIndicesExtraction, int | None]] | None
+        The indices of the events of each jump to draw, e.g. the ones found by the extraction of the metrics (the
+        events that were not found are not drawn). If None, the events of every jump are detected (see
+        `all_jump_events`).
+
+    Returns
+    -------
+    HeadKinematicsPlot
+        The data of the figure of the recording.
+    """
+    if title is None:
+        title = f"{data.data_path.parent.name} - {data.data_path.stem}"
+
+    time = data.time_array
+    signals = {}
+    for data_type in DataType:
+        values = data.get_array(DataTag.HEAD_POSITION, data_type=data_type, axis=DataAxis.ALL)
+        indices = minmax_decimation_indices(values, bins)
+        signals[data_type] = (time[indices], np.asarray(values[indices], dtype=np.float64))
+
+    if jump_indices is None:
+        jump_indices = all_jump_events(_jump_crossings(data))
+    events = [
+        tuple(float(time[jump[idx]]) for idx in DataIndicesExtraction if jump[idx] is not None) for jump in jump_indices
+    ]
+    return HeadKinematicsPlot(title, signals, events)
+
+
+def draw_head_kinematics(figure: Any, plot: HeadKinematicsPlot) -> None:
+    """
+    Draws the position, velocity and acceleration of the head in three subplots of a figure, with a dashed line at
+    each jump event.
+
+    Parameters
+    ----------
+    figure : matplotlib.figure.Figure
+        The figure to draw in, either a pyplot figure (to show it) or a standalone Figure (to save it headlessly).
+    plot : HeadKinematicsPlot
+        The data of the figure.
+    """
+    labels = {
+        DataType.VALUE: "Head position (m)",
+        DataType.VELOCITY: "Head Velocity (m)",
+        DataType.ACCELERATION: "Head Acceleration (m/s²)",
+    }
+    axes = figure.subplots(len(labels), 1, sharex=True)
+    figure.suptitle(plot.title)
+    for ax, (data_type, label) in zip(axes, labels.items()):
+        time, values = plot.signals[data_type]
+        ax.plot(time, values)
+        for events in plot.events:
+            for event_time in events:
+                ax.axvline(event_time, color="r", linestyle="--")
+        ax.set_ylabel(label)
+    axes[-1].set_xlabel("Time (s)")
+    figure.tight_layout()
+
+
+def _new_figure() -> Any:
+    # A standalone Figure is not registered in pyplot, so it is drawn by the Agg (or SVG, PDF) canvas whatever the
+    # interactive backend. matplotlib is only imported here, as it is slow to import.
+    from matplotlib.figure import Figure
+
+    return Figure(figsize=FIGURE_SIZE, dpi=FIGURE_DPI)
+
+
+def save_head_kinematics(plot: HeadKinematicsPlot, path: Path) -> Path:
+    """
+    Draws the figure of a recording and saves it, without a display, in the format given by the suffix of the path
+    (see `PlotFormat`).
+
+    Parameters
+    ----------
+    plot : HeadKinematicsPlot
+        The data of the figure.
+    path : Path
+        The file to write (its folder is created if needed).
+
+    Returns
+    -------
+    Path
+        The path to the written file.
+    """
+    path = Path(path)
+    PlotFormat.from_path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    figure = _new_figure()
+    draw_head_kinematics(figure, plot)
+    figure.savefig(path)
+    return path
+
+
+def _figure_path(data_path: Path, output_path: Path, plot_format: PlotFormat) -> Path:
+    """Returns the path of the figure of a recording: <output_path>/<subject>/<trial><suffix>."""
+    return Path(output_path) / data_path.parent.name / f"{data_path.stem}{plot_format.value}"
+
+
+def _extracted_jump_indices(metrics: Any) -> list[dict[DataIndicesExtraction, int | None]] | None:
+    """Returns the jump events found by an extraction function, None if it does not return them."""
+    if isinstance(metrics, dict) and DataMetrics.JUMP_INDICES in metrics:
+        return [metrics[DataMetrics.JUMP_INDICES]]
+    if isinstance(metrics, list) and all(isinstance(episode, JumpEpisode) for episode in metrics):
+        return [episode.indices for episode in metrics]
+    return None
+
+
+def _extract_and_plot(
+    data: Data,
+    extraction: Callable[[Data], Any] | None,
+    bins: int,
+    figure_folder: Path | None = None,
+    plot_format: PlotFormat = PlotFormat.PNG,
+) -> tuple[Any, HeadKinematicsPlot | Path]:
+    """
+    Extracts the metrics of a recording and gets the data of its figure from the same Data, so the recording is only
+    loaded and differentiated once and the events drawn are the ones the metrics were computed from. The figure is
+    saved to the folder if one is given (so it is drawn in the worker), otherwise its data is returned.
+    """
+    metrics = None if extraction is None else extraction(data)
+    plot = head_kinematics_plot(data, bins=bins, jump_indices=_extracted_jump_indices(metrics))
+    if figure_folder is None:
+        return metrics, plot
+    return metrics, save_head_kinematics(plot, _figure_path(data.data_path, figure_folder, plot_format))
+
+
+def iter_extract_and_render_many(
+    paths: Iterable[Path],
+    output_path: Path,
+    extraction: Callable[[Data], Any] | None = data_extraction,
+    plot_format: PlotFormat | None = None,
+    workers: int = 1,
+    chunksize: int = 1,
+    bins: int = PLOT_BINS,
+    **data_kwargs,
+) -> Iterator[tuple[ExtractionResult, Path | None]]:
+    """
+    Lazily extracts the metrics of several recordings and renders their head kinematics without a display, in a
+    single pass: each recording is loaded once by a worker, which computes its metrics and the data of its figure.
+    The signals are decimated (see `minmax_decimation_indices`), so the time taken and the size of the files do not
+    grow with the length of the recordings.
+
+    Parameters
+    ----------
+    paths : Iterable[Path]
+        The recordings to process.
+    output_path : Path
+        A .pdf file holding one page per recording, or the folder the figures are written to, as
+        <output_path>/<subject>/<trial><suffix>.
+    extraction : Callable[[Data], Any] | None
+        The function applied to each recording (see `iter_extract_many`). The events of the jumps it found are the
+        ones drawn when it is `data_extraction` (the first jump) or `jump_segmentation` (every jump), otherwise the
+        events of every jump are detected. If None, only the figures are rendered.
+    plot_format : PlotFormat | None
+        The format of the figures. Defaults to PDF if output_path ends with .pdf, and to PNG otherwise.
+    workers : int
+        The number of worker processes (see `iter_extract_many`).
+    chunksize : int
+        The number of recordings sent at once to each worker.
+    bins : int
+        The number of bins the signals are decimated to.
+    **data_kwargs
+        Additional keyword arguments forwarded to the `Data` constructor (e.g. backend).
+
+    Yields
+    ------
+    tuple[ExtractionResult, Path | None]
+        The outcome for each recording, in the order of paths, whose metrics are the output of the extraction, and
+        the path to its figure (the PDF file for all the recordings), None if it failed.
+    """
+    output_path = Path(output_path)
+    if plot_format is None:
+        plot_format = PlotFormat.PDF if output_path.suffix == PlotFormat.PDF.value else PlotFormat.PNG
+
+    if plot_format != PlotFormat.PDF:
+        # Each worker analyses, draws and writes its own figures
+        task = partial(
+            _extract_and_plot, extraction=extraction, bins=bins, figure_folder=output_path, plot_format=plot_format
+        )
+        for result in iter_extract_many(paths, workers=workers, chunksize=chunksize, extraction=task, **data_kwargs):
+            yield _split_result(result)
+        return
+
+    # The pages of a PDF file are written by a single process: the workers only send the decimated signals
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    if output_path.suffix != PlotFormat.PDF.value:
+        raise ValueError(f"The figures can only be gathered in a .pdf file, got {output_path}")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    task = partial(_extract_and_plot, extraction=extraction, bins=bins)
+    with PdfPages(output_path) as pdf:
+        for result in iter_extract_many(paths, workers=workers, chunksize=chunksize, extraction=task, **data_kwargs):
+            result, plot = _split_result(result)
+            if plot is None:
+                yield result, None
+                continue
+
+            figure = _new_figure()
+            draw_head_kinematics(figure, plot)
+            pdf.savefig(figure)
+            yield result, output_path
+
+
+def _split_result(result: ExtractionResult) -> tuple[ExtractionResult, Any]:
+    """Splits the result of `_extract_and_plot` into the result of the extraction and the figure (or its data)."""
+    if not result.succeeded:
+        return result, None
+    metrics, figure = result.metrics
+    return ExtractionResult(result.path, metrics=metrics, profile=result.profile), figure
+
+
+def render_head_kinematics_many(
+    paths: Iterable[Path],
+    output_path: Path,
+    plot_format: PlotFormat | None = None,
+    workers: int = 1,
+    chunksize: int = 1,
+    bins: int = PLOT_BINS,
+    **data_kwargs,
+) -> list[ExtractionResult]:
+    """
+    Renders the head kinematics and the events of every jump of several recordings without a display, optionally in
+    parallel (see `iter_extract_and_render_many`).
+
+    Parameters
+    ----------
+    paths : Iterable[Path]
+        The recordings to render.
+    output_path : Path
+        A .pdf file holding one page per recording, or the folder the figures are written to, as
+        <output_path>/<subject>/<trial><suffix>.
+    plot_format : PlotFormat | None
+        The format of the figures. Defaults to PDF if output_path ends with .pdf, and to PNG otherwise.
+    workers : int
+        The number of worker processes (see `iter_extract_many`).
+    chunksize : int
+        The number of recordings sent at once to each worker.
+    bins : int
+        The number of bins the signals are decimated to.
+    **data_kwargs
+        Additional keyword arguments forwarded to the `Data` constructor (e.g. backend).
+
+    Returns
+    -------
+    list[ExtractionResult]
+        The outcome for each recording, in the order of paths. Its metrics hold the path to the written figure (the
+        PDF file for all the recordings).
+    """
+    results = iter_extract_and_render_many(
+        paths,
+        output_path,
+        extraction=None,
+        plot_format=plot_format,
+        workers=workers,
+        chunksize=chunksize,
+        bins=bins,
+        **data_kwargs,
+    )
+    return [
+        result if figure is None else ExtractionResult(result.path, metrics=figure, profile=result.profile)
+        for result, figure in results
+    ]
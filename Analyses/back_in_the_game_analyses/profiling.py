@@ -0,0 +1,162 @@
+from contextlib import contextmanager
+from functools import wraps
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable, Iterator
+
+import pandas as pd
+
+# Setting this environment variable (to anything but "" or "0") enables the profiling of the whole process
+PROFILING_ENVIRONMENT_VARIABLE = "BACK_IN_THE_GAME_PROFILE"
+
+
+class Profiler:
+    def __init__(self):
+        """
+        Collects the wall time and the number of calls of each stage of the analyses, and the hit rate of the caches.
+        The time of a stage includes the time of the stages it calls.
+        """
+        self._stages: dict[str, list[float]] = {}
+        self._caches: dict[str, list[int]] = {}
+
+    def reset(self) -> None:
+        """Forgets everything collected so far."""
+        self._stages.clear()
+        self._caches.clear()
+
+    def record(self, stage: str, elapsed: float, calls: int = 1) -> None:
+        """Adds calls to the stage, which lasted elapsed seconds in total."""
+        stats = self._stages.setdefault(stage, [0, 0.0])
+        stats[0] += calls
+        stats[1] += elapsed
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """Adds a lookup to the cache."""
+        stats = self._caches.setdefault(cache, [0, 0])
+        stats[0 if hit else 1] += 1
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Context manager recording the time spent in its body as a call to the stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def merge(self, other: dict[str, Any]) -> None:
+        """Adds the statistics exported by the `to_dict` of another profiler (e.g. from a worker process)."""
+        for stage, stats in other["stages"].items():
+            self.record(stage, stats["total_time"], calls=stats["calls"])
+        for cache, stats in other["caches"].items():
+            cache_stats = self._caches.setdefault(cache, [0, 0])
+            cache_stats[0] += stats["hits"]
+            cache_stats[1] += stats["misses"]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the collected statistics as a JSON-serializable dictionary."""
+        return {
+            "stages": {
+                stage: {"calls": calls, "total_time": total_time} for stage, (calls, total_time) in self._stages.items()
+            },
+            "caches": {
+                cache: {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+                for cache, (hits, misses) in self._caches.items()
+            },
+        }
+
+    def save(self, path: Path) -> None:
+        """Writes the collected statistics to a JSON file."""
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def summary(self) -> pd.DataFrame:
+        """Returns a table of the stages sorted by total time, with their cache hit rate when they have a cache."""
+        rows = []
+        for stage, (calls, total_time) in self._stages.items():
+            hits, misses = self._caches.get(stage, (0, 0))
+            hit_rate = hits / (hits + misses) if hits + misses else float("nan")
+            rows.append([stage, calls, total_time, total_time / calls * 1000, hit_rate])
+        for cache, (hits, misses) in self._caches.items():
+            if cache not in self._stages:
+                rows.append([cache, hits + misses, float("nan"), float("nan"), hits / (hits + misses)])
+
+        columns = ["Stage", "Calls", "Total time (s)", "Mean time (ms)", "Cache hit rate"]
+        table = pd.DataFrame(rows, columns=columns)
+        return table.sort_values("Total time (s)", ascending=False, na_position="last", ignore_index=True)
+
+
+def _profiler_from_environment() -> Profiler | None:
+    return None if os.getenv(PROFILING_ENVIRONMENT_VARIABLE, "") in ("", "0") else Profiler()
+
+
+_active_profiler: Profiler | None = _profiler_from_environment()
+
+
+def active_profiler() -> Profiler | None:
+    """Returns the profiler collecting the statistics, None if the profiling is disabled."""
+    return _active_profiler
+
+
+@contextmanager
+def profile(profiler: Profiler | None = None) -> Iterator[Profiler]:
+    """
+    Context manager enabling the profiling within its body.
+
+    Parameters
+    ----------
+    profiler : Profiler | None
+        The profiler collecting the statistics. If None, a new one is created.
+
+    Yields
+    ------
+    Profiler
+        The profiler collecting the statistics.
+    """
+    global _active_profiler
+    previous = _active_profiler
+    _active_profiler = Profiler() if profiler is None else profiler
+    try:
+        yield _active_profiler
+    finally:
+        _active_profiler = previous
+
+
+def profiled(stage: str) -> Callable[[Callable], Callable]:
+    """Decorator recording each call of the decorated function as a call to the stage, when the profiling is enabled."""
+
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _active_profiler is None:
+                return function(*args, **kwargs)
+
+            profiler = _active_profiler
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.record(stage, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Records a lookup to the cache, when the profiling is enabled."""
+    if _active_profiler is not None:
+        _active_profiler.record_cache(cache, hit)
+
+
+@contextmanager
+def profiled_stage(stage: str) -> Iterator[None]:
+    """Context manager recording the time spent in its body as a call to the stage, when the profiling is enabled."""
+    if _active_profiler is None:
+        yield
+        return
+
+    with _active_profiler.stage(stage):
+        yield
@@ -0,0 +1,244 @@
+from enum import Enum
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+import numpy as np
+
+from .data import Data, DataTag, DataType
+from .events import DataIndicesExtraction
+
+
+class MetricWindow(Enum):
+    OVERALL = "overall"
+    PRE_JUMP = "pre_jump"
+    POST_JUMP = "post_jump"
+
+    @property
+    def events(self) -> tuple[DataIndicesExtraction, ...]:
+        """Returns the events bounding the window."""
+        if self == MetricWindow.OVERALL:
+            return ()
+        elif self == MetricWindow.PRE_JUMP:
+            return (DataIndicesExtraction.TOE_OFF,)
+        elif self == MetricWindow.POST_JUMP:
+            return (DataIndicesExtraction.RECEPTION,)
+        else:
+            raise ValueError(f"Unsupported metric window: {self}")
+
+    def frames(self, t: slice, jump_indices: dict[DataIndicesExtraction, int | None] | None) -> slice | None:
+        """
+        Returns the frames of the window within the frames t, or None if the events bounding the window were not
+        detected.
+        """
+        if self == MetricWindow.OVERALL:
+            return t
+        elif self == MetricWindow.PRE_JUMP:
+            toe_off_idx = jump_indices[DataIndicesExtraction.TOE_OFF]
+            return None if toe_off_idx is None else slice(t.start, toe_off_idx)
+        elif self == MetricWindow.POST_JUMP:
+            reception_idx = jump_indices[DataIndicesExtraction.RECEPTION]
+            return None if reception_idx is None else slice(reception_idx, t.stop)
+        else:
+            raise ValueError(f"Unsupported metric window: {self}")
+
+
+class MetricDefinition:
+    def __init__(
+        self,
+        key: Hashable,
+        function: Callable[[Data, slice, dict[DataIndicesExtraction, int | None] | None, int], Any],
+        description: str,
+        tags: Iterable[DataTag],
+        data_types: Iterable[DataType] = (DataType.VALUE,),
+        events: Iterable[DataIndicesExtraction] = (),
+        window: MetricWindow = MetricWindow.OVERALL,
+    ):
+        """
+        The declaration of a metric and of everything it needs to be computed.
+
+        Parameters
+        ----------
+        key : Hashable
+            The identifier of the metric, a DataMetrics for the core metrics or any other hashable (e.g. a str) for
+            site-specific metrics.
+        function : Callable[[Data, slice, dict[DataIndicesExtraction, int | None] | None, int], Any]
+            Computes the metric from the recording, the frames of its window, the jump events (None if the metric
+            declares no event) and the window of the derivatives it reads (see `Data.get`).
+        description : str
+            The description of the metric, as exported with the results.
+        tags : Iterable[DataTag]
+            The DataTag groups read by the function.
+        data_types : Iterable[DataType]
+            The data types (i.e. derivative orders) of the tags read by the function.
+        events : Iterable[DataIndicesExtraction]
+            The jump events read by the function (the events bounding the window are added automatically).
+        window : MetricWindow
+            The frames the metric is computed on. If the events bounding the window were not detected, the metric is
+            NaN and the function is not called.
+        """
+        self._key = key
+        self._function = function
+        self._description = description
+        self._tags = frozenset(tags)
+        self._data_types = frozenset(data_types)
+        self._events = tuple(dict.fromkeys((*events, *window.events)))
+        self._window = window
+
+    @property
+    def key(self) -> Hashable:
+        """Returns the identifier of the metric."""
+        return self._key
+
+    @property
+    def description(self) -> str:
+        """Returns the description of the metric."""
+        return self._description
+
+    @property
+    def tags(self) -> frozenset[DataTag]:
+        """Returns the DataTag groups needed by the metric, including the ones needed to detect its events."""
+        return self._tags | {DataTag.HEAD_POSITION} if self._events else self._tags
+
+    @property
+    def data_types(self) -> frozenset[DataType]:
+        """Returns the data types of the tags read by the metric."""
+        return self._data_types
+
+    @property
+    def events(self) -> tuple[DataIndicesExtraction, ...]:
+        """Returns the jump events needed by the metric."""
+        return self._events
+
+    @property
+    def window(self) -> MetricWindow:
+        """Returns the frames the metric is computed on."""
+        return self._window
+
+    def compute(
+        self,
+        data: Data,
+        t: slice,
+        jump_indices: dict[DataIndicesExtraction, int | None] | None,
+        derivative_window: int = 10,
+    ) -> Any:
+        """
+        Returns the value of the metric over the frames t of the recording. The numpy scalars are returned as Python
+        floats, so the metrics have the same type (and precision) whatever the dtype of the backend of the recording.
+        """
+        frames = self._window.frames(t, jump_indices)
+        if frames is None:
+            return np.nan
+        value = self._function(data, frames, jump_indices if self._events else None, derivative_window)
+        return float(value) if isinstance(value, np.floating) else value
+
+
+class MetricRegistry:
+    def __init__(self, definitions: Iterable[MetricDefinition] = ()):
+        """
+        A collection of metrics from which any subset can be computed. Only the jump events of the requested metrics
+        are detected, and as the derived signals are cached by `Data`, they are computed once and shared by all the
+        metrics reading them.
+
+        Parameters
+        ----------
+        definitions : Iterable[MetricDefinition]
+            The metrics of the registry, in the order they are computed when all of them are requested.
+        """
+        self._definitions: dict[Hashable, MetricDefinition] = {}
+        for definition in definitions:
+            self.add(definition)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._definitions
+
+    def __getitem__(self, key: Hashable) -> MetricDefinition:
+        if key not in self._definitions:
+            raise KeyError(f"The metric {key} is not registered")
+        return self._definitions[key]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._definitions)
+
+    def __len__(self) -> int:
+        return len(self._definitions)
+
+    def copy(self) -> "MetricRegistry":
+        """Returns a new registry holding the same metrics, e.g. to add site-specific metrics to the core ones."""
+        return MetricRegistry(self._definitions.values())
+
+    def add(self, definition: MetricDefinition) -> None:
+        """Adds a metric to the registry."""
+        if definition.key in self._definitions:
+            raise ValueError(f"The metric {definition.key} is already registered")
+        self._definitions[definition.key] = definition
+
+    def register(
+        self,
+        key: Hashable,
+        description: str,
+        tags: Iterable[DataTag],
+        data_types: Iterable[DataType] = (DataType.VALUE,),
+        events: Iterable[DataIndicesExtraction] = (),
+        window: MetricWindow = MetricWindow.OVERALL,
+    ) -> Callable:
+        """Decorator adding the decorated function to the registry (see `MetricDefinition` for the parameters)."""
+
+        def decorator(function: Callable) -> Callable:
+            self.add(MetricDefinition(key, function, description, tags, data_types, events, window))
+            return function
+
+        return decorator
+
+    def required_tags(self, keys: Iterable[Hashable] | None = None) -> set[DataTag]:
+        """Returns the DataTag groups that must be loaded to compute the metrics (all the metrics if keys is None)."""
+        tags = set()
+        for key in self if keys is None else keys:
+            tags |= self[key].tags
+        return tags
+
+    def required_events(self, keys: Iterable[Hashable] | None = None) -> set[DataIndicesExtraction]:
+        """Returns the jump events needed to compute the metrics (all the metrics if keys is None)."""
+        events = set()
+        for key in self if keys is None else keys:
+            events |= set(self[key].events)
+        return events
+
+    def compute(
+        self,
+        data: Data,
+        keys: Iterable[Hashable] | None = None,
+        t: slice = slice(None),
+        jump_indices: dict[DataIndicesExtraction, int | None] | None = None,
+        detect_events: Callable[[Data], dict[DataIndicesExtraction, int | None]] | None = None,
+        derivative_window: int = 10,
+    ) -> dict[Hashable, Any]:
+        """
+        Computes a subset of the metrics.
+
+        Parameters
+        ----------
+        data : Data
+            The recording.
+        keys : Iterable[Hashable] | None
+            The metrics to compute. If None, all the metrics of the registry are computed.
+        t : slice
+            The frames of the recording the metrics are computed on.
+        jump_indices : dict[DataIndicesExtraction, int | None] | None
+            The jump events of the frames t, if they are already known.
+        detect_events : Callable[[Data], dict[DataIndicesExtraction, int | None]] | None
+            Detects the jump events when they are needed and not provided.
+        derivative_window : int
+            The window of the derivatives read by the metrics (see `Data.get`).
+
+        Returns
+        -------
+        dict[Hashable, Any]
+            The value of each requested metric, in the order of keys.
+        """
+        definitions = [self[key] for key in (self if keys is None else keys)]
+        if jump_indices is None and any(definition.events for definition in definitions):
+            if detect_events is None:
+                raise ValueError("The requested metrics need the jump events, but no way to detect them was given")
+            jump_indices = detect_events(data)
+        return {
+            definition.key: definition.compute(data, t, jump_indices, derivative_window) for definition in definitions
+        }
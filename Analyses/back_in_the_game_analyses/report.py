@@ -0,0 +1,335 @@
+import csv
+from enum import Enum
+import io
+import math
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import pandas as pd
+
+# The suffix of the part files of a Parquet report while they are written
+_PARTIAL_SUFFIX = ".partial"
+
+
+class ReportFormat(Enum):
+    CSV = ".csv"
+    PARQUET = ".parquet"
+
+    @staticmethod
+    def from_path(path: Path) -> "ReportFormat":
+        """Returns the format of a report from the suffix of its path."""
+        for report_format in ReportFormat:
+            if Path(path).suffix == report_format.value:
+                return report_format
+        raise ValueError(f"Unsupported report format: {path} (expected one of {[f.value for f in ReportFormat]})")
+
+
+class ReportWriter:
+    def __init__(
+        self,
+        path: Path,
+        header: list[str],
+        key_columns: list[str] | None = None,
+        resume: bool = False,
+        row_group_size: int = 64,
+    ):
+        """
+        Writes the rows of a report as they are produced, so the memory used does not grow with the number of rows. The
+        format (CSV or Parquet) is given by the suffix of the path. The CSV rows are written and flushed as soon as
+        they are added. A Parquet report is a folder: the rows are buffered, then each group of rows is written to its
+        own part file, which is complete once renamed to part-<number>.parquet. A crash thus only loses the rows being
+        written (and the buffered ones), and the report is readable while it is written, e.g. by `pd.read_parquet`.
+
+        Parameters
+        ----------
+        path : Path
+            The path of the report.
+        header : list[str]
+            The names of the columns.
+        key_columns : list[str] | None
+            The columns identifying a row (e.g. the subject and the file), see `completed`. Defaults to all the columns.
+        resume : bool
+            If True and the report exists, the new rows are added after the existing ones (which must have the same
+            header). Otherwise, the report is overwritten.
+        row_group_size : int
+            The number of rows buffered before being written to a part file of a Parquet report (the CSV rows are not
+            buffered).
+        """
+        self._path = Path(path)
+        self._format = ReportFormat.from_path(self._path)
+        self._header = list(header)
+        self._key_columns = list(self._header if key_columns is None else key_columns)
+        self._key_indices = [self._header.index(column) for column in self._key_columns]
+        self._row_group_size = row_group_size
+        self._rows: list[list[Any]] = []
+        self._completed: set[tuple] = set()
+
+        if self._format == ReportFormat.CSV:
+            self._open_csv(resume and self._path.exists())
+        elif self._format == ReportFormat.PARQUET:
+            self._open_parquet(resume and self._path.exists())
+        else:
+            raise ValueError(f"Unsupported report format: {self._format}")
+
+    def _open_csv(self, resume: bool) -> None:
+        if resume:
+            _truncate_partial_line(self._path)
+            with open(self._path, newline="") as file:
+                reader = csv.reader(file)
+                self._check_header(next(reader, []))
+                for row in reader:
+                    self._completed.add(tuple(row[i] for i in self._key_indices))
+            self._file = open(self._path, "a", newline="")
+            self._csv_writer = csv.writer(self._file)
+        else:
+            self._file = open(self._path, "w", newline="")
+            self._csv_writer = csv.writer(self._file)
+            self._csv_writer.writerow(self._header)
+            self._file.flush()
+
+    def _open_parquet(self, resume: bool) -> None:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Writing a Parquet report requires pyarrow, install it or use a CSV report") from e
+
+        self._schema = None
+        self._n_parts = 0
+        if self._path.exists() and not self._path.is_dir():
+            if resume:
+                raise ValueError(f"{self._path} is not a Parquet report folder, it cannot be resumed")
+            self._path.unlink()
+        self._path.mkdir(parents=True, exist_ok=True)
+        # The part files being written when the previous run was interrupted are incomplete
+        for path in self._path.glob(f"*{_PARTIAL_SUFFIX}"):
+            path.unlink()
+
+        parts = _parquet_parts(self._path)
+        if not resume:
+            for path in parts:
+                path.unlink()
+            return
+
+        for path in parts:
+            part = pq.ParquetFile(path)
+            self._check_header(part.schema_arrow.names)
+            if part.metadata.num_rows == 0:
+                # The part of a report closed without rows only holds its header (see `close`)
+                path.unlink()
+                continue
+            if self._schema is None:
+                self._schema = part.schema_arrow
+            keys = part.read(columns=self._key_columns)
+            self._completed.update(
+                tuple(str(value) for value in key) for key in zip(*(column.to_pylist() for column in keys.columns))
+            )
+        self._n_parts = _part_number(parts[-1]) + 1 if parts else 0
+
+    def _check_header(self, header: list[str]) -> None:
+        if list(header) != self._header:
+            raise ValueError(f"The header of {self._path} does not match the one of the report, it cannot be resumed")
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def path(self) -> Path:
+        """Returns the path of the report."""
+        return self._path
+
+    @property
+    def header(self) -> list[str]:
+        """Returns the names of the columns."""
+        return self._header
+
+    def completed(self, *key: Any) -> bool:
+        """
+        Returns whether a row with these values of the key columns was already written in a resumed report. As the
+        rows added together by `write_rows` are written at once, all the rows of a key written in one call (e.g. all
+        the jumps of a trial) are in the report when it is completed.
+        """
+        return tuple(str(value) for value in key) in self._completed
+
+    def write(self, row: dict[str, Any] | list[Any]) -> None:
+        """Adds a row to the report, given as a list ordered as the header or as a dictionary keyed by column name."""
+        self.write_rows([row])
+
+    def write_rows(self, rows: Iterable[dict[str, Any] | list[Any]]) -> None:
+        """
+        Adds several rows to the report at once (e.g. all the rows of a trial), each given as for `write`. The CSV
+        rows are written with a single write, and the Parquet rows are never split across row groups, so an
+        interrupted run leaves either all of them or none of them in the report.
+        """
+        rows = [self._values(row) for row in rows]
+        if self._format == ReportFormat.CSV:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            self._file.write(buffer.getvalue())
+            self._file.flush()
+            return
+
+        self._rows.extend(rows)
+        if len(self._rows) >= self._row_group_size:
+            self.flush()
+
+    def _values(self, row: dict[str, Any] | list[Any]) -> list[Any]:
+        if isinstance(row, dict):
+            row = [row[column] for column in self._header]
+        if len(row) != len(self._header):
+            raise ValueError(f"The row has {len(row)} values, but the report has {len(self._header)} columns")
+        return list(row)
+
+    def flush(self) -> None:
+        """Writes the buffered rows to the report (only the rows of a Parquet report are buffered)."""
+        if self._format == ReportFormat.CSV:
+            self._file.flush()
+            return
+        if not self._rows:
+            return
+
+        self._write_part(pd.DataFrame(self._rows, columns=self._header))
+        self._rows.clear()
+
+    def _write_part(self, df: pd.DataFrame) -> None:
+        """Writes the rows to a new part file of a Parquet report, which is only renamed once completely written."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # All the parts share the schema of the first one, so they can be read as a single table
+        table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        if self._schema is None and len(df) > 0:
+            self._schema = table.schema
+        path = self._path / f"part-{self._n_parts:05d}.parquet"
+        partial_path = path.with_suffix(path.suffix + _PARTIAL_SUFFIX)
+        pq.write_table(table, partial_path)
+        partial_path.replace(path)
+        self._n_parts += 1
+
+    def close(self) -> None:
+        """Writes the buffered rows and closes the CSV file (the Parquet part files are closed once written)."""
+        self.flush()
+        if self._format == ReportFormat.CSV:
+            self._file.close()
+        elif not _parquet_parts(self._path):
+            # An empty part holds the header of a report without rows
+            self._write_part(pd.DataFrame(columns=self._header))
+
+
+def _parquet_parts(path: Path) -> list[Path]:
+    """Returns the complete part files of a Parquet report, in the order they were written."""
+    return sorted(path.glob("part-*.parquet"), key=_part_number)
+
+
+def _part_number(path: Path) -> int:
+    return int(path.stem.split("-")[1])
+
+
+def _truncate_partial_line(path: Path) -> None:
+    """Removes the last line of a file if it was not completely written (e.g. the writing process crashed)."""
+    with open(path, "rb+") as file:
+        end = file.seek(0, 2)
+        position = end
+        while position > 0:
+            start = max(position - 4096, 0)
+            file.seek(start)
+            chunk = file.read(position - start)
+            newline = chunk.rfind(b"\n")
+            if newline >= 0:
+                if start + newline + 1 != end:
+                    file.truncate(start + newline + 1)
+                return
+            position = start
+
+
+def iter_report_rows(path: Path, text_columns: Iterable[str] = ()) -> Iterator[list[Any]]:
+    """
+    Lazily reads the rows of a report written by a ReportWriter, the header first. The numbers of a CSV report are
+    converted back to int and float, except in the text_columns (e.g. the file names, "001" is not the number 1), and
+    the missing values (NaN) to None.
+    """
+    report_format = ReportFormat.from_path(path)
+    if report_format == ReportFormat.CSV:
+        with open(path, newline="") as file:
+            reader = csv.reader(file)
+            header = next(reader)
+            yield header
+            text_columns = set(text_columns)
+            text = [column in text_columns for column in header]
+            for row in reader:
+                yield [_parse_csv_value(value, is_text) for value, is_text in zip(row, text)]
+    elif report_format == ReportFormat.PARQUET:
+        import pyarrow.parquet as pq
+
+        for i, part_path in enumerate(_parquet_parts(Path(path))):
+            part = pq.ParquetFile(part_path)
+            if i == 0:
+                yield part.schema_arrow.names
+            for batch in part.iter_batches():
+                for row in zip(*(column.to_pylist() for column in batch.columns)):
+                    yield [None if isinstance(value, float) and math.isnan(value) else value for value in row]
+    else:
+        raise ValueError(f"Unsupported report format: {report_format}")
+
+
+def _parse_csv_value(value: str, is_text: bool = False) -> Any:
+    if is_text:
+        return value
+    if value == "":
+        return None
+    for parse in (int, float):
+        try:
+            parsed = parse(value)
+        except ValueError:
+            continue
+        return None if isinstance(parsed, float) and math.isnan(parsed) else parsed
+    return value
+
+
+def report_to_xlsx(
+    path: Path,
+    xlsx_path: Path,
+    descriptions: Iterable[tuple[str, str]] = (),
+    sheet_name: str = "Metrics",
+    text_columns: Iterable[str] = (),
+) -> Path:
+    """
+    Converts a report to an Excel file. The rows are streamed through a write-only workbook, so the memory used does
+    not grow with the number of rows.
+
+    Parameters
+    ----------
+    path : Path
+        The path of the report (see ReportWriter).
+    xlsx_path : Path
+        The path of the Excel file.
+    descriptions : Iterable[tuple[str, str]]
+        The (header, description) of the columns, written to a "Description" sheet if not empty.
+    sheet_name : str
+        The name of the sheet the rows are written to.
+    text_columns : Iterable[str]
+        The columns of a CSV report kept as text (see `iter_report_rows`).
+
+    Returns
+    -------
+    Path
+        The path of the Excel file.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    for row in iter_report_rows(path, text_columns):
+        sheet.append(row)
+
+    descriptions = list(descriptions)
+    if descriptions:
+        sheet = workbook.create_sheet("Description")
+        sheet.append(["Header", "Description"])
+        for description in descriptions:
+            sheet.append(list(description))
+
+    workbook.save(xlsx_path)
+    return Path(xlsx_path)
@@ -0,0 +1,197 @@
+import numpy as np
+
+from .data import Data, DataAxis, DataTag, DataType
+from .data_extraction import DataMetrics
+from .maths import confidence_scale
+
+
+def rolling_window_starts(time: np.ndarray, duration: float) -> np.ndarray:
+    """
+    Returns the first frame of the window of each frame, i.e. the frames whose time is within duration seconds
+    before (and including) the frame.
+
+    Parameters
+    ----------
+    time : np.ndarray
+        The time (s) of each frame, of shape (n_frames,), increasing.
+    duration : float
+        The duration (s) of the windows.
+
+    Returns
+    -------
+    np.ndarray
+        The index of the first frame of the window ending at each frame, of shape (n_frames,).
+    """
+    if duration <= 0:
+        raise ValueError(f"The duration of the windows must be positive, got {duration}")
+    return np.searchsorted(time, time - duration, side="left")
+
+
+def _window_sums(values: np.ndarray, starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Returns the sums of the rows values[starts[i]:stops[i]] along the first axis, from a single cumulative sum."""
+    cumulative = np.zeros((values.shape[0] + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=cumulative[1:])
+    return cumulative[stops] - cumulative[starts]
+
+
+def _full_windows(time: np.ndarray, duration: float) -> np.ndarray:
+    """Returns whether the window ending at each frame spans the whole duration (the first frames do not)."""
+    return time - time[0] >= duration
+
+
+def rolling_horizontal_dispersion(data: Data, tag: DataTag, duration: float, confidence: float = 0.95) -> np.ndarray:
+    """
+    Returns the horizontal dispersion (area of the confidence ellipse, see `EllipseParameters`) of the tag
+    over the window ending at each frame. The covariance of each window is obtained from running sums of the
+    positions, their squares and their cross-products, so all the windows are computed in O(n_frames).
+
+    Parameters
+    ----------
+    data : Data
+        The recording.
+    tag : DataTag
+        The position to compute the dispersion of.
+    duration : float
+        The duration (s) of the windows.
+    confidence : float
+        Confidence level for the ellipses (default is 0.95).
+
+    Returns
+    -------
+    np.ndarray
+        The dispersion of each window, of shape (n_frames,). It is NaN for the windows shorter than duration and
+        for the ones holding less than two positions.
+    """
+    time = data.time_array
+    starts = rolling_window_starts(time, duration)
+    stops = np.arange(1, time.shape[0] + 1)
+
+    position = data.get_array(tag, data_type=DataType.VALUE, axis=DataAxis.HORIZONTAL).astype(np.float64)
+    # As in `fit_confidence_ellipse_array`, the missing positions (e.g. the gaps left by `resample_uniform`) are
+    # ignored pairwise: the variance of each axis uses its valid frames, the covariance the frames valid on both axes
+    valid = ~np.isnan(position)
+    both = valid.all(axis=1)
+    # Centering the positions on their mean limits the cancellation when the covariances are computed from the sums
+    position = np.where(valid, position - np.nanmean(position, axis=0), 0.0)
+    x, y = position[:, 0], position[:, 1]
+    x_both, y_both = np.where(both, x, 0.0), np.where(both, y, 0.0)
+    sums = _window_sums(
+        np.column_stack([valid, both, x, y, x * x, y * y, x_both, y_both, x_both * y_both]), starts, stops
+    )
+    n_x, n_y, n_both, sum_x, sum_y, sum_xx, sum_yy, sum_x_both, sum_y_both, sum_xy = sums.T
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov_xx = (sum_xx - sum_x * sum_x / n_x) / (n_x - 1)
+        cov_yy = (sum_yy - sum_y * sum_y / n_y) / (n_y - 1)
+        cov_xy = (sum_xy - sum_x_both * sum_y_both / n_both) / (n_both - 1)
+    # The product of the semi-axes is k^2 times the square root of the product of the eigenvalues (the determinant)
+    determinant = np.clip(cov_xx * cov_yy - cov_xy * cov_xy, 0.0, None)
+    dispersion = confidence_scale(confidence) ** 2 * np.sqrt(determinant) * np.pi
+    dispersion[(n_x < 2) | (n_y < 2) | (n_both < 2) | ~_full_windows(time, duration)] = np.nan
+    return dispersion
+
+
+def rolling_acceleration_peak(data: Data, tag: DataTag, duration: float, axis: DataAxis = DataAxis.ALL) -> np.ndarray:
+    """
+    Returns the peak acceleration (as defined by `data_extraction`, the largest norm of an axis over the window) of
+    the tag over the window ending at each frame. The norms are obtained from running sums of the squared
+    accelerations, so all the windows are computed in O(n_frames).
+
+    Parameters
+    ----------
+    data : Data
+        The recording.
+    tag : DataTag
+        The position whose acceleration is used.
+    duration : float
+        The duration (s) of the windows.
+    axis : DataAxis
+        The axes of the acceleration.
+
+    Returns
+    -------
+    np.ndarray
+        The peak acceleration of each window, of shape (n_frames,). It is NaN for the windows shorter than duration.
+    """
+    time = data.time_array
+    starts = rolling_window_starts(time, duration)
+    stops = np.arange(1, time.shape[0] + 1)
+
+    # As in `compute_norm_array`, the missing accelerations (at both ends of the recording) are ignored
+    acceleration = data.get_array(tag, data_type=DataType.ACCELERATION, axis=axis).astype(np.float64)
+    squared = np.nan_to_num(acceleration**2, nan=0.0)
+    peaks = np.sqrt(_window_sums(squared, starts, stops)).max(axis=1)
+    peaks[~_full_windows(time, duration)] = np.nan
+    return peaks
+
+
+def rolling_traveled_distance(data: Data, tag: DataTag, duration: float) -> np.ndarray:
+    """
+    Returns the traveled distance (as defined by `data_extraction`) of the tag over the window ending at each frame.
+    The distances are obtained from running sums of the displacements between frames, so all the windows are
+    computed in O(n_frames).
+
+    Parameters
+    ----------
+    data : Data
+        The recording.
+    tag : DataTag
+        The position to compute the traveled distance of.
+    duration : float
+        The duration (s) of the windows.
+
+    Returns
+    -------
+    np.ndarray
+        The traveled distance of each window, of shape (n_frames,). It is NaN for the windows shorter than duration.
+    """
+    time = data.time_array
+    starts = rolling_window_starts(time, duration)
+    stops = np.arange(1, time.shape[0] + 1)
+
+    # The displacement i is the one from frame i to frame i + 1, so the window [start, stop) holds the displacements
+    # [start, stop - 1)
+    position = data.get_array(tag, data_type=DataType.VALUE, axis=DataAxis.ALL).astype(np.float64)
+    displacements = np.nan_to_num(np.diff(position, axis=0) ** 4, nan=0.0)
+    distances = np.sqrt(_window_sums(displacements, starts, np.maximum(stops - 1, starts))).sum(axis=1)
+    distances[~_full_windows(time, duration)] = np.nan
+    return distances
+
+
+def rolling_metrics(data: Data, duration: float) -> dict[DataMetrics, np.ndarray]:
+    """
+    Returns the metrics of the whole trial (the OVERALL metrics of `data_extraction`) over a window of duration
+    seconds sliding over the recording. The value at frame i is the metric of the frames within duration seconds
+    before frame i, which gives the evolution of the stability of the subject during the trial (e.g. along the time
+    of `data.time_array`).
+
+    Parameters
+    ----------
+    data : Data
+        The recording.
+    duration : float
+        The duration (s) of the windows.
+
+    Returns
+    -------
+    dict[DataMetrics, np.ndarray]
+        The value of each metric over the window ending at each frame, of shape (n_frames,). The frames before the
+        first full window are NaN.
+    """
+    return {
+        DataMetrics.OVERALL_HEAD_HORIZONTAL_DISPERSION: rolling_horizontal_dispersion(
+            data, DataTag.HEAD_POSITION, duration
+        ),
+        DataMetrics.OVERALL_LEFT_HAND_ACCELERATION_PEAK: rolling_acceleration_peak(
+            data, DataTag.LEFT_HAND_POSITION, duration
+        ),
+        DataMetrics.OVERALL_RIGHT_HAND_ACCELERATION_PEAK: rolling_acceleration_peak(
+            data, DataTag.RIGHT_HAND_POSITION, duration
+        ),
+        DataMetrics.OVERALL_LEFT_HAND_TRAVELED_DISTANCE: rolling_traveled_distance(
+            data, DataTag.LEFT_HAND_POSITION, duration
+        ),
+        DataMetrics.OVERALL_RIGHT_HAND_TRAVELED_DISTANCE: rolling_traveled_distance(
+            data, DataTag.RIGHT_HAND_POSITION, duration
+        ),
+    }
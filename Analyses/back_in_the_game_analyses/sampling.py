@@ -0,0 +1,225 @@
+from typing import Hashable
+
+import numpy as np
+
+# An interval between two frames longer than this number of periods is a gap, i.e. frames were dropped
+GAP_TOLERANCE = 1.5
+
+
+class SamplingReport:
+    def __init__(
+        self,
+        sampling_rate: float,
+        n_frames: int,
+        n_dropped_frames: int,
+        gaps: np.ndarray,
+        jitter: float,
+        n_missing_frames: int = 0,
+    ):
+        """
+        The frame-drop statistics of a recording, as measured on the frames recorded by the headset.
+
+        Parameters
+        ----------
+        sampling_rate : float
+            The nominal sampling rate (Hz) of the recording.
+        n_frames : int
+            The number of recorded frames.
+        n_dropped_frames : int
+            The number of frames missing from the gaps, estimated from their durations.
+        gaps : np.ndarray
+            The start time (s, since the start of the recording) and the duration (s) of each gap, of shape
+            (n_gaps, 2).
+        jitter : float
+            The standard deviation (s) of the intervals between the frames, the gaps excluded.
+        n_missing_frames : int
+            The number of frames of the uniform timebase left missing (NaN) because they fall in a gap too long to be
+            interpolated (see `resample_uniform`).
+        """
+        self._sampling_rate = sampling_rate
+        self._n_frames = n_frames
+        self._n_dropped_frames = n_dropped_frames
+        self._gaps = gaps
+        self._jitter = jitter
+        self._n_missing_frames = n_missing_frames
+
+    @property
+    def sampling_rate(self) -> float:
+        """Returns the nominal sampling rate (Hz)."""
+        return self._sampling_rate
+
+    @property
+    def period(self) -> float:
+        """Returns the nominal period (s) between two frames."""
+        return 1 / self._sampling_rate
+
+    @property
+    def n_frames(self) -> int:
+        """Returns the number of recorded frames."""
+        return self._n_frames
+
+    @property
+    def n_dropped_frames(self) -> int:
+        """Returns the estimated number of frames dropped by the headset."""
+        return self._n_dropped_frames
+
+    @property
+    def drop_rate(self) -> float:
+        """Returns the proportion of the expected frames that were dropped."""
+        expected = self._n_frames + self._n_dropped_frames
+        return self._n_dropped_frames / expected if expected else 0.0
+
+    @property
+    def gaps(self) -> np.ndarray:
+        """Returns the start time and the duration (s) of each gap, of shape (n_gaps, 2)."""
+        return self._gaps
+
+    @property
+    def n_gaps(self) -> int:
+        """Returns the number of gaps."""
+        return self._gaps.shape[0]
+
+    @property
+    def longest_gap(self) -> float:
+        """Returns the duration (s) of the longest gap, 0 if there is none."""
+        return float(self._gaps[:, 1].max()) if self.n_gaps else 0.0
+
+    @property
+    def jitter(self) -> float:
+        """Returns the standard deviation (s) of the intervals between the frames, the gaps excluded."""
+        return self._jitter
+
+    @property
+    def n_missing_frames(self) -> int:
+        """Returns the number of resampled frames left missing because they fall in a long gap."""
+        return self._n_missing_frames
+
+    def to_dict(self) -> dict[str, float | int]:
+        """Returns the scalar statistics, e.g. to add them to a row of a report."""
+        return {
+            "sampling_rate": self._sampling_rate,
+            "n_frames": self._n_frames,
+            "n_dropped_frames": self._n_dropped_frames,
+            "drop_rate": self.drop_rate,
+            "n_gaps": self.n_gaps,
+            "longest_gap": self.longest_gap,
+            "jitter": self._jitter,
+            "n_missing_frames": self._n_missing_frames,
+        }
+
+
+def estimate_sampling_rate(time: np.ndarray) -> float:
+    """
+    Returns the nominal sampling rate (Hz) of a recording. The gaps are first found from the median interval between
+    the frames, then the rate is given by the mean of the other intervals, as the jitter of the frames averages out.
+
+    Parameters
+    ----------
+    time : np.ndarray
+        The time (s) of each frame, of shape (n_frames,), increasing.
+
+    Returns
+    -------
+    float
+        The sampling rate.
+    """
+    intervals = np.diff(time)
+    intervals = intervals[intervals > 0]
+    if intervals.size == 0:
+        raise ValueError("The sampling rate cannot be estimated from less than two distinct frames")
+    regular = intervals[intervals <= GAP_TOLERANCE * np.median(intervals)]
+    return float(1 / regular.mean())
+
+
+def sampling_report(time: np.ndarray, sampling_rate: float | None = None) -> SamplingReport:
+    """
+    Detects the gaps of a recording and measures its frame drops.
+
+    Parameters
+    ----------
+    time : np.ndarray
+        The time (s) of each frame, of shape (n_frames,), increasing.
+    sampling_rate : float | None
+        The nominal sampling rate (Hz). Estimated from the frames if None (see `estimate_sampling_rate`).
+
+    Returns
+    -------
+    SamplingReport
+        The frame-drop statistics of the recording.
+    """
+    time = np.asarray(time, dtype=np.float64)
+    if sampling_rate is None:
+        sampling_rate = estimate_sampling_rate(time)
+    period = 1 / sampling_rate
+
+    intervals = np.diff(time)
+    is_gap = intervals > GAP_TOLERANCE * period
+    gaps = np.column_stack([time[:-1][is_gap] - time[0], intervals[is_gap]]) if time.size else np.empty((0, 2))
+    n_dropped_frames = int(np.maximum(np.rint(intervals[is_gap] / period) - 1, 0).sum())
+    regular = intervals[~is_gap]
+    jitter = float(regular.std()) if regular.size else 0.0
+    return SamplingReport(sampling_rate, time.shape[0], n_dropped_frames, gaps, jitter)
+
+
+def resample_uniform(
+    time: np.ndarray,
+    arrays: dict[Hashable, np.ndarray],
+    period: float,
+    max_gap: float | None = None,
+) -> tuple[np.ndarray, dict[Hashable, np.ndarray], int]:
+    """
+    Linearly interpolates signals sampled at the (irregular) time of the recorded frames onto a uniform timebase
+    starting at the first frame. The interval and interpolation weight of each new frame are computed once and
+    applied to all the signals.
+
+    Parameters
+    ----------
+    time : np.ndarray
+        The time (s) of the recorded frames, of shape (n_frames,), increasing.
+    arrays : dict[Hashable, np.ndarray]
+        The signals to resample, each of shape (n_frames,) or (n_frames, n_columns). They are resampled in their
+        dtype and memory layout.
+    period : float
+        The period (s) of the uniform timebase.
+    max_gap : float | None
+        The new frames falling in an interval longer than max_gap seconds are set to NaN instead of being
+        interpolated. If None, all the gaps are interpolated.
+
+    Returns
+    -------
+    tuple[np.ndarray, dict[Hashable, np.ndarray], int]
+        The uniform timebase, the resampled signals (with the same keys as arrays) and the number of new frames set
+        to NaN.
+    """
+    time = np.asarray(time, dtype=np.float64)
+    if time.shape[0] < 2:
+        return time.copy(), {key: np.array(values) for key, values in arrays.items()}, 0
+    intervals = np.diff(time)
+    if (intervals < 0).any():
+        raise ValueError("The frames must be sorted in time to be resampled")
+
+    # The tolerance keeps the last frame when the duration is a multiple of the period up to the rounding errors
+    n_new_frames = int(np.floor((time[-1] - time[0]) / period + 1e-6)) + 1
+    new_time = time[0] + np.arange(n_new_frames) * period
+
+    lower = np.clip(np.searchsorted(time, new_time, side="right") - 1, 0, time.shape[0] - 2)
+    interval = intervals[lower]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weight = np.where(interval > 0, (new_time - time[lower]) / interval, 0.0)
+    weight = np.clip(weight, 0.0, 1.0)[:, np.newaxis]
+    missing = np.zeros(n_new_frames, dtype=bool)
+    if max_gap is not None:
+        # The new frames that coincide with a recorded frame are kept
+        missing = (interval > max_gap) & (weight[:, 0] > 0) & (weight[:, 0] < 1)
+
+    resampled = {}
+    for key, values in arrays.items():
+        values = np.asarray(values)
+        columns = values.reshape(values.shape[0], -1)
+        dtype = values.dtype if np.issubdtype(values.dtype, np.floating) else np.float64
+        new_values = columns[lower].astype(dtype)
+        new_values += (columns[lower + 1] - new_values) * weight.astype(dtype)
+        new_values[missing] = np.nan
+        new_values = new_values.astype(dtype, copy=False).reshape((n_new_frames,) + values.shape[1:])
+        resampled[key] = np.asfortranarray(new_values) if values.flags.f_contiguous and values.ndim > 1 else new_values
+    return new_time, resampled, int(missing.sum())
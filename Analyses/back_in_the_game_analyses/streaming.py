@@ -0,0 +1,592 @@
+from pathlib import Path
+import socket
+import struct
+import time
+from typing import Callable, Iterable, Iterator, NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .data import DataAxis, DataTag, DataType
+from .data_extraction import DataMetrics
+from .events import (
+    DataIndicesExtraction,
+    GRAVITY,
+    MINIMUM_SQUAT_START_INDEX,
+    VELOCITY_SAFETY_THRESHOLD,
+    VELOCITY_THRESHOLD,
+)
+from .maths import compute_norm_array
+
+# Values of the RealtimeNetworking protocol of the Unity applications (see Assets/RealtimeNetworking)
+DEFAULT_PORT = 8181
+_PACKET_ID_CUSTOM = 2
+_PACKET_TYPE_CSV_WRITER_DATA_ENTRY = 2
+
+# The objects streamed by the patient application, in the order they are written in the packets and in the CSV files
+DEFAULT_STREAMED_OBJECTS = ("Head", "LeftHand", "RightHand")
+
+
+class StreamingData:
+    def __init__(
+        self,
+        tags: Iterable[DataTag] = (DataTag.HEAD_POSITION, DataTag.LEFT_HAND_POSITION, DataTag.RIGHT_HAND_POSITION),
+        capacity: int = 4096,
+        window: int = 10,
+    ):
+        """
+        A ring buffer holding the most recent frames of a recording that is still being acquired. The derivatives
+        are updated incrementally as the frames are appended, using the same central difference as `Data`. The
+        velocity of a frame is therefore available `window` frames after it was appended, and its acceleration
+        `2 * window` frames after.
+
+        Parameters
+        ----------
+        tags : Iterable[DataTag]
+            The DataTag groups to keep.
+        capacity : int
+            The number of frames kept in memory. Older frames are overwritten.
+        window : int
+            The number of points to use for the central difference.
+        """
+        self._tags = [tag for tag in tags if tag != DataTag.FRAME]
+        if capacity <= 3 * window:
+            raise ValueError("The capacity must be larger than three times the window")
+        self._capacity = capacity
+        self._window = window
+
+        self._n_frames = 0
+        self._first_frame: float | None = None
+        self._time = np.full(capacity, np.nan)
+        self._values = {tag: np.full((capacity, 3), np.nan) for tag in self._tags}
+        self._velocities = {tag: np.full((capacity, 3), np.nan) for tag in self._tags}
+        self._accelerations = {tag: np.full((capacity, 3), np.nan) for tag in self._tags}
+
+    @property
+    def tags(self) -> list[DataTag]:
+        """Returns the DataTag groups kept in the buffer."""
+        return self._tags
+
+    @property
+    def window(self) -> int:
+        """Returns the number of points used for the central difference."""
+        return self._window
+
+    @property
+    def n_frames(self) -> int:
+        """Returns the number of frames appended since the start of the recording."""
+        return self._n_frames
+
+    @property
+    def oldest_frame(self) -> int:
+        """Returns the index of the oldest frame still in the buffer."""
+        return max(0, self._n_frames - self._capacity)
+
+    def available(self, data_type: DataType = DataType.VALUE) -> int:
+        """Returns the number of leading frames for which the data type is final (i.e. will not change anymore)."""
+        return max(0, self._n_frames - data_type.derivative_order * self._window)
+
+    def append(self, frame: float, values: dict[DataTag, Sequence[float]]) -> None:
+        """
+        Appends a frame to the buffer and updates the derivatives that became computable.
+
+        Parameters
+        ----------
+        frame : float
+            The time stamp of the frame, as in the "Frame" column of the CSV files.
+        values : dict[DataTag, Sequence[float]]
+            The (x, y, z) values of each DataTag group of the buffer.
+        """
+        if self._first_frame is None:
+            self._first_frame = frame
+
+        i = self._n_frames
+        slot = i % self._capacity
+        self._time[slot] = frame - self._first_frame
+        for tag in self._tags:
+            self._values[tag][slot] = values[tag]
+            self._velocities[tag][slot] = np.nan
+            self._accelerations[tag][slot] = np.nan
+        self._n_frames += 1
+
+        w = self._window
+        capacity = self._capacity
+
+        # The new frame completes the velocity of the frame i - w...
+        j = i - w
+        if j - w >= 0:
+            denominator = self._time[i % capacity] - self._time[(i - 2) % capacity]
+            for tag in self._tags:
+                values = self._values[tag]
+                self._velocities[tag][j % capacity] = (values[i % capacity] - values[(j - w) % capacity]) / denominator
+
+        # ... which itself completes the acceleration of the frame i - 2 * w
+        k = i - 2 * w
+        if k - w >= 0:
+            denominator = self._time[j % capacity] - self._time[(j - 2) % capacity]
+            for tag in self._tags:
+                velocities = self._velocities[tag]
+                self._accelerations[tag][k % capacity] = (
+                    velocities[j % capacity] - velocities[(k - w) % capacity]
+                ) / denominator
+
+    def _slots(self, t: slice, data_type: DataType) -> np.ndarray:
+        start, stop, step = t.indices(self.available(data_type))
+        if start < stop and start < self.oldest_frame:
+            raise IndexError(f"The frame {start} is no longer in the buffer")
+        return np.arange(start, stop, step) % self._capacity
+
+    def get_time(self, t: slice = slice(None)) -> np.ndarray:
+        """Returns the time in seconds since the start of the recording of the requested frames."""
+        return self._time[self._slots(t, DataType.VALUE)]
+
+    def get_array(
+        self,
+        tag: DataTag,
+        t: slice = slice(None),
+        data_type: DataType = DataType.VALUE,
+        axis: DataAxis = DataAxis.ALL,
+    ) -> np.ndarray:
+        """
+        Returns the specified data type as a NumPy array of shape (n_frames, n_axes). The indices of t are counted
+        from the start of the recording and are limited to the frames for which the data type is available.
+        """
+        if data_type == DataType.VALUE:
+            buffer = self._values[tag]
+        elif data_type == DataType.VELOCITY:
+            buffer = self._velocities[tag]
+        elif data_type == DataType.ACCELERATION:
+            buffer = self._accelerations[tag]
+        else:
+            raise ValueError(f"Unsupported data type: {data_type}")
+        return buffer[self._slots(t, data_type)][:, axis.value]
+
+
+class StreamingEvent(NamedTuple):
+    event: DataIndicesExtraction
+    index: int
+    time: float
+    latency: float
+    jump: int
+
+
+# For each event: the event from which the search starts, the signal that is scanned and the condition to meet.
+# This is the same sequence as in events.jump_events.
+_EVENTS_SEARCH = {
+    DataIndicesExtraction.SQUAT_DEEPEST: (DataIndicesExtraction.SQUAT_START, DataType.VELOCITY, lambda v: v >= 0),
+    DataIndicesExtraction.SQUAT_END: (DataIndicesExtraction.SQUAT_DEEPEST, DataType.VELOCITY, lambda v: v < 0),
+    DataIndicesExtraction.TOE_OFF: (
+        DataIndicesExtraction.SQUAT_DEEPEST,
+        DataType.ACCELERATION,
+        lambda a: a <= GRAVITY,
+    ),
+    DataIndicesExtraction.HIGHEST_POINT: (DataIndicesExtraction.TOE_OFF, DataType.VELOCITY, lambda v: v <= 0),
+    DataIndicesExtraction.RECEPTION: (
+        DataIndicesExtraction.HIGHEST_POINT,
+        DataType.ACCELERATION,
+        lambda a: a >= GRAVITY,
+    ),
+}
+
+
+class StreamingJumpDetector:
+    def __init__(self, data: StreamingData, on_event: Callable[[StreamingEvent], None] | None = None):
+        """
+        Online version of `events.jump_episodes`. Each call to `update` only scans the samples that became
+        available since the previous call, so an event is reported at most `window` frames (velocity events) or
+        `2 * window` frames (acceleration events) after it happened. Once a jump has landed, the search of the next
+        squat starts as in the offline detection, so one set of events is reported per jump. Once the recording is
+        over, `finalize` returns the same indices as the offline extraction of the same recording.
+
+        If `update` is not called for more than `capacity - 2 * window` frames, the frames that left the buffer before
+        being scanned are skipped, along with the jump in progress (see `lagged`).
+
+        Parameters
+        ----------
+        data : StreamingData
+            The buffer the frames are appended to. It must hold the HEAD_POSITION.
+        on_event : Callable[[StreamingEvent], None] | None
+            Called each time an event is detected.
+        """
+        if DataTag.HEAD_POSITION not in data.tags:
+            raise ValueError("The jump events are detected on the HEAD_POSITION, which is not in the buffer")
+        self._data = data
+        self._on_event = on_event
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets the detected jumps, the next squat starts a new search."""
+        self._jumps: list[dict[DataIndicesExtraction, int | None]] = []
+        self._jumps_metrics: list[dict[DataMetrics, float]] = []
+        self._events: list[StreamingEvent] = []
+        self._is_invalid = False
+        self._lagged = False
+        self._arm(squat_cursor=0)
+
+    def _arm(self, squat_cursor: int = 0, rearm_cursor: int | None = None) -> None:
+        """
+        Clears the events of the current jump. The next squat is searched from squat_cursor, or, if rearm_cursor is
+        given, once the velocity becomes non-negative again from rearm_cursor (see `events.jump_episodes`).
+        """
+        self._indices: dict[DataIndicesExtraction, int | None] = {idx: None for idx in DataIndicesExtraction}
+        self._cursors: dict[DataIndicesExtraction, int] = {}
+        self._squat_cursor = squat_cursor
+        self._rearm_cursor = rearm_cursor
+        self._last_above_threshold: int | None = None
+        self._times: dict[DataIndicesExtraction, float] = {}
+        self._positions: dict[DataIndicesExtraction, np.ndarray] = {}
+
+    @property
+    def jumps(self) -> list[dict[DataIndicesExtraction, int | None]]:
+        """Returns the indices of the events of each jump that landed, in chronological order."""
+        return [dict(indices) for indices in self._jumps]
+
+    @property
+    def jumps_metrics(self) -> list[dict[DataMetrics, float]]:
+        """Returns the jump metrics of each jump that landed, in chronological order."""
+        return [dict(metrics) for metrics in self._jumps_metrics]
+
+    @property
+    def indices(self) -> dict[DataIndicesExtraction, int | None]:
+        """
+        Returns the indices of the events of the current jump, or of the last jump that landed if no squat was
+        detected since.
+        """
+        if self._indices[DataIndicesExtraction.SQUAT_START] is None and self._jumps:
+            return dict(self._jumps[-1])
+        return dict(self._indices)
+
+    @property
+    def events(self) -> list[StreamingEvent]:
+        """Returns the events detected so far, of all the jumps."""
+        return list(self._events)
+
+    @property
+    def is_invalid(self) -> bool:
+        """Returns whether the last squat was rejected (too close to the start of the recording)."""
+        return self._is_invalid
+
+    @property
+    def lagged(self) -> bool:
+        """Returns whether frames left the buffer before they were scanned, so jumps may have been missed."""
+        return self._lagged
+
+    @property
+    def metrics(self) -> dict[DataMetrics, float]:
+        """
+        Returns the jump metrics of the current jump that can be computed from the events detected so far (NaN
+        otherwise), or those of the last jump that landed if no squat was detected since.
+        """
+        if self._indices[DataIndicesExtraction.SQUAT_START] is None and self._jumps_metrics:
+            return dict(self._jumps_metrics[-1])
+        return self._metrics()
+
+    def _metrics(self) -> dict[DataMetrics, float]:
+        positions, times = self._positions, self._times
+
+        def distance(first: DataIndicesExtraction, second: DataIndicesExtraction, axis: DataAxis) -> float:
+            if first not in positions or second not in positions:
+                return np.nan
+            return compute_norm_array(positions[second][axis.value] - positions[first][axis.value])
+
+        toe_off, reception = DataIndicesExtraction.TOE_OFF, DataIndicesExtraction.RECEPTION
+        return {
+            DataMetrics.SQUAT_HEIGHT: distance(
+                DataIndicesExtraction.SQUAT_DEEPEST, DataIndicesExtraction.SQUAT_START, DataAxis.VERTICAL
+            ),
+            DataMetrics.JUMP_HEIGHT: distance(toe_off, DataIndicesExtraction.HIGHEST_POINT, DataAxis.VERTICAL),
+            DataMetrics.JUMP_DISTANCE: distance(toe_off, reception, DataAxis.HORIZONTAL),
+            DataMetrics.JUMP_FLIGHT_TIME: (
+                times[reception] - times[toe_off] if toe_off in times and reception in times else np.nan
+            ),
+        }
+
+    def _set_event(self, event: DataIndicesExtraction, index: int) -> StreamingEvent:
+        self._indices[event] = index
+
+        # Keep what the metrics need, as the frame may leave the buffer before the end of the jump
+        event_time = self._data.get_time(slice(index, index + 1))[0]
+        self._times[event] = event_time
+        self._positions[event] = self._data.get_array(DataTag.HEAD_POSITION, t=slice(index, index + 1))[0]
+
+        now = self._data.get_time(slice(self._data.n_frames - 1, self._data.n_frames))[0]
+        streaming_event = StreamingEvent(
+            event=event, index=index, time=event_time, latency=now - event_time, jump=len(self._jumps)
+        )
+        self._events.append(streaming_event)
+        if self._on_event is not None:
+            self._on_event(streaming_event)
+        return streaming_event
+
+    def _land(self) -> None:
+        """Stores the current jump and searches the next squat once the landing is over."""
+        self._jumps.append(dict(self._indices))
+        self._jumps_metrics.append(self._metrics())
+        # The head keeps going down while the landing is absorbed, which must not be mistaken for the next squat
+        landing = max(self._indices[DataIndicesExtraction.RECEPTION], self._indices[DataIndicesExtraction.SQUAT_END])
+        self._arm(rearm_cursor=landing + 1)
+
+    def _scan(self, data_type: DataType, start: int) -> tuple[np.ndarray, int]:
+        """Returns the vertical head signal from start to the last available frame, and the index of the latter."""
+        stop = self._data.available(data_type)
+        signal = self._data.get_array(DataTag.HEAD_POSITION, slice(start, stop), data_type, DataAxis.VERTICAL)
+        return signal[:, 0], max(start, stop)
+
+    def _oldest_needed_frame(self) -> int:
+        """Returns the oldest frame the search of the current jump still has to read."""
+        if self._indices[DataIndicesExtraction.SQUAT_START] is None:
+            if self._rearm_cursor is not None:
+                return self._rearm_cursor
+            if self._last_above_threshold is not None:
+                return min(self._squat_cursor, self._last_above_threshold)
+            return self._squat_cursor
+        return min(
+            self._cursors.get(event, self._indices[previous])
+            for event, (previous, _, _) in _EVENTS_SEARCH.items()
+            if self._indices[event] is None and self._indices[previous] is not None
+        )
+
+    def _search_squat(self) -> StreamingEvent | None:
+        """Scans the velocity for the next squat, returns its SQUAT_START event once it is detected."""
+        if self._rearm_cursor is not None:
+            cursor = self._rearm_cursor
+            velocity, self._rearm_cursor = self._scan(DataType.VELOCITY, cursor)
+            rising = np.flatnonzero(velocity >= 0)
+            if rising.size == 0:
+                return None
+            self._squat_cursor, self._rearm_cursor = cursor + int(rising[0]), None
+
+        cursor = self._squat_cursor
+        velocity, self._squat_cursor = self._scan(DataType.VELOCITY, cursor)
+        below = np.flatnonzero(velocity < VELOCITY_SAFETY_THRESHOLD)
+        scanned = velocity if below.size == 0 else velocity[: below[0] + 1]
+
+        # Walking backward from the safety threshold is the same as remembering the last frame above the threshold
+        above = np.flatnonzero(scanned >= VELOCITY_THRESHOLD)
+        if above.size > 0:
+            self._last_above_threshold = cursor + int(above[-1])
+        if below.size == 0:
+            return None
+
+        safety_index = cursor + int(below[0])
+        start = safety_index if self._last_above_threshold is None else self._last_above_threshold
+        self._is_invalid = start < MINIMUM_SQUAT_START_INDEX
+        if self._is_invalid:
+            # The squat started too early to be trusted, resume the search once it is over
+            self._arm(rearm_cursor=safety_index)
+            return None
+        return self._set_event(DataIndicesExtraction.SQUAT_START, start)
+
+    def update(self) -> list[StreamingEvent]:
+        """Scans the newly available samples and returns the events detected, of any number of jumps."""
+        new_events = []
+        oldest_frame = self._data.oldest_frame
+        if self._oldest_needed_frame() < oldest_frame:
+            # The frames the search still had to read left the buffer: the jump in progress is abandoned (the events
+            # it already reported are not completed) and the search resumes from the oldest frame of the buffer
+            self._lagged = True
+            if self._rearm_cursor is not None or self._indices[DataIndicesExtraction.SQUAT_START] is not None:
+                self._arm(rearm_cursor=oldest_frame)
+            else:
+                self._arm(squat_cursor=oldest_frame)
+
+        while True:
+            if self._indices[DataIndicesExtraction.SQUAT_START] is None:
+                event = self._search_squat()
+                if event is None:
+                    if self._rearm_cursor is None or self._rearm_cursor >= self._data.available(DataType.VELOCITY):
+                        return new_events
+                    # An invalid squat was rejected, its end may already be available
+                    continue
+                new_events.append(event)
+
+            for event, (previous, data_type, condition) in _EVENTS_SEARCH.items():
+                if self._indices[event] is not None or self._indices[previous] is None:
+                    continue
+
+                cursor = self._cursors.get(event, self._indices[previous])
+                signal, self._cursors[event] = self._scan(data_type, cursor)
+                found = np.flatnonzero(condition(signal))
+                if found.size > 0:
+                    new_events.append(self._set_event(event, cursor + int(found[0])))
+
+            landing = (DataIndicesExtraction.RECEPTION, DataIndicesExtraction.SQUAT_END)
+            if any(self._indices[event] is None for event in landing):
+                return new_events
+            self._land()
+
+    def finalize(self) -> list[dict[DataIndicesExtraction, int | None]]:
+        """
+        Closes the search once the recording is over. The events of the last jump that were never reached are
+        resolved as the offline extraction does (i.e. they fall back to the event their search started from).
+
+        Returns
+        -------
+        list[dict[DataIndicesExtraction, int | None]]
+            The indices of the events of each jump, as `events.all_jump_events`.
+        """
+        self.update()
+        if self._indices[DataIndicesExtraction.SQUAT_START] is not None:
+            for event, (previous, _, _) in _EVENTS_SEARCH.items():
+                if self._indices[event] is None:
+                    self._indices[event] = self._indices[previous]
+                    self._times[event] = self._times[previous]
+                    self._positions[event] = self._positions[previous]
+            self._jumps.append(dict(self._indices))
+            self._jumps_metrics.append(self._metrics())
+            self._arm(rearm_cursor=self._data.n_frames)
+        return self.jumps
+
+
+def _object_tags(name: str) -> tuple[DataTag, DataTag]:
+    """Returns the position and rotation DataTags of a streamed object."""
+    position = next(tag for tag in DataTag if tag.value[0] == f"{name}_Pos.X")
+    rotation = next(tag for tag in DataTag if tag.value[0] == f"{name}_Rot.X")
+    return position, rotation
+
+
+def encode_data_entry(frame: float, values: dict[DataTag, Sequence[float]], objects: Sequence[str]) -> bytes:
+    """
+    Encodes a frame as the CsvWriterDataEntry packet sent by the patient application (see
+    RealtimeNetworkingPatient.FixedUpdate). Missing DataTag groups are sent as zeros.
+    """
+    payload = [struct.pack("<iif", _PACKET_ID_CUSTOM, _PACKET_TYPE_CSV_WRITER_DATA_ENTRY, frame)]
+    for name in objects:
+        for tag in _object_tags(name):
+            payload.append(struct.pack("<3f", *values.get(tag, (0.0, 0.0, 0.0))))
+    payload = b"".join(payload)
+    return struct.pack("<i", len(payload)) + payload
+
+
+def read_data_entries(
+    connection: socket.socket, objects: Sequence[str] = DEFAULT_STREAMED_OBJECTS
+) -> Iterator[tuple[float, dict[DataTag, np.ndarray]]]:
+    """
+    Reads the CsvWriterDataEntry packets from a connection to the patient application, until it is closed. The
+    other packets (initialization, version, scene...) are skipped.
+
+    Yields
+    ------
+    tuple[float, dict[DataTag, np.ndarray]]
+        The time stamp of the frame and the values of each DataTag group of the objects.
+    """
+    entry_size = 4 + 4 * 6 * len(objects)
+    buffer = bytearray()
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            return
+        buffer.extend(chunk)
+
+        while len(buffer) >= 4:
+            (length,) = struct.unpack_from("<i", buffer)
+            if len(buffer) < 4 + length:
+                break
+            packet = bytes(buffer[4 : 4 + length])
+            del buffer[: 4 + length]
+
+            if length < 8 + entry_size:
+                continue
+            packet_id, packet_type = struct.unpack_from("<ii", packet)
+            if packet_id != _PACKET_ID_CUSTOM or packet_type != _PACKET_TYPE_CSV_WRITER_DATA_ENTRY:
+                continue
+
+            (frame,) = struct.unpack_from("<f", packet, 8)
+            floats = np.frombuffer(packet, dtype="<f4", count=6 * len(objects), offset=12).astype(np.float64)
+            values = {}
+            for i, name in enumerate(objects):
+                position, rotation = _object_tags(name)
+                values[position] = floats[6 * i : 6 * i + 3]
+                values[rotation] = floats[6 * i + 3 : 6 * i + 6]
+            yield float(frame), values
+
+
+def stream_jump_events(
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    objects: Sequence[str] = DEFAULT_STREAMED_OBJECTS,
+    on_event: Callable[[StreamingEvent], None] | None = None,
+    capacity: int = 4096,
+    window: int = 10,
+) -> StreamingJumpDetector:
+    """
+    Connects to the patient application, detects the jump events while the frames are received and returns the
+    finalized detector once the connection is closed.
+
+    Parameters
+    ----------
+    host : str
+        The address of the patient application.
+    port : int
+        The port of the patient application.
+    objects : Sequence[str]
+        The names of the streamed objects, in the order they are written in the packets.
+    on_event : Callable[[StreamingEvent], None] | None
+        Called each time an event is detected.
+    capacity : int
+        The number of frames kept in memory.
+    window : int
+        The number of points to use for the central difference.
+
+    Returns
+    -------
+    StreamingJumpDetector
+        The detector, from which the indices and the metrics of the jump can be read.
+    """
+    data = StreamingData(capacity=capacity, window=window)
+    detector = StreamingJumpDetector(data, on_event=on_event)
+    with socket.create_connection((host, port)) as connection:
+        for frame, values in read_data_entries(connection, objects):
+            data.append(frame, values)
+            detector.update()
+    detector.finalize()
+    return detector
+
+
+def replay_csv(
+    data_path: Path,
+    port: int = DEFAULT_PORT,
+    host: str = "127.0.0.1",
+    speed: float | None = None,
+    objects: Sequence[str] = DEFAULT_STREAMED_OBJECTS,
+    server: socket.socket | None = None,
+) -> None:
+    """
+    Stands in for the patient application: waits for a client to connect and sends it the frames of a recorded CSV
+    file as CsvWriterDataEntry packets, then closes the connection.
+
+    Parameters
+    ----------
+    data_path : Path
+        Path to the CSV file to replay.
+    port : int
+        The port to listen to.
+    host : str
+        The address to listen to.
+    speed : float | None
+        The replay speed relative to the recording (1.0 is real time). If None, the frames are sent as fast as
+        possible.
+    objects : Sequence[str]
+        The names of the streamed objects, in the order they are written in the packets.
+    server : socket.socket | None
+        An already listening socket to use instead of opening one on host and port.
+    """
+    df = pd.read_csv(data_path)
+    frames = df[DataTag.FRAME.value].to_numpy(dtype=np.float64)
+    columns = {
+        tag: df[tag.value].to_numpy(dtype=np.float64)
+        for name in objects
+        for tag in _object_tags(name)
+        if all(column in df.columns for column in tag.value)
+    }
+
+    if server is None:
+        server = socket.create_server((host, port))
+    with server, server.accept()[0] as connection:
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            if speed is not None:
+                delay = (frame - frames[0]) / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            connection.sendall(encode_data_entry(frame, {tag: values[i] for tag, values in columns.items()}, objects))
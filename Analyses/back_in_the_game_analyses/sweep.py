@@ -0,0 +1,169 @@
+from functools import partial
+from itertools import product
+from pathlib import Path
+from typing import Hashable, Iterable
+
+import pandas as pd
+
+from .batch import iter_extract_many
+from .data import Data
+from .data_extraction import CORE_METRICS, DataMetrics, _jump_signals
+from .events import (
+    GRAVITY,
+    MINIMUM_SQUAT_START_INDEX,
+    VELOCITY_SAFETY_THRESHOLD,
+    VELOCITY_THRESHOLD,
+    DataIndicesExtraction,
+    JumpCrossingsGrid,
+    jump_events,
+)
+from .registry import MetricRegistry
+
+# The columns of the parameters in the tables returned by `threshold_sweep`
+SWEEP_PARAMETERS = (
+    "window",
+    "velocity_safety_threshold",
+    "velocity_threshold",
+    "gravity",
+    "minimum_squat_start_index",
+)
+
+
+def threshold_sweep(
+    data: Data,
+    windows: Iterable[int] = (10,),
+    velocity_safety_thresholds: Iterable[float] = (VELOCITY_SAFETY_THRESHOLD,),
+    velocity_thresholds: Iterable[float] = (VELOCITY_THRESHOLD,),
+    gravities: Iterable[float] = (GRAVITY,),
+    minimum_squat_start_indices: Iterable[int] = (MINIMUM_SQUAT_START_INDEX,),
+    metrics: Iterable[Hashable] | None = None,
+    registry: MetricRegistry | None = None,
+) -> pd.DataFrame:
+    """
+    Detects the jump events and computes the metrics of a recording for every combination of the parameters of the
+    events detection, e.g. to calibrate them. The derivatives are computed once per window, the crossings once per
+    threshold value (see `JumpCrossingsGrid`) and the metrics once per window and distinct set of events, so the cost
+    grows with the number of distinct values rather than with the number of combinations.
+
+    Parameters
+    ----------
+    data : Data
+        The recording.
+    windows : Iterable[int]
+        The windows of the derivatives the events are detected on and the metrics are computed with.
+    velocity_safety_thresholds : Iterable[float]
+        The velocities a squat must reach to be detected.
+    velocity_thresholds : Iterable[float]
+        The velocities defining the start of the squat.
+    gravities : Iterable[float]
+        The accelerations defining the flight phase.
+    minimum_squat_start_indices : Iterable[int]
+        The first frames a squat can start at.
+    metrics : Iterable[Hashable] | None
+        The metrics to compute. If None, the metrics of the registry depending on the jump events are computed (the
+        other ones do not depend on the parameters).
+    registry : MetricRegistry | None
+        The metrics the keys refer to. Defaults to CORE_METRICS.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per combination, with the parameters (see SWEEP_PARAMETERS), the index of each DataIndicesExtraction
+        event (None if the squat was not detected) and the value of each metric. As for `data_extraction`, the
+        events are detected on the central difference whatever the derivative method of the recording.
+    """
+    registry = CORE_METRICS if registry is None else registry
+    if metrics is None:
+        metrics = [key for key in registry if registry[key].events and key != DataMetrics.JUMP_INDICES]
+    metrics = list(metrics)
+    grid = list(product(list(velocity_safety_thresholds), list(velocity_thresholds), list(gravities)))
+    minimum_squat_start_indices = list(minimum_squat_start_indices)
+
+    rows = []
+    computed: dict[tuple, dict[Hashable, object]] = {}
+    for window in windows:
+        crossings_grid = JumpCrossingsGrid(
+            *_jump_signals(data, window),
+            velocity_safety_thresholds=[parameters[0] for parameters in grid],
+            velocity_thresholds=[parameters[1] for parameters in grid],
+            gravities=[parameters[2] for parameters in grid],
+        )
+
+        for velocity_safety_threshold, velocity_threshold, gravity in grid:
+            crossings = crossings_grid.crossings(velocity_safety_threshold, velocity_threshold, gravity)
+            for minimum_squat_start_index in minimum_squat_start_indices:
+                jump_indices = jump_events(crossings, minimum_squat_start_index=minimum_squat_start_index)
+                # Many combinations detect the same events, whose metrics are then only computed once per window
+                key = (window, *jump_indices.values())
+                if key not in computed:
+                    computed[key] = registry.compute(data, metrics, jump_indices=jump_indices, derivative_window=window)
+
+                parameters = [window, velocity_safety_threshold, velocity_threshold, gravity, minimum_squat_start_index]
+                rows.append(parameters + list(jump_indices.values()) + list(computed[key].values()))
+
+    columns = list(SWEEP_PARAMETERS) + [event.value for event in DataIndicesExtraction] + _metric_columns(metrics)
+    table = pd.DataFrame(rows, columns=columns)
+    events = [event.value for event in DataIndicesExtraction]
+    table[events] = table[events].astype("Int64")
+    return table
+
+
+def _metric_columns(metrics: list[Hashable]) -> list[str]:
+    return [metric.value if isinstance(metric, DataMetrics) else str(metric) for metric in metrics]
+
+
+def threshold_sweep_many(
+    paths: Iterable[Path],
+    workers: int = 1,
+    chunksize: int = 1,
+    windows: Iterable[int] = (10,),
+    velocity_safety_thresholds: Iterable[float] = (VELOCITY_SAFETY_THRESHOLD,),
+    velocity_thresholds: Iterable[float] = (VELOCITY_THRESHOLD,),
+    gravities: Iterable[float] = (GRAVITY,),
+    minimum_squat_start_indices: Iterable[int] = (MINIMUM_SQUAT_START_INDEX,),
+    metrics: Iterable[Hashable] | None = None,
+    **data_kwargs,
+) -> pd.DataFrame:
+    """
+    Runs `threshold_sweep` on several recordings, in parallel if workers > 1 (see `iter_extract_many`).
+
+    Parameters
+    ----------
+    paths : Iterable[Path]
+        Paths to the recordings.
+    workers : int
+        The number of worker processes. If 1, the recordings are processed in the current process.
+    chunksize : int
+        The number of recordings sent to a worker at once.
+    windows, velocity_safety_thresholds, velocity_thresholds, gravities, minimum_squat_start_indices, metrics
+        See `threshold_sweep`. Only the core metrics can be swept across processes.
+    **data_kwargs
+        Additional keyword arguments forwarded to the `Data` constructor (e.g. backend).
+
+    Returns
+    -------
+    pd.DataFrame
+        The tables of `threshold_sweep` of all the recordings, preceded by a "File" column holding the path of the
+        recording. The recordings that could not be processed are skipped with their error printed.
+    """
+    sweep = partial(
+        threshold_sweep,
+        windows=list(windows),
+        velocity_safety_thresholds=list(velocity_safety_thresholds),
+        velocity_thresholds=list(velocity_thresholds),
+        gravities=list(gravities),
+        minimum_squat_start_indices=list(minimum_squat_start_indices),
+        metrics=None if metrics is None else list(metrics),
+    )
+
+    tables = []
+    for result in iter_extract_many(paths, workers=workers, chunksize=chunksize, extraction=sweep, **data_kwargs):
+        if not result.succeeded:
+            print(f"Failed to sweep {result.path}, it is skipped:\n{result.error}")
+            continue
+        tables.append(result.metrics.assign(File=str(result.path)))
+
+    if not tables:
+        return pd.DataFrame(columns=["File"])
+    table = pd.concat(tables, ignore_index=True)
+    return table[["File"] + [column for column in table.columns if column != "File"]]
@@ -0,0 +1,257 @@
+import argparse
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from back_in_the_game_analyses import (
+    __version__,
+    Data,
+    DataBackend,
+    DataTag,
+    convert_to_binary,
+    data_extraction,
+    head_kinematics_plot,
+    required_tags,
+    save_head_kinematics,
+)
+from back_in_the_game_analyses.data_extraction import (
+    _acceleration_peak,
+    _flight_time,
+    _horizontal_dispersion,
+    _jump_distance,
+    _jump_height,
+    _jump_indices_extraction,
+    _squat_height,
+    _traveled_distance,
+)
+
+from synthetic import QUEST_FRAME_RATES, write_synthetic_recording
+
+_ANALYSES_FOLDER = Path(__file__).resolve().parents[1]
+_DEFAULT_RESULTS = Path(__file__).resolve().parent / "results.jsonl"
+
+# The modules the package only imports at their first use, which a plain import of the package must not load
+_DEFERRED_MODULES = (
+    "scipy",
+    "matplotlib",
+    "openpyxl",
+    "pyarrow",
+    "back_in_the_game_analyses.batch",
+    "back_in_the_game_analyses.report",
+    "back_in_the_game_analyses.metrics_store",
+    "back_in_the_game_analyses.streaming",
+    "back_in_the_game_analyses.ingest",
+    "back_in_the_game_analyses.sweep",
+    "back_in_the_game_analyses.plotting",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the analysis pipeline on synthetic recordings")
+    parser.add_argument(
+        "--durations",
+        type=float,
+        nargs="+",
+        default=[10, 60, 600, 1800],
+        help="Durations (s) of the synthetic recordings (default: 10 60 600 1800)",
+    )
+    parser.add_argument(
+        "--frame-rates",
+        type=float,
+        nargs="+",
+        default=[QUEST_FRAME_RATES[0]],
+        help=f"Frame rates (Hz) of the synthetic recordings (default: {QUEST_FRAME_RATES[0]:g})",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed repetitions of each case (default: 5)")
+    parser.add_argument(
+        "--runner-trials", type=int, default=8, help="Number of 60 s trials analysed by the runner case (default: 8)"
+    )
+    parser.add_argument("--skip-runner", action="store_true", help="Do not time the runner end-to-end")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=_DEFAULT_RESULTS,
+        help="File the results are appended to, and compared against (default: benchmarks/results.jsonl)",
+    )
+    parser.add_argument("--no-save", action="store_true", help="Print the results without appending them")
+    args = parser.parse_args()
+
+    results = _benchmark_import(args.repeat)
+    with tempfile.TemporaryDirectory() as folder:
+        folder = Path(folder)
+        for frame_rate in args.frame_rates:
+            for duration in args.durations:
+                name = f"{duration:g}s@{frame_rate:g}Hz"
+                print(f"Generating the {name} recording")
+                path = write_synthetic_recording(
+                    folder / f"{name}.csv", duration=duration, frame_rate=frame_rate, jumps=_jump_times(duration)
+                )
+                results.update(_benchmark_recording(name, path, args.repeat))
+
+        if not args.skip_runner:
+            results.update(_benchmark_runner(folder / "runner", args.runner_trials, args.repeat))
+
+    previous = _previous_results(args.output)
+    _print_results(results, previous)
+    if not args.no_save:
+        _save_results(args.output, results)
+
+
+def _jump_times(duration: float) -> tuple[float, ...]:
+    """Returns the start of the squats of a recording: the first one after 3 s, then one every 20 s."""
+    return tuple(np.arange(3.0, max(duration - 3.0, 3.0), 20.0))
+
+
+def _timeit(function: Callable[[], object], repeat: int, setup: Callable[[], object] | None = None) -> dict:
+    """Returns the statistics (s) of the wall time of function, setup being called (untimed) before each call."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": float(np.median(times)), "repeat": repeat}
+
+
+def _benchmark_import(repeat: int) -> dict[str, dict]:
+    """Times `import back_in_the_game_analyses` in a new interpreter, as done by each worker process."""
+    print("Timing the import of the package")
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import back_in_the_game_analyses\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(elapsed, *[m for m in {_DEFERRED_MODULES!r} if m in sys.modules])\n"
+    )
+    environment = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(_ANALYSES_FOLDER), os.environ.get("PYTHONPATH", "")]),
+    }
+
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", script], env=environment, capture_output=True, text=True, check=True
+        ).stdout.split()
+        times.append(float(output[0]))
+        if output[1:]:
+            print(f"  Warning: importing the package also imports {', '.join(output[1:])}")
+    return {
+        "import/back_in_the_game_analyses": {"min": min(times), "median": float(np.median(times)), "repeat": repeat}
+    }
+
+
+def _benchmark_recording(name: str, path: Path, repeat: int) -> dict[str, dict]:
+    results = {}
+    binary_path = convert_to_binary(path)
+
+    print(f"Timing the loading of {name}")
+    tags = list(required_tags())
+    results[f"load/csv/pandas/{name}"] = _timeit(lambda: Data(path), repeat)
+    results[f"load/csv/pandas/required_tags/{name}"] = _timeit(lambda: Data(path, tags=tags), repeat)
+    results[f"load/binary/numpy/{name}"] = _timeit(lambda: Data(binary_path, backend=DataBackend.NUMPY), repeat)
+
+    for backend in DataBackend:
+        print(f"Timing the {backend.value} helpers on {name}")
+        data = Data(binary_path if backend == DataBackend.NUMPY else path, backend=backend)
+        jump_indices = _jump_indices_extraction(data)
+
+        # The derivatives are cleared before each call, so each helper is timed as if it were the first to run
+        helpers = {
+            "_jump_indices_extraction": lambda: _jump_indices_extraction(data),
+            "_horizontal_dispersion": lambda: _horizontal_dispersion(data, DataTag.HEAD_POSITION),
+            "_acceleration_peak": lambda: _acceleration_peak(data, DataTag.LEFT_HAND_POSITION),
+            "_traveled_distance": lambda: _traveled_distance(data, DataTag.LEFT_HAND_POSITION),
+            "_squat_height": lambda: _squat_height(data, jump_indices),
+            "_jump_height": lambda: _jump_height(data, jump_indices),
+            "_jump_distance": lambda: _jump_distance(data, jump_indices),
+            "_flight_time": lambda: _flight_time(data, jump_indices),
+        }
+        for helper_name, helper in helpers.items():
+            results[f"helper/{backend.value}/{helper_name}/{name}"] = _timeit(helper, repeat, setup=data.clear_cache)
+        results[f"data_extraction/{backend.value}/{name}"] = _timeit(
+            lambda: data_extraction(data), repeat, setup=data.clear_cache
+        )
+
+    # The signals are decimated, so the rendering time should not grow with the duration of the recording
+    print(f"Timing the rendering of the figure of {name}")
+    data = Data(binary_path, backend=DataBackend.NUMPY)
+    figure_path = path.with_suffix(".png")
+    results[f"plot/png/{name}"] = _timeit(lambda: save_head_kinematics(head_kinematics_plot(data), figure_path), repeat)
+    return results
+
+
+def _benchmark_runner(folder: Path, n_trials: int, repeat: int) -> dict[str, dict]:
+    print(f"Timing the runner on {n_trials} trials")
+    for i in range(n_trials):
+        write_synthetic_recording(folder / "data" / "orthovr1" / f"trial{i}.csv", duration=60.0, seed=i)
+
+    environment = {
+        **os.environ,
+        "DATA_PATH": str(folder / "data"),
+        "PYTHONPATH": os.pathsep.join([str(_ANALYSES_FOLDER), os.environ.get("PYTHONPATH", "")]),
+    }
+    command = [sys.executable, str(_ANALYSES_FOLDER / "runner" / "main.py")]
+
+    def run():
+        subprocess.run(command, cwd=folder, env=environment, check=True, stdout=subprocess.DEVNULL)
+
+    return {f"runner/{n_trials}x60s": _timeit(run, repeat)}
+
+
+def _previous_results(path: Path) -> dict[str, dict]:
+    """Returns the results of the last run recorded in path."""
+    if not path.exists():
+        return {}
+    lines = path.read_text().splitlines()
+    return json.loads(lines[-1])["results"] if lines else {}
+
+
+def _print_results(results: dict[str, dict], previous: dict[str, dict]) -> None:
+    rows = []
+    for name, result in results.items():
+        change = np.nan
+        if name in previous:
+            change = (result["median"] / previous[name]["median"] - 1) * 100
+        rows.append([name, result["median"] * 1000, result["min"] * 1000, change])
+    table = pd.DataFrame(rows, columns=["Case", "Median (ms)", "Min (ms)", "Change vs previous (%)"])
+    with pd.option_context("display.max_rows", None, "display.width", 200, "display.float_format", "{:.3f}".format):
+        print(table.to_string(index=False))
+
+
+def _save_results(path: Path, results: dict[str, dict]) -> None:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_ANALYSES_FOLDER, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    record = {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "version": __version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "a") as file:
+        file.write(json.dumps(record) + "\n")
+    print(f"Results appended to {path}")
+
+
+if __name__ == "__main__":
+    main()
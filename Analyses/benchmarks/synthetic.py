@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import numpy as np
+
+# The frame rates the Quest headsets can run at (Hz)
+QUEST_FRAME_RATES = (72.0, 90.0, 120.0)
+
+# The objects exported by the patient application, in the order of the columns of the CSV files
+_OBJECTS = ("Head", "LeftHand", "RightHand")
+
+# The shape of a jump: squat (down then up), flight and landing
+_SQUAT_DURATION = 0.4  # s, for each of the descent and the ascent
+_SQUAT_DEPTH = 0.3  # m
+_TAKE_OFF_VELOCITY = 2.2  # m/s
+_GRAVITY = 9.81  # m/s/s
+_HEAD_HEIGHT = 1.6  # m
+
+
+def synthetic_recording(
+    duration: float = 10.0,
+    frame_rate: float = QUEST_FRAME_RATES[0],
+    jumps: tuple[float, ...] = (3.0,),
+    jump_distance: float = 0.3,
+    hand_noise: float = 0.01,
+    seed: int = 0,
+) -> tuple[list[str], np.ndarray]:
+    """
+    Generates the head and hands trajectories of a subject standing still and performing squat jumps.
+
+    Parameters
+    ----------
+    duration : float
+        The duration of the recording (s).
+    frame_rate : float
+        The frame rate of the headset (Hz), see QUEST_FRAME_RATES.
+    jumps : tuple[float, ...]
+        The times (s) at which each squat starts.
+    jump_distance : float
+        The horizontal distance (m) traveled forward during each flight.
+    hand_noise : float
+        The standard deviation (m) of the noise added to the positions of the hands.
+    seed : int
+        The seed of the noise added to the trajectories.
+
+    Returns
+    -------
+    tuple[list[str], np.ndarray]
+        The header and the values (n_frames, n_columns) of the recording, as exported by the Unity application.
+    """
+    rng = np.random.default_rng(seed)
+    n_frames = int(duration * frame_rate)
+    time = np.arange(n_frames) / frame_rate
+    frame = time + 10.0 + rng.normal(0, 0.05 / frame_rate, n_frames)
+
+    vertical = np.full(n_frames, _HEAD_HEIGHT)
+    frontal = np.zeros(n_frames)
+    flight_time = 2 * _TAKE_OFF_VELOCITY / _GRAVITY
+    for i, start in enumerate(jumps):
+        descent = (time >= start) & (time < start + _SQUAT_DURATION)
+        vertical[descent] -= _SQUAT_DEPTH * np.sin(np.pi / 2 * (time[descent] - start) / _SQUAT_DURATION)
+        ascent = (time >= start + _SQUAT_DURATION) & (time < start + 2 * _SQUAT_DURATION)
+        vertical[ascent] -= _SQUAT_DEPTH * np.cos(
+            np.pi / 2 * (time[ascent] - start - _SQUAT_DURATION) / _SQUAT_DURATION
+        )
+
+        take_off = start + 2 * _SQUAT_DURATION
+        flight = (time >= take_off) & (time < take_off + flight_time)
+        vertical[flight] += (
+            _TAKE_OFF_VELOCITY * (time[flight] - take_off) - _GRAVITY / 2 * (time[flight] - take_off) ** 2
+        )
+        frontal += jump_distance * np.clip((time - take_off) / flight_time, 0, 1)
+
+    lateral = 0.02 * np.sin(0.7 * time) + rng.normal(0, 0.002, n_frames)
+    frontal += 0.01 * np.cos(0.5 * time) + rng.normal(0, 0.002, n_frames)
+    vertical += rng.normal(0, 0.0005, n_frames)
+
+    header = ["Frame"]
+    columns = [frame]
+    offsets = {"Head": (0.0, 0.0), "LeftHand": (-0.3, -0.5), "RightHand": (0.3, -0.5)}
+    for name in _OBJECTS:
+        lateral_offset, vertical_offset = offsets[name]
+        header += [f"{name}_Pos.X", f"{name}_Pos.Y", f"{name}_Pos.Z", f"{name}_Rot.X", f"{name}_Rot.Y", f"{name}_Rot.Z"]
+        noise = 0.0 if name == "Head" else rng.normal(0, hand_noise, (3, n_frames))
+        columns += list(np.array([lateral + lateral_offset, vertical + vertical_offset, frontal]) + noise)
+        columns += list(rng.uniform(0, 360, (3, n_frames)))
+    return header, np.column_stack(columns)
+
+
+def write_synthetic_recording(path: Path, **kwargs) -> Path:
+    """
+    Writes a synthetic recording (see `synthetic_recording` for the keyword arguments) to a CSV file formatted as
+    the ones exported by the Unity application.
+    """
+    header, values = synthetic_recording(**kwargs)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savetxt(path, values, fmt="%.6f", delimiter=",", header=",".join(header), comments="")
+    return path
@@ -0,0 +1,42 @@
+import argparse
+import os
+from pathlib import Path
+
+from back_in_the_game_analyses import binary_recording_path, convert_to_binary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert the recorded trials to binary recordings so they are faster to load by the analyses"
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        type=Path,
+        help="CSV files to convert. If none are provided, all the trials of DATA_PATH are converted",
+    )
+    parser.add_argument("--force", action="store_true", help="Convert the files even if they are already up to date")
+    args = parser.parse_args()
+
+    files = args.files
+    if not files:
+        # Get the data folder from the DATA_PATH environment variable
+        data_folder = os.getenv("DATA_PATH")
+        subjects = ["orthovr" + str(i) for i in range(1, 16)]
+        files = [file for subject in subjects for file in (Path(data_folder) / subject).glob("*.csv")]
+
+    for file in files:
+        binary_path = binary_recording_path(file)
+        if not args.force and binary_path.exists() and binary_path.stat().st_mtime >= file.stat().st_mtime:
+            print(f"  Up to date: {file.name}")
+            continue
+
+        print(f"  Converting file: {file.name}")
+        try:
+            convert_to_binary(file)
+        except Exception as e:
+            print(f"    Failed to convert the file, it is skipped: {e!r}")
+
+
+if __name__ == "__main__":
+    main()
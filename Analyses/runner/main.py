@@ -1,71 +1,138 @@
+import argparse
+import math
 import os
 from pathlib import Path
 
 from back_in_the_game_analyses import (
     Data,
-    DataTag,
-    DataType,
-    DataAxis,
-    data_extraction,
-    DataIndicesExtraction,
+    DataBackend,
     DataMetrics,
+    PlotFormat,
+    data_extraction,
+    iter_extract_many,
+    jump_segmentation,
+    MetricsStore,
+    active_profiler,
+    profile,
+    profiled_stage,
+    ReportWriter,
+    report_to_xlsx,
+    draw_head_kinematics,
+    head_kinematics_plot,
+    iter_extract_and_render_many,
+    render_head_kinematics_many,
 )
-from matplotlib import pyplot as plt
-import pandas as pd
 
 _show_graphs = False
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Extract the metrics of all the recorded trials")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of worker processes used to analyse the trials (default: 1)"
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=None,
+        help="Path to a metrics database. Only the new or modified trials are analysed, the others are read from it",
+    )
+    parser.add_argument(
+        "--prefer-binary",
+        action="store_true",
+        help="Load the binary recordings (see convert_to_binary.py) instead of the CSV files when they are up to date",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Store the recordings as float32 to halve the memory used (see the README for the accuracy impact)",
+    )
+    parser.add_argument(
+        "--resample",
+        action="store_true",
+        help="Resample the recordings onto a uniform timebase before computing the derivatives, so the frames dropped "
+        "or delayed by the headset do not distort them",
+    )
+    parser.add_argument(
+        "--per-jump",
+        action="store_true",
+        help="Segment each trial into its jumps and export one row per jump instead of one row per trial (a trial "
+        "without jumps gets a single row with a Jump of 0 and no metrics)",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=Path("metrics.csv"),
+        help="The report the metrics are written to as the trials are analysed, a .csv file or a .parquet folder of "
+        "part files (default: metrics.csv)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Keep the trials already written in the report and only analyse the other ones",
+    )
+    parser.add_argument(
+        "--xlsx",
+        type=Path,
+        default=Path("metrics.xlsx"),
+        help="The Excel file the report is converted to once all the trials are analysed (default: metrics.xlsx)",
+    )
+    parser.add_argument("--no-xlsx", dest="xlsx", action="store_const", const=None, help="Do not write the Excel file")
+    parser.add_argument(
+        "--plots",
+        type=Path,
+        default=None,
+        help="Render the head kinematics and jump events of each trial to a .pdf file (one page per trial) or to a "
+        "folder (one figure per trial, see --plot-format)",
+    )
+    parser.add_argument(
+        "--plot-format",
+        type=PlotFormat,
+        choices=[PlotFormat.PNG, PlotFormat.SVG],
+        default=PlotFormat.PNG,
+        metavar="{.png,.svg}",
+        help="The format of the figures written to the --plots folder (default: .png)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        help="Time each stage of the analyses and write the statistics to this JSON file (see also the "
+        "BACK_IN_THE_GAME_PROFILE environment variable)",
+    )
+    args = parser.parse_args()
+    if args.per_jump and args.store is not None:
+        parser.error("--store cannot be used with --per-jump")
+    if args.resample and args.store is not None:
+        parser.error("--store cannot be used with --resample, as the stored metrics were computed on the raw frames")
+    if args.compact and args.store is not None:
+        parser.error("--store cannot be used with --compact, as the stored metrics were computed in float64")
+
+    profiler = active_profiler()
+    if profiler is None and args.profile is None:
+        _extract_and_export(args)
+        return
+
+    with profile(profiler) as profiler:
+        _extract_and_export(args)
+    print(profiler.summary().to_string(index=False))
+    if args.profile is not None:
+        profiler.save(args.profile)
+
+
+def _extract_and_export(args: argparse.Namespace) -> None:
     # Get the data folder from the DATA_PATH environment variable
     data_folder = os.getenv("DATA_PATH")
     subjects = ["orthovr" + str(i) for i in range(1, 16)]
-    all_metrics = []
 
+    files = []
     for subject in subjects:
-        print(f"Processing subject: {subject}")
         data_path = Path(data_folder) / subject
         for file in data_path.glob("*.csv"):
-            print(f"  Processing file: {file.name}")
-            data = Data(file)
+            files.append((subject, file))
 
-            # Compute metrics
-            metrics = data_extraction(data)
-            all_metrics.append({"Subject": subject, "File": file.name, **metrics})
-
-            if _show_graphs:
-                # Extract relevant metrics
-                head_pos = data.get(DataTag.HEAD_POSITION, data_type=DataType.VALUE, axis=DataAxis.ALL)
-                head_vel = data.get(DataTag.HEAD_POSITION, data_type=DataType.VELOCITY, axis=DataAxis.ALL)
-                head_acc = data.get(DataTag.HEAD_POSITION, data_type=DataType.ACCELERATION, axis=DataAxis.ALL)
-
-                # Plot head position
-                plt.figure(file.name)
-                plt.title(f"{subject} - {file.stem}")
-                plt.subplot(3, 1, 1)
-                plt.plot(data.time, head_pos)
-                for idx in DataIndicesExtraction:
-                    if metrics[DataMetrics.JUMP_INDICES][idx] is not None:
-                        plt.axvline(data.time[metrics[DataMetrics.JUMP_INDICES][idx]], color="r", linestyle="--")
-                plt.ylabel("Head position (m)")
-                plt.subplot(3, 1, 2)
-                plt.plot(data.time, head_vel)
-                for idx in DataIndicesExtraction:
-                    if metrics[DataMetrics.JUMP_INDICES][idx] is not None:
-                        plt.axvline(data.time[metrics[DataMetrics.JUMP_INDICES][idx]], color="r", linestyle="--")
-                plt.ylabel("Head Velocity (m)")
-                plt.subplot(3, 1, 3)
-                plt.plot(data.time, head_acc)
-                for idx in DataIndicesExtraction:
-                    if metrics[DataMetrics.JUMP_INDICES][idx] is not None:
-                        plt.axvline(data.time[metrics[DataMetrics.JUMP_INDICES][idx]], color="r", linestyle="--")
-                plt.ylabel("Head Acceleration (m/s²)")
-                plt.xlabel("Time (s)")
-                plt.tight_layout()
-                plt.show()
-
-    # Write the excel file from all_metrics
-    header = ["Subject", "File"]
+    keys = ["Subject", "File", "Jump"] if args.per_jump else ["Subject", "File"]
+    header = list(keys)
     header_description = []
     for metric in DataMetrics:
         if metric == DataMetrics.JUMP_INDICES:
@@ -73,23 +140,104 @@ def main():
         header.append(metric.value)
         header_description.append([metric.value, metric.description])
 
-    # Write the data to an Excel file
-    data = []
-    for metrics in all_metrics:
-        row = [metrics["Subject"], metrics["File"]]
-        for metric in DataMetrics:
-            if metric == DataMetrics.JUMP_INDICES:
+    # The metrics are written to the report as soon as each trial is analysed, so an interrupted run can be resumed
+    with ReportWriter(args.report, header, key_columns=["Subject", "File"], resume=args.resume) as report:
+        skipped = [(subject, file) for subject, file in files if report.completed(subject, file.name)]
+        if skipped:
+            print(f"  Resuming {report.path}: {len(skipped)} file(s) already analysed are skipped")
+        files = [(subject, file) for subject, file in files if not report.completed(subject, file.name)]
+
+        store = None if args.store is None else MetricsStore(args.store)
+        paths = [file for _, file in files]
+        extraction = jump_segmentation if args.per_jump else data_extraction
+        data_kwargs = {"backend": _backend(args), "prefer_binary": args.prefer_binary, "resample": args.resample}
+        if args.plots is not None and store is None:
+            # Each worker renders the figure of the trial it analyses, from the same recording and jump events
+            print(f"  Rendering the figures to {args.plots}")
+            rendered = iter_extract_and_render_many(
+                paths,
+                args.plots,
+                extraction=extraction,
+                plot_format=_plot_format(args),
+                workers=args.workers,
+                **data_kwargs,
+            )
+            results = (result for result, _ in rendered)
+        else:
+            results = iter_extract_many(paths, workers=args.workers, store=store, extraction=extraction, **data_kwargs)
+        for (subject, file), result in zip(files, results):
+            status = "Loaded from store" if result.from_store else "Processed file"
+            print(f"  {status}: {result.path.parent.name}/{result.path.name}")
+            if not result.succeeded:
+                print(f"    Failed to process the file, it is skipped:\n{result.error}")
                 continue
-            row.append(metrics[metric])
-        data.append(row)
 
-    writer = pd.ExcelWriter("metrics.xlsx")
-    df = pd.DataFrame(data, columns=header)
-    df.to_excel(writer, index=False, sheet_name="Metrics")
+            all_metrics = [episode.metrics for episode in result.metrics] if args.per_jump else [result.metrics]
+            with profiled_stage("runner.export"):
+                rows = []
+                for i, metrics in enumerate(all_metrics):
+                    row = [subject, file.name, i + 1] if args.per_jump else [subject, file.name]
+                    for metric in DataMetrics:
+                        if metric == DataMetrics.JUMP_INDICES:
+                            continue
+                        row.append(metrics[metric])
+                    rows.append(row)
+                if not rows:
+                    # A trial without jumps gets a row of its own, so a resumed run does not analyse it again
+                    rows.append([subject, file.name, 0] + [math.nan] * (len(header) - len(keys)))
+                # All the jumps of a trial are written at once, so a resumed run never skips a partially written trial
+                report.write_rows(rows)
+
+            if _show_graphs:
+                _plot_head_kinematics(Data(file, resample=args.resample))
+        if store is not None:
+            store.close()
+
+    if args.plots is not None and args.store is not None:
+        # The trials read from the store are not loaded, so all the figures are rendered once the metrics are exported
+        _render_plots(args, [file for _, file in files])
+
+    if args.xlsx is not None:
+        with profiled_stage("runner.export"):
+            report_to_xlsx(args.report, args.xlsx, descriptions=header_description, text_columns=["Subject", "File"])
+
+
+def _backend(args: argparse.Namespace) -> DataBackend:
+    """Returns the backend the recordings are loaded with."""
+    if args.compact:
+        return DataBackend.COMPACT
+    return DataBackend.NUMPY if args.prefer_binary else DataBackend.PANDAS
+
+
+def _plot_format(args: argparse.Namespace) -> PlotFormat:
+    """Returns the format of the figures: a single PDF file, or one file per trial in the --plot-format."""
+    return PlotFormat.PDF if args.plots.suffix == PlotFormat.PDF.value else args.plot_format
+
+
+def _render_plots(args: argparse.Namespace, files: list[Path]) -> None:
+    """Renders the figures of the trials without a display, in the worker processes."""
+    print(f"  Rendering the figures to {args.plots}")
+    with profiled_stage("runner.plots"):
+        results = render_head_kinematics_many(
+            files,
+            args.plots,
+            plot_format=_plot_format(args),
+            workers=args.workers,
+            backend=_backend(args),
+            resample=args.resample,
+        )
+    for result in results:
+        if not result.succeeded:
+            print(f"    Failed to render {result.path.parent.name}/{result.path.name}:\n{result.error}")
+
+
+def _plot_head_kinematics(data: Data) -> None:
+    # matplotlib is only imported when the graphs are shown, as it is slow to import
+    from matplotlib import pyplot as plt
 
-    df = pd.DataFrame(header_description, columns=["Header", "Description"])
-    df.to_excel(writer, index=False, sheet_name="Description")
-    writer.close()
+    plot = head_kinematics_plot(data)
+    draw_head_kinematics(plt.figure(plot.title), plot)
+    plt.show()
 
 
 if __name__ == "__main__":
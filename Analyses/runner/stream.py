@@ -0,0 +1,51 @@
+import argparse
+from pathlib import Path
+import socket
+import threading
+
+from back_in_the_game_analyses.streaming import DEFAULT_PORT, replay_csv, stream_jump_events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect the jump events live from the patient application")
+    parser.add_argument("--host", default="127.0.0.1", help="Address of the patient application")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port of the patient application")
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        default=None,
+        help="Replay a recorded CSV file through a local stand-in of the patient application instead of connecting",
+    )
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed relative to the recording")
+    args = parser.parse_args()
+
+    host, port = args.host, args.port
+    replay = None
+    if args.replay is not None:
+        server = socket.create_server(("127.0.0.1", 0))
+        host, port = server.getsockname()
+        replay = threading.Thread(
+            target=replay_csv, args=(args.replay,), kwargs={"server": server, "speed": args.speed}
+        )
+        replay.start()
+
+    def print_event(event):
+        print(
+            f"  Jump {event.jump + 1}: {event.event.value} at {event.time:.3f} s (frame {event.index}, detected "
+            f"{event.latency:.3f} s later)"
+        )
+
+    detector = stream_jump_events(host=host, port=port, on_event=print_event)
+    if replay is not None:
+        replay.join()
+
+    if detector.lagged:
+        print("Warning: the frames were received faster than they were analysed, some jumps may have been missed")
+    for jump, metrics in enumerate(detector.jumps_metrics, start=1):
+        print(f"Jump {jump}")
+        for metric, value in metrics.items():
+            print(f"  {metric.value}: {value:.3f}")
+
+
+if __name__ == "__main__":
+    main()
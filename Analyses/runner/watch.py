@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import os
+from pathlib import Path
+
+from back_in_the_game_analyses import DataBackend, DataMetrics, ReportWriter
+from back_in_the_game_analyses.ingest import RecordingWatcher, simulate_csv_writer
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Analyse the trials while they are recorded: the metrics of each trial are written to the report "
+        "as soon as its file stops growing"
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=Path("metrics.csv"),
+        help="The report the metrics are appended to, a .csv or a .parquet file (default: metrics.csv)",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=5.0,
+        help="Time (s) a file must stop growing for its trial to be considered finished (default: 5)",
+    )
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Time (s) between two scans (default: 0.5)")
+    parser.add_argument(
+        "--include-existing",
+        action="store_true",
+        help="Also analyse the trials that were already finished when the watcher started",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Store the recordings as float32 to halve the memory used (see the README for the accuracy impact)",
+    )
+    parser.add_argument(
+        "--simulate",
+        type=Path,
+        default=None,
+        help="Write a recorded CSV file to <DATA_PATH>/simulation/ as the patient application would, then stop once "
+        "its metrics are extracted",
+    )
+    parser.add_argument("--speed", type=float, default=1.0, help="Writing speed of the simulation (default: 1)")
+    args = parser.parse_args()
+
+    asyncio.run(_watch(args))
+
+
+async def _watch(args: argparse.Namespace) -> None:
+    data_folder = Path(os.getenv("DATA_PATH"))
+    watcher = RecordingWatcher(
+        data_folder,
+        poll_interval=args.poll_interval,
+        idle_timeout=args.idle_timeout,
+        include_existing=args.include_existing,
+        backend=DataBackend.COMPACT if args.compact else DataBackend.NUMPY,
+    )
+
+    simulated_path = None
+    if args.simulate is not None:
+        simulated_path = data_folder / "simulation" / args.simulate.name
+        if simulated_path.exists():
+            raise FileExistsError(f"{simulated_path} already exists")
+        simulation = asyncio.create_task(simulate_csv_writer(args.simulate, simulated_path, speed=args.speed))
+
+    metrics = [metric for metric in DataMetrics if metric != DataMetrics.JUMP_INDICES]
+    header = ["Subject", "File"] + [metric.value for metric in metrics]
+    print(f"Watching {data_folder}")
+    with ReportWriter(args.report, header, key_columns=["Subject", "File"], resume=True, row_group_size=1) as report:
+        async for result in watcher.watch():
+            subject, file = result.path.parent.name, result.path.name
+            if not result.succeeded:
+                print(f"  Failed to process {subject}/{file}:\n{result.error}")
+            else:
+                print(f"  Processed file: {subject}/{file}")
+                report.write([subject, file] + [result.metrics[metric] for metric in metrics])
+
+            if result.path == simulated_path:
+                watcher.stop()
+                await simulation
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import write_synthetic_recording
+
+
+@pytest.fixture(scope="session")
+def recording_path(tmp_path_factory) -> Path:
+    """A 20-second synthetic recording holding three jumps, at 72 Hz."""
+    return write_synthetic_recording(
+        tmp_path_factory.mktemp("data") / "orthovr1" / "trial.csv", duration=20.0, jumps=(3.0, 9.0, 15.0), seed=1
+    )
+
+
+@pytest.fixture(scope="session")
+def short_recording_path(tmp_path_factory) -> Path:
+    """An 8-second synthetic recording holding a single jump, at 72 Hz."""
+    return write_synthetic_recording(
+        tmp_path_factory.mktemp("data") / "orthovr2" / "short.csv", duration=8.0, jumps=(3.0,), seed=2
+    )
+
+
+@pytest.fixture(scope="session")
+def gap_recording_path(recording_path, tmp_path_factory) -> Path:
+    """The synthetic recording with 30 consecutive frames dropped before the second jump."""
+    df = pd.read_csv(recording_path)
+    path = tmp_path_factory.mktemp("gap") / "orthovr1" / "gap.csv"
+    path.parent.mkdir(parents=True)
+    df.drop(index=np.arange(500, 530)).to_csv(path, index=False, float_format="%.6f")
+    return path
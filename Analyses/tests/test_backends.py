@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from back_in_the_game_analyses import Data, DataBackend, DataMetrics, DataTag, DataType, data_extraction
+
+
+@pytest.fixture(scope="module")
+def numpy_metrics(recording_path):
+    return data_extraction(Data(recording_path, backend=DataBackend.NUMPY))
+
+
+def test_pandas_and_numpy_backends_compute_the_same_metrics(recording_path, numpy_metrics):
+    metrics = data_extraction(Data(recording_path, backend=DataBackend.PANDAS))
+    assert metrics.keys() == numpy_metrics.keys()
+    for metric, value in numpy_metrics.items():
+        assert metrics[metric] == value or (np.isnan(value) and np.isnan(metrics[metric])), metric
+
+
+@pytest.mark.parametrize("data_type", list(DataType))
+def test_arrays_hold_the_values_of_the_dataframes(recording_path, data_type):
+    pandas_data = Data(recording_path, backend=DataBackend.PANDAS)
+    numpy_data = Data(recording_path, backend=DataBackend.NUMPY)
+    expected = pandas_data.get(DataTag.HEAD_POSITION, data_type=data_type).to_numpy()
+    np.testing.assert_array_equal(numpy_data.get_array(DataTag.HEAD_POSITION, data_type=data_type), expected)
+    np.testing.assert_array_equal(pandas_data.get_array(DataTag.HEAD_POSITION, data_type=data_type), expected)
+
+
+def test_compact_backend_matches_the_numpy_backend_within_float32_precision(recording_path, numpy_metrics):
+    metrics = data_extraction(Data(recording_path, backend=DataBackend.COMPACT))
+    assert metrics[DataMetrics.JUMP_INDICES] == numpy_metrics[DataMetrics.JUMP_INDICES]
+    assert metrics[DataMetrics.JUMP_FLIGHT_TIME] == numpy_metrics[DataMetrics.JUMP_FLIGHT_TIME]
+    # The largest differences measured on the recordings are given in the README
+    for metric, value in numpy_metrics.items():
+        if metric != DataMetrics.JUMP_INDICES:
+            assert type(metrics[metric]) is float, metric
+            assert metrics[metric] == pytest.approx(value, rel=1e-6, nan_ok=True), metric
@@ -0,0 +1,113 @@
+import pytest
+
+from back_in_the_game_analyses import batch
+from back_in_the_game_analyses import (
+    Data,
+    DataBackend,
+    DataMetrics,
+    DerivativeMethod,
+    MetricsStore,
+    data_extraction,
+    extract_many,
+    jump_segmentation,
+)
+
+
+def test_parallel_extraction_matches_the_extraction_of_each_recording(recording_path):
+    expected = data_extraction(Data(recording_path))
+    results = extract_many([recording_path, recording_path], workers=2)
+    assert [result.path for result in results] == [recording_path, recording_path]
+    for result in results:
+        assert result.succeeded, result.error
+        assert result.metrics[DataMetrics.JUMP_INDICES] == expected[DataMetrics.JUMP_INDICES]
+        assert result.metrics[DataMetrics.JUMP_HEIGHT] == expected[DataMetrics.JUMP_HEIGHT]
+
+
+def test_failing_recording_does_not_interrupt_the_batch(recording_path, tmp_path):
+    malformed_path = tmp_path / "malformed.csv"
+    malformed_path.write_text("not,a\nrecording\n")
+    malformed, computed = extract_many([malformed_path, recording_path])
+    assert not malformed.succeeded and malformed.metrics is None and "Traceback" in malformed.error
+    assert computed.succeeded, computed.error
+
+
+def test_store_only_extracts_the_new_and_modified_recordings(recording_path, tmp_path):
+    modified_path = tmp_path / "orthovr1" / "modified.csv"
+    modified_path.parent.mkdir()
+    modified_path.write_bytes(recording_path.read_bytes())
+    with MetricsStore(tmp_path / "metrics.sqlite") as store:
+        first = extract_many([recording_path, modified_path], store=store)
+        with open(modified_path, "a") as file:
+            file.write(recording_path.read_text().splitlines()[-1] + "\n")
+        second = extract_many([recording_path, modified_path], store=store)
+        assert len(store) == 2
+
+    assert not any(result.from_store for result in first)
+    assert [result.from_store for result in second] == [True, False]
+    assert second[0].metrics == first[0].metrics
+
+
+def test_store_keeps_the_content_analysed_when_the_recording_is_modified_meanwhile(
+    recording_path, tmp_path, monkeypatch
+):
+    modified_path = tmp_path / "orthovr1" / "modified.csv"
+    modified_path.parent.mkdir()
+    modified_path.write_bytes(recording_path.read_bytes())
+    original = MetricsStore.fingerprint(modified_path)
+
+    extract_all = batch._extract_all
+
+    def extract_and_modify(*args):
+        for result in extract_all(*args):
+            with open(modified_path, "a") as file:
+                file.write(recording_path.read_text().splitlines()[-1] + "\n")
+            yield result
+
+    with MetricsStore(tmp_path / "metrics.sqlite") as store:
+        monkeypatch.setattr(batch, "_extract_all", extract_and_modify)
+        extract_many([modified_path], store=store)
+        monkeypatch.undo()
+        assert store.lookup(modified_path)[0] is None
+        (second,) = extract_many([modified_path], store=store)
+        assert store.get(modified_path) is not None
+
+    assert original.content_hash != MetricsStore.content_hash(modified_path)
+    assert not second.from_store
+
+
+def test_store_lookup_failure_only_fails_its_recording(recording_path, tmp_path):
+    with MetricsStore(tmp_path / "metrics.sqlite") as store:
+        missing, computed = extract_many([tmp_path / "missing.csv", recording_path], store=store)
+    assert not missing.succeeded and "FileNotFoundError" in missing.error
+    assert computed.succeeded
+
+
+def test_batch_applies_the_extraction_function(recording_path):
+    (result,) = extract_many([recording_path], extraction=jump_segmentation)
+    assert result.succeeded, result.error
+    assert [episode.indices for episode in result.metrics] == [
+        episode.indices for episode in jump_segmentation(Data(recording_path))
+    ]
+
+
+@pytest.mark.parametrize(
+    "data_kwargs",
+    [
+        {"backend": DataBackend.COMPACT},
+        {"derivative_method": DerivativeMethod.SAVITZKY_GOLAY},
+        {"resample": True},
+    ],
+)
+def test_store_rejects_the_options_changing_the_metrics(recording_path, tmp_path, data_kwargs):
+    with MetricsStore(tmp_path / "metrics.sqlite") as store:
+        with pytest.raises(ValueError, match="default Data options"):
+            extract_many([recording_path], store=store, **data_kwargs)
+        assert len(store) == 0
+
+
+def test_store_accepts_the_backends_computing_the_same_metrics(recording_path, tmp_path):
+    with MetricsStore(tmp_path / "metrics.sqlite") as store:
+        (computed,) = extract_many([recording_path], store=store, backend=DataBackend.NUMPY)
+        (stored,) = extract_many([recording_path], store=store)
+    assert computed.succeeded and not computed.from_store
+    assert stored.from_store
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from back_in_the_game_analyses import Data, DataBackend, DataTag, all_jump_events
+from back_in_the_game_analyses.data_extraction import _jump_crossings
+from back_in_the_game_analyses.events import DataIndicesExtraction
+from benchmarks.synthetic import QUEST_FRAME_RATES, synthetic_recording, write_synthetic_recording
+
+_ANALYSES_FOLDER = Path(__file__).resolve().parents[1]
+
+
+def test_synthetic_recording_has_the_columns_of_the_unity_exports():
+    header, values = synthetic_recording(duration=2.0, frame_rate=90.0)
+    assert values.shape == (180, len(header))
+    assert header == [DataTag.FRAME.value] + [column for tag in DataTag if tag != DataTag.FRAME for column in tag.value]
+
+
+@pytest.mark.parametrize("frame_rate", QUEST_FRAME_RATES)
+def test_synthetic_jumps_are_detected_where_they_were_generated(tmp_path, frame_rate):
+    jumps = (3.0, 10.0)
+    path = write_synthetic_recording(tmp_path / "trial.csv", duration=15.0, frame_rate=frame_rate, jumps=jumps)
+    data = Data(path, backend=DataBackend.NUMPY)
+
+    detected = all_jump_events(_jump_crossings(data))
+    assert len(detected) == len(jumps)
+    for events, jump in zip(detected, jumps):
+        # The toe-off is at the end of the 0.8 s squat
+        assert events[DataIndicesExtraction.TOE_OFF] == pytest.approx((jump + 0.8) * frame_rate, abs=3)
+
+
+def test_benchmark_run_is_compared_to_the_previous_one(tmp_path):
+    results_path = tmp_path / "results.jsonl"
+    environment = {**os.environ, "PYTHONPATH": str(_ANALYSES_FOLDER)}
+    command = [
+        sys.executable,
+        str(_ANALYSES_FOLDER / "benchmarks" / "run.py"),
+        "--durations",
+        "5",
+        "--repeat",
+        "1",
+        "--skip-runner",
+    ]
+    for _ in range(2):
+        output = subprocess.run(
+            command + ["--output", str(results_path)], env=environment, capture_output=True, text=True, check=True
+        ).stdout
+
+    records = [json.loads(line) for line in results_path.read_text().splitlines()]
+    assert len(records) == 2
+    assert records[0]["results"].keys() == records[1]["results"].keys()
+    assert "data_extraction/numpy/5s@72Hz" in records[1]["results"]
+    assert "Change vs previous (%)" in output
@@ -0,0 +1,33 @@
+import os
+
+import numpy as np
+import pytest
+
+from back_in_the_game_analyses import Data, DataBackend, binary_recording_path, convert_to_binary, data_extraction
+
+
+@pytest.fixture(scope="module")
+def binary_path(recording_path, tmp_path_factory):
+    return convert_to_binary(recording_path, tmp_path_factory.mktemp("binary") / "trial.npyrec")
+
+
+@pytest.mark.parametrize("backend", list(DataBackend))
+def test_binary_recording_computes_the_metrics_of_the_csv(recording_path, binary_path, backend):
+    expected = data_extraction(Data(recording_path, backend=backend))
+    metrics = data_extraction(Data(binary_path, backend=backend))
+    for metric, value in expected.items():
+        assert metrics[metric] == value or (np.isnan(value) and np.isnan(metrics[metric])), metric
+
+
+def test_binary_recording_is_only_preferred_when_up_to_date(recording_path, tmp_path):
+    csv_path = tmp_path / "trial.csv"
+    csv_path.write_bytes(recording_path.read_bytes())
+    assert Data(csv_path, prefer_binary=True)._data_path == csv_path
+
+    binary_path = convert_to_binary(csv_path)
+    assert binary_path == binary_recording_path(csv_path)
+    assert Data(csv_path, prefer_binary=True)._data_path == binary_path
+
+    stat = binary_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert Data(csv_path, prefer_binary=True)._data_path == csv_path
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from back_in_the_game_analyses import Cohort, Data, DataBackend, DataTag, DataType, data_extraction
+
+
+def test_cohort_metrics_match_the_extraction_of_each_trial(recording_path, short_recording_path):
+    # The shorter trial is padded with NaN in the cohort
+    paths = [recording_path, short_recording_path]
+
+    cohort = Cohort.from_paths(paths)
+    metrics = cohort.metrics()
+    assert list(cohort.lengths) == [Data(path, backend=DataBackend.NUMPY).time_array.shape[0] for path in paths]
+    for i, path in enumerate(paths):
+        expected = data_extraction(Data(path, backend=DataBackend.NUMPY))
+        for metric, values in metrics.items():
+            # The sums are not accumulated in the same order (see `Cohort.metrics`)
+            assert values[i] == pytest.approx(expected[metric], rel=1e-9), (metric, path.name)
+
+
+def test_cohort_metrics_of_resampled_trials(recording_path, gap_recording_path):
+    paths = [recording_path, gap_recording_path]
+    data_kwargs = {"backend": DataBackend.NUMPY, "resample": True, "max_gap": 0.1}
+
+    cohort = Cohort.from_paths(paths, **data_kwargs)
+    np.testing.assert_allclose(cohort.sampling_periods, 1 / 72.0, rtol=1e-3)
+    metrics = cohort.metrics()
+    for i, path in enumerate(paths):
+        expected = data_extraction(Data(path, **data_kwargs))
+        for metric, values in metrics.items():
+            assert values[i] == pytest.approx(expected[metric], rel=1e-9), (metric, path.name)
+
+
+def test_cohort_derivatives_use_the_period_of_the_resampled_trials(recording_path, gap_recording_path):
+    trials = [
+        Data(recording_path, backend=DataBackend.NUMPY),
+        Data(gap_recording_path, backend=DataBackend.NUMPY, resample=True, max_gap=0.1),
+    ]
+    cohort = Cohort(trials, tags=[DataTag.HEAD_POSITION])
+    assert np.isnan(cohort.sampling_periods[0]) and cohort.sampling_periods[1] == trials[1].sampling_period
+
+    velocity = cohort.get(DataTag.HEAD_POSITION, data_type=DataType.VELOCITY)
+    for i, trial in enumerate(trials):
+        np.testing.assert_array_equal(
+            velocity[: cohort.lengths[i], i], trial.get_array(DataTag.HEAD_POSITION, data_type=DataType.VELOCITY)
+        )
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from back_in_the_game_analyses import Data, DataBackend, DataMetrics, DataTag, DataType, data_extraction, required_tags
+
+
+def test_cached_derivatives_match_the_uncached_ones(recording_path):
+    cached = Data(recording_path)
+    uncached = Data(recording_path, use_cache=False)
+    for data_type in DataType:
+        for window in (5, 10):
+            np.testing.assert_array_equal(
+                cached.get(DataTag.LEFT_HAND_POSITION, t=slice(100, 400), data_type=data_type, window=window),
+                uncached.get(DataTag.LEFT_HAND_POSITION, t=slice(100, 400), data_type=data_type, window=window),
+            )
+
+    metrics = data_extraction(cached)
+    for metric, value in data_extraction(uncached).items():
+        assert metrics[metric] == value or (np.isnan(value) and np.isnan(metrics[metric])), metric
+
+
+def test_derivatives_are_computed_once_until_the_cache_is_cleared(recording_path):
+    data = Data(recording_path)
+    velocity = data._derivative(DataTag.HEAD_POSITION, 1, 10)
+    assert data._derivative(DataTag.HEAD_POSITION, 1, 10) is velocity
+
+    data.clear_cache(DataTag.LEFT_HAND_POSITION)
+    assert data._derivative(DataTag.HEAD_POSITION, 1, 10) is velocity
+    data.clear_cache(DataTag.HEAD_POSITION)
+    assert data._derivative(DataTag.HEAD_POSITION, 1, 10) is not velocity
+
+
+@pytest.mark.parametrize("backend", list(DataBackend))
+def test_loading_the_required_tags_computes_the_same_metrics(recording_path, backend):
+    data = Data(recording_path, backend=backend, tags=required_tags())
+    assert set(data.tags) == {DataTag.HEAD_POSITION, DataTag.LEFT_HAND_POSITION, DataTag.RIGHT_HAND_POSITION}
+    with pytest.raises(ValueError, match="was not loaded"):
+        data.get_array(DataTag.HEAD_ROTATION)
+
+    metrics = data_extraction(data)
+    for metric, value in data_extraction(Data(recording_path, backend=backend)).items():
+        assert metrics[metric] == value or (np.isnan(value) and np.isnan(metrics[metric])), metric
+
+
+def test_required_tags_of_the_hand_metrics():
+    assert required_tags([DataMetrics.OVERALL_LEFT_HAND_TRAVELED_DISTANCE]) == {DataTag.LEFT_HAND_POSITION}
+    assert required_tags([DataMetrics.PRE_JUMP_RIGHT_HAND_ACCELERATION_PEAK]) == {
+        DataTag.HEAD_POSITION,
+        DataTag.RIGHT_HAND_POSITION,
+    }
@@ -0,0 +1,36 @@
+import pytest
+
+from back_in_the_game_analyses import Data, DataBackend, DataMetrics, data_extraction, jump_segmentation
+from back_in_the_game_analyses.events import DataIndicesExtraction
+
+# The jumps of the recording_path fixture (at 72 Hz), and the height of the synthetic jumps (v0² / 2g)
+_JUMPS = (3.0, 9.0, 15.0)
+_FRAME_RATE = 72.0
+_JUMP_HEIGHT = 2.2**2 / (2 * 9.81)
+
+
+def test_jump_segmentation_matches_the_extraction_of_the_first_jump(recording_path):
+    data = Data(recording_path, backend=DataBackend.NUMPY)
+    expected = data_extraction(data)
+    episodes = jump_segmentation(data)
+
+    assert len(episodes) == len(_JUMPS)
+    assert episodes[0].t.start == 0 and episodes[-1].t.stop == data.time_array.shape[0]
+    for previous, episode in zip(episodes, episodes[1:]):
+        assert previous.t.stop == episode.t.start
+
+    first = episodes[0]
+    assert first.indices == expected[DataMetrics.JUMP_INDICES]
+    # The overall and post-jump metrics of an episode stop at its last frame, not at the end of the recording
+    for metric in DataMetrics:
+        if metric.name.startswith(("OVERALL_", "POST_JUMP_")) or metric == DataMetrics.JUMP_INDICES:
+            continue
+        assert first.metrics[metric] == expected[metric], metric
+
+
+def test_each_episode_holds_its_own_jump(recording_path):
+    data = Data(recording_path, backend=DataBackend.NUMPY)
+    for episode, jump in zip(jump_segmentation(data), _JUMPS):
+        # The toe-off of the synthetic jumps is at the end of the 0.8 s squat
+        assert episode.indices[DataIndicesExtraction.TOE_OFF] == pytest.approx((jump + 0.8) * _FRAME_RATE, abs=3)
+        assert episode.metrics[DataMetrics.JUMP_HEIGHT] == pytest.approx(_JUMP_HEIGHT, abs=0.03)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from back_in_the_game_analyses import (
+    Data,
+    DataBackend,
+    DataMetrics,
+    DataTag,
+    DataType,
+    DerivativeMethod,
+    data_extraction,
+)
+from benchmarks.synthetic import write_synthetic_recording
+
+_FILTERED_METHODS = (DerivativeMethod.SAVITZKY_GOLAY, DerivativeMethod.RECURSIVE)
+
+
+@pytest.mark.parametrize("derivative_method", _FILTERED_METHODS)
+def test_jump_events_do_not_depend_on_the_derivative_method(recording_path, derivative_method):
+    expected = data_extraction(Data(recording_path, backend=DataBackend.NUMPY))
+    metrics = data_extraction(Data(recording_path, backend=DataBackend.NUMPY, derivative_method=derivative_method))
+
+    assert metrics[DataMetrics.JUMP_INDICES] == expected[DataMetrics.JUMP_INDICES]
+    assert all(index is not None for index in metrics[DataMetrics.JUMP_INDICES].values())
+    for metric in (DataMetrics.SQUAT_HEIGHT, DataMetrics.JUMP_HEIGHT, DataMetrics.JUMP_DISTANCE):
+        assert metrics[metric] == expected[metric]
+    # The kinematic metrics are still computed on the derivatives of the method
+    peak = DataMetrics.OVERALL_LEFT_HAND_ACCELERATION_PEAK
+    assert np.isfinite(metrics[peak]) and metrics[peak] != expected[peak]
+
+
+def test_compact_derivatives_of_other_windows_are_not_overwritten(recording_path):
+    for use_cache in (True, False):
+        data = Data(recording_path, backend=DataBackend.COMPACT, use_cache=use_cache)
+        # The derivative arrays themselves, as the metrics get them through `get_array` slices
+        velocity = data._derivative(DataTag.HEAD_POSITION, 1, 10)
+        expected = velocity.copy()
+        data._derivative(DataTag.HEAD_POSITION, 1, 5)
+        data._derivative(DataTag.HEAD_POSITION, 2, 5)
+        np.testing.assert_array_equal(velocity, expected)
+
+
+@pytest.mark.parametrize("derivative_method", list(DerivativeMethod))
+def test_derivatives_share_the_scale_of_the_central_difference(derivative_method):
+    # A slow oscillation, whose derivatives all the methods approximate closely
+    time = np.arange(0, 20, 1 / 72)
+    omega = 2 * np.pi * 0.3
+    position = np.column_stack([np.zeros_like(time), np.sin(omega * time), np.zeros_like(time)])
+    data = Data.from_arrays(time, {DataTag.HEAD_POSITION: position}, derivative_method=derivative_method)
+
+    window = 10
+    for order, data_type in enumerate((DataType.VELOCITY, DataType.ACCELERATION), start=1):
+        values = data.get_array(DataTag.HEAD_POSITION, t=slice(200, -200), data_type=data_type, window=window)
+        assert np.abs(values[:, 1]).max() == pytest.approx((omega * window) ** order, rel=0.05), data_type
+
+
+@pytest.mark.parametrize("derivative_method", _FILTERED_METHODS)
+def test_metrics_agree_across_derivative_methods(tmp_path, derivative_method):
+    # Without the noise of the hands, which each filter amplifies differently
+    path = write_synthetic_recording(
+        tmp_path / "orthovr1" / "smooth.csv", duration=20.0, jumps=(3.0, 9.0, 15.0), hand_noise=0.0, seed=1
+    )
+    expected = data_extraction(Data(path, backend=DataBackend.NUMPY))
+    metrics = data_extraction(Data(path, backend=DataBackend.NUMPY, derivative_method=derivative_method))
+
+    assert metrics[DataMetrics.JUMP_INDICES] == expected[DataMetrics.JUMP_INDICES]
+    for metric, value in expected.items():
+        if metric != DataMetrics.JUMP_INDICES:
+            # The synthetic take-offs and landings are instantaneous, so the acceleration peaks depend on how much
+            # each filter blurs them. A difference of scale would be a factor of window (10) or window squared.
+            assert metrics[metric] == pytest.approx(value, rel=0.6), metric
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from back_in_the_game_analyses import events
+from back_in_the_game_analyses import Data, DataAxis, DataBackend, DataTag, DataType
+from back_in_the_game_analyses.events import (
+    GRAVITY,
+    VELOCITY_SAFETY_THRESHOLD,
+    VELOCITY_THRESHOLD,
+    DataIndicesExtraction,
+    JumpCrossings,
+    JumpCrossingsGrid,
+    ThresholdCrossings,
+    all_jump_events,
+    jump_events,
+)
+
+# The squats of the recording_path fixture start at these times (s) and last 0.8 s, at 72 Hz
+_JUMPS = (3.0, 9.0, 15.0)
+_FRAME_RATE = 72.0
+
+
+def _head_signals(recording_path) -> tuple[np.ndarray, np.ndarray]:
+    data = Data(recording_path, backend=DataBackend.NUMPY)
+    velocity = data.get_array(DataTag.HEAD_POSITION, data_type=DataType.VELOCITY, axis=DataAxis.VERTICAL)[:, 0]
+    acceleration = data.get_array(DataTag.HEAD_POSITION, data_type=DataType.ACCELERATION, axis=DataAxis.VERTICAL)
+    return velocity, acceleration[:, 0]
+
+
+def test_threshold_crossings_answer_as_a_scan_of_the_mask():
+    mask = np.random.default_rng(0).random(200) < 0.3
+    crossings = ThresholdCrossings(mask)
+    for frame in range(mask.shape[0]):
+        after = np.flatnonzero(mask[frame:])
+        assert crossings.first_from(frame) == (frame + after[0] if after.size else None)
+        before = np.flatnonzero(mask[20 : frame + 1])
+        assert crossings.last_until(frame, start=20) == (20 + before[-1] if before.size else None)
+
+
+def test_jump_events_match_a_scan_of_the_signals(recording_path):
+    velocity, acceleration = _head_signals(recording_path)
+
+    def first(mask: np.ndarray, start: int) -> int:
+        return start + int(np.flatnonzero(mask[start:])[0])
+
+    squat_start_tp = first(velocity < VELOCITY_SAFETY_THRESHOLD, 0)
+    squat_start = int(np.flatnonzero(velocity[: squat_start_tp + 1] >= VELOCITY_THRESHOLD)[-1])
+    squat_deepest = first(velocity >= 0, squat_start)
+    toe_off = first(acceleration <= GRAVITY, squat_deepest)
+    highest_point = first(velocity <= 0, toe_off)
+    expected = {
+        DataIndicesExtraction.SQUAT_START: squat_start,
+        DataIndicesExtraction.SQUAT_DEEPEST: squat_deepest,
+        DataIndicesExtraction.SQUAT_END: first(velocity < 0, squat_deepest),
+        DataIndicesExtraction.TOE_OFF: toe_off,
+        DataIndicesExtraction.HIGHEST_POINT: highest_point,
+        DataIndicesExtraction.RECEPTION: first(acceleration >= GRAVITY, highest_point),
+    }
+    assert jump_events(JumpCrossings(velocity, acceleration)) == expected
+
+
+def test_all_jump_events_finds_every_jump(recording_path):
+    jumps = all_jump_events(JumpCrossings(*_head_signals(recording_path)))
+    assert len(jumps) == len(_JUMPS)
+    for events, jump in zip(jumps, _JUMPS):
+        # The toe-off of the synthetic jumps is at the end of the 0.8 s squat
+        assert events[DataIndicesExtraction.TOE_OFF] == pytest.approx((jump + 0.8) * _FRAME_RATE, abs=3)
+    for previous, events in zip(jumps, jumps[1:]):
+        assert previous[DataIndicesExtraction.RECEPTION] < events[DataIndicesExtraction.SQUAT_START]
+    assert jumps[0] == jump_events(JumpCrossings(*_head_signals(recording_path)))
+
+
+def test_squat_too_close_to_the_start_is_invalid(recording_path):
+    velocity, acceleration = _head_signals(recording_path)
+    crossings = JumpCrossings(velocity, acceleration)
+    squat_start = jump_events(crossings)[DataIndicesExtraction.SQUAT_START]
+    invalid = jump_events(crossings, minimum_squat_start_index=squat_start + 1)
+    assert all(index is None for index in invalid.values())
+
+
+def test_crossings_grid_only_compares_the_signals_to_the_grid_thresholds(recording_path, monkeypatch):
+    velocity, acceleration = _head_signals(recording_path)
+    safety_thresholds, thresholds, gravities = (-5.0, -4.0), (-2.0,), (-9.81, -12.0, -15.0)
+
+    n_crossings = 0
+
+    class CountedCrossings(ThresholdCrossings):
+        def __init__(self, mask: np.ndarray):
+            nonlocal n_crossings
+            n_crossings += 1
+            super().__init__(mask)
+
+    monkeypatch.setattr(events, "ThresholdCrossings", CountedCrossings)
+    grid = JumpCrossingsGrid(velocity, acceleration, safety_thresholds, thresholds, gravities)
+    # The three crossings of the sign of the velocity, then one per threshold (two per gravity)
+    assert n_crossings == 3 + len(safety_thresholds) + len(thresholds) + 2 * len(gravities)
+    monkeypatch.undo()
+
+    for safety_threshold in safety_thresholds:
+        for gravity in gravities:
+            expected = JumpCrossings(velocity, acceleration, safety_threshold, thresholds[0], gravity)
+            crossings = grid.crossings(safety_threshold, thresholds[0], gravity)
+            assert all_jump_events(crossings) == all_jump_events(expected), (safety_threshold, gravity)
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+_ANALYSES_FOLDER = Path(__file__).resolve().parents[1]
+
+_IMPORTED_MODULES = """
+import sys
+import back_in_the_game_analyses
+print("\\n".join(sys.modules))
+"""
+
+_LAZY_MODULES = {"batch", "report", "metrics_store", "streaming", "ingest", "sweep", "plotting"}
+
+
+def _imported_modules() -> set[str]:
+    environment = {**os.environ, "PYTHONPATH": str(_ANALYSES_FOLDER)}
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORTED_MODULES], env=environment, capture_output=True, text=True, check=True
+    )
+    return set(output.stdout.split())
+
+
+def test_package_import_does_not_load_the_deferred_modules():
+    modules = _imported_modules()
+    top_level_modules = {module.split(".")[0] for module in modules}
+    assert top_level_modules.isdisjoint({"scipy", "matplotlib", "openpyxl", "pyarrow"})
+    assert modules.isdisjoint({f"back_in_the_game_analyses.{module}" for module in _LAZY_MODULES})
+
+
+def test_lazy_names_are_imported_at_their_first_access():
+    import back_in_the_game_analyses
+
+    assert back_in_the_game_analyses.MetricsStore is back_in_the_game_analyses.metrics_store.MetricsStore
+    assert back_in_the_game_analyses.extract_many is back_in_the_game_analyses.batch.extract_many
+    assert set(back_in_the_game_analyses.__all__) <= set(dir(back_in_the_game_analyses))
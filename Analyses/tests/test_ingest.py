@@ -0,0 +1,27 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from back_in_the_game_analyses import Data, DataMetrics, RecordingWatcher, data_extraction
+from back_in_the_game_analyses.ingest import simulate_csv_writer
+
+
+async def _watch_simulated_recording(source_path, data_path):
+    watcher = RecordingWatcher(data_path, poll_interval=0.01, idle_timeout=0.5, include_existing=True)
+    writer = asyncio.create_task(simulate_csv_writer(source_path, data_path / "orthovr1" / "live.csv", speed=50.0))
+    async for result in watcher.watch():
+        watcher.stop()
+    return await writer, result
+
+
+def test_watched_recording_matches_the_offline_extraction(recording_path, tmp_path):
+    path, result = asyncio.run(_watch_simulated_recording(recording_path, tmp_path))
+    assert result.path == path and result.succeeded, result.error
+
+    expected = data_extraction(Data(path))
+    assert result.metrics[DataMetrics.JUMP_INDICES] == expected[DataMetrics.JUMP_INDICES]
+    for metric, value in expected.items():
+        if metric != DataMetrics.JUMP_INDICES:
+            assert result.metrics[metric] == pytest.approx(value, rel=1e-12, nan_ok=True), metric
+    assert np.isfinite(result.metrics[DataMetrics.JUMP_HEIGHT])
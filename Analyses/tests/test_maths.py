@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from back_in_the_game_analyses.maths import (
+    confidence_scale,
+    fit_confidence_ellipse,
+    fit_confidence_ellipse_array,
+    fit_confidence_ellipse_batch,
+)
+
+
+@pytest.fixture(scope="module")
+def points() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.multivariate_normal([0.3, -0.2], [[0.04, 0.015], [0.015, 0.01]], size=500)
+
+
+def test_ellipse_matches_the_principal_axes_of_the_covariance(points):
+    df = pd.DataFrame(points, columns=["x", "z"])
+    eigenvalues, eigenvectors = np.linalg.eigh(df.cov().to_numpy())
+    k = confidence_scale(0.9)
+    theta = np.arctan(eigenvectors[1, 1] / eigenvectors[0, 1])
+
+    (ellipse,) = fit_confidence_ellipse(df, confidence=0.9).to_dict("records")
+    assert ellipse == pytest.approx(
+        {
+            "center_x": df["x"].mean(),
+            "center_y": df["z"].mean(),
+            "a": np.sqrt(eigenvalues[1]) * k,
+            "b": np.sqrt(eigenvalues[0]) * k,
+            "theta": theta,
+        },
+        rel=1e-12,
+    )
+    assert tuple(fit_confidence_ellipse_array(points, confidence=0.9)) == tuple(ellipse.values())
+
+
+def test_batch_ellipses_match_the_ellipse_of_each_set(points):
+    lengths = np.array([500, 120, 1])
+    data = np.zeros((500, 3, 2))
+    for s, length in enumerate(lengths):
+        data[:length, s] = points[:length]
+
+    ellipses = fit_confidence_ellipse_batch(data, lengths)
+    for s, length in enumerate(lengths[:2]):
+        expected = fit_confidence_ellipse_array(points[:length])
+        for parameter, value in zip(expected._fields, expected):
+            assert getattr(ellipses, parameter)[s] == pytest.approx(value, rel=1e-12), (parameter, s)
+    assert np.isnan(ellipses.a[2]) and np.isnan(ellipses.theta[2])
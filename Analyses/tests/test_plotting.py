@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from back_in_the_game_analyses import (
+    Data,
+    DataBackend,
+    DataMetrics,
+    DataType,
+    data_extraction,
+    head_kinematics_plot,
+    iter_extract_and_render_many,
+    jump_segmentation,
+    render_head_kinematics_many,
+)
+from back_in_the_game_analyses.events import DataIndicesExtraction
+from back_in_the_game_analyses.plotting import minmax_decimation_indices
+from back_in_the_game_analyses.profiling import profile
+
+
+def test_minmax_decimation_keeps_the_extrema_of_each_bin():
+    values = np.random.default_rng(0).normal(size=(10_000, 3))
+    values[4321, 1] = np.nan
+    indices = minmax_decimation_indices(values, bins=50)
+
+    assert indices[0] == 0 and indices[-1] == values.shape[0] - 1
+    assert len(indices) <= 2 * 50 * 3 + 2 and np.all(np.diff(indices) > 0)
+    bins = indices // 200
+    for b in range(50):
+        kept = values[indices[bins == b]]
+        bin_values = values[b * 200 : (b + 1) * 200]
+        np.testing.assert_array_equal(np.nanmax(kept, axis=0), np.nanmax(bin_values, axis=0))
+        np.testing.assert_array_equal(np.nanmin(kept, axis=0), np.nanmin(bin_values, axis=0))
+
+
+def test_plot_holds_the_decimated_signals_and_the_events_of_each_jump(recording_path):
+    plot = head_kinematics_plot(Data(recording_path, backend=DataBackend.NUMPY), bins=100)
+    assert plot.title == "orthovr1 - trial"
+    assert len(plot.events) == 3
+    for data_type in DataType:
+        time, values = plot.signals[data_type]
+        assert time.shape[0] == values.shape[0] <= 2 * 100 * 3 + 2 and values.shape[1] == 3
+
+
+@pytest.mark.parametrize("output", ["figures", "figures.pdf"])
+def test_figures_are_rendered_without_a_display(recording_path, tmp_path, output):
+    (result,) = render_head_kinematics_many([recording_path], tmp_path / output, bins=100)
+    assert result.succeeded, result.error
+    assert result.metrics.is_file() and result.metrics.stat().st_size > 0
+
+
+@pytest.mark.parametrize("extraction", [data_extraction, jump_segmentation])
+def test_figures_are_rendered_from_the_recordings_loaded_for_the_metrics(recording_path, tmp_path, extraction):
+    with profile() as profiler:
+        ((result, figure),) = iter_extract_and_render_many(
+            [recording_path], tmp_path / "figures", extraction=extraction, bins=100, backend=DataBackend.NUMPY
+        )
+    assert result.succeeded, result.error
+    assert figure == tmp_path / "figures" / "orthovr1" / "trial.png" and figure.is_file()
+    assert profiler.to_dict()["stages"]["Data.__init__"]["calls"] == 1
+    assert profiler.to_dict()["stages"]["_jump_crossings"]["calls"] == 1
+
+    expected = extraction(Data(recording_path, backend=DataBackend.NUMPY))
+    if extraction is data_extraction:
+        assert result.metrics[DataMetrics.JUMP_INDICES] == expected[DataMetrics.JUMP_INDICES]
+    else:
+        assert [episode.indices for episode in result.metrics] == [episode.indices for episode in expected]
+
+
+def test_plot_draws_the_given_jump_events(recording_path):
+    data = Data(recording_path, backend=DataBackend.NUMPY)
+    jump_indices = data_extraction(data)[DataMetrics.JUMP_INDICES]
+    plot = head_kinematics_plot(data, bins=100, jump_indices=[jump_indices])
+    assert plot.events == [tuple(float(data.time_array[jump_indices[idx]]) for idx in DataIndicesExtraction)]
@@ -0,0 +1,25 @@
+from back_in_the_game_analyses import Data, DataBackend, data_extraction, extract_many
+from back_in_the_game_analyses.profiling import active_profiler, profile
+
+
+def test_profiling_is_only_enabled_within_profile(recording_path):
+    assert active_profiler() is None
+    with profile() as profiler:
+        assert active_profiler() is profiler
+        data_extraction(Data(recording_path, backend=DataBackend.NUMPY))
+    assert active_profiler() is None
+
+    statistics = profiler.to_dict()
+    assert statistics["stages"]["Data.__init__"]["calls"] == 1
+    assert statistics["stages"]["data_extraction"]["calls"] == 1
+    # The velocity of the head is shared by the event detection and the acceleration of the head
+    derivatives = statistics["caches"]["Data._derivative"]
+    assert derivatives["hits"] > 0 and derivatives["misses"] > 0
+    assert set(profiler.summary()["Stage"]) >= {"Data.__init__", "data_extraction", "Data._derivative"}
+
+
+def test_worker_statistics_are_merged_into_the_profiler_of_the_caller(recording_path):
+    with profile() as profiler:
+        results = extract_many([recording_path, recording_path], workers=2)
+    assert all(result.succeeded for result in results)
+    assert profiler.to_dict()["stages"]["data_extraction"]["calls"] == 2
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from back_in_the_game_analyses import (
+    CORE_METRICS,
+    Data,
+    DataAxis,
+    DataBackend,
+    DataIndicesExtraction,
+    DataMetrics,
+    DataTag,
+    MetricWindow,
+    data_extraction,
+)
+
+
+def test_subset_of_the_metrics_matches_the_full_extraction(recording_path):
+    data = Data(recording_path, backend=DataBackend.NUMPY)
+    expected = data_extraction(data)
+    keys = [DataMetrics.JUMP_HEIGHT, DataMetrics.OVERALL_LEFT_HAND_TRAVELED_DISTANCE]
+    assert data_extraction(data, metrics=keys) == {key: expected[key] for key in keys}
+
+
+def test_events_are_only_detected_when_a_metric_needs_them(recording_path):
+    data = Data(recording_path, backend=DataBackend.NUMPY)
+    overall = [DataMetrics.OVERALL_HEAD_HORIZONTAL_DISPERSION, DataMetrics.OVERALL_LEFT_HAND_ACCELERATION_PEAK]
+    assert CORE_METRICS.required_events(overall) == set()
+    assert CORE_METRICS.compute(data, keys=overall).keys() == set(overall)
+
+    with pytest.raises(ValueError, match="need the jump events"):
+        CORE_METRICS.compute(data, keys=[DataMetrics.PRE_JUMP_HEAD_HORIZONTAL_DISPERSION])
+    assert CORE_METRICS.required_events([DataMetrics.PRE_JUMP_HEAD_HORIZONTAL_DISPERSION]) == {
+        DataIndicesExtraction.TOE_OFF
+    }
+    assert CORE_METRICS.required_tags([DataMetrics.OVERALL_LEFT_HAND_ACCELERATION_PEAK]) == {DataTag.LEFT_HAND_POSITION}
+
+
+def test_site_specific_metrics_are_added_to_a_copy_of_the_core_metrics(recording_path):
+    registry = CORE_METRICS.copy()
+
+    @registry.register(
+        "pre_jump_head_range", "Pre-jump head vertical range", (DataTag.HEAD_POSITION,), window=MetricWindow.PRE_JUMP
+    )
+    def head_range(data, t, jump_indices, derivative_window):
+        values = data.get_array(DataTag.HEAD_POSITION, t=t, axis=DataAxis.VERTICAL)
+        return np.ptp(values)
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register("pre_jump_head_range", "", ())(head_range)
+    assert "pre_jump_head_range" not in CORE_METRICS
+
+    data = Data(recording_path, backend=DataBackend.NUMPY)
+    metrics = data_extraction(data, metrics=["pre_jump_head_range", DataMetrics.JUMP_INDICES], registry=registry)
+    toe_off = metrics[DataMetrics.JUMP_INDICES][DataIndicesExtraction.TOE_OFF]
+    expected = np.ptp(data.get_array(DataTag.HEAD_POSITION, t=slice(None, toe_off), axis=DataAxis.VERTICAL))
+    assert metrics["pre_jump_head_range"] == expected
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from back_in_the_game_analyses import ReportWriter, iter_report_rows
+from benchmarks.synthetic import write_synthetic_recording
+
+_ANALYSES_FOLDER = Path(__file__).resolve().parents[1]
+
+
+def test_csv_rows_are_readable_before_the_report_is_closed(tmp_path):
+    path = tmp_path / "report.csv"
+    with ReportWriter(path, ["Subject", "File", "Value"], key_columns=["Subject", "File"]) as report:
+        report.write(["orthovr1", "a.csv", 1.5])
+        assert list(iter_report_rows(path)) == [["Subject", "File", "Value"], ["orthovr1", "a.csv", 1.5]]
+
+    with ReportWriter(path, ["Subject", "File", "Value"], key_columns=["Subject", "File"], resume=True) as report:
+        assert report.completed("orthovr1", "a.csv")
+        assert not report.completed("orthovr1", "b.csv")
+
+
+def test_rows_written_together_are_all_or_none_in_the_report(tmp_path):
+    path = tmp_path / "report.csv"
+
+    def trial_rows():
+        yield ["orthovr1", "a.csv", 1, 0.2]
+        raise KeyboardInterrupt
+
+    with ReportWriter(path, ["Subject", "File", "Jump", "Value"], key_columns=["Subject", "File"]) as report:
+        report.write_rows([["orthovr1", "b.csv", 1, 0.1], ["orthovr1", "b.csv", 2, 0.3]])
+        try:
+            report.write_rows(trial_rows())
+        except KeyboardInterrupt:
+            pass
+
+    with ReportWriter(
+        path, ["Subject", "File", "Jump", "Value"], key_columns=["Subject", "File"], resume=True
+    ) as report:
+        assert report.completed("orthovr1", "b.csv")
+        assert not report.completed("orthovr1", "a.csv")
+    assert [row[2] for row in list(iter_report_rows(path))[1:]] == [1, 2]
+
+
+def test_text_columns_are_not_parsed_as_numbers(tmp_path):
+    path = tmp_path / "report.csv"
+    with ReportWriter(path, ["Subject", "File", "Value"]) as report:
+        report.write(["orthovr1", "001", 1.5])
+    assert list(iter_report_rows(path))[1] == ["orthovr1", 1, 1.5]
+    assert list(iter_report_rows(path, text_columns=["File"]))[1] == ["orthovr1", "001", 1.5]
+
+
+def test_parquet_report_is_resumed_from_its_complete_parts(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "report.parquet"
+    header = ["Subject", "File", "Value"]
+    # An interrupted run: the last row is still buffered, and the second part file is being written
+    report = ReportWriter(path, header, key_columns=["Subject", "File"], row_group_size=2)
+    report.write_rows([["orthovr1", "a.csv", 0.1], ["orthovr1", "b.csv", 0.2]])
+    report.write(["orthovr1", "c.csv", 0.3])
+    (path / "part-00001.parquet.partial").write_bytes(b"PAR1")
+    assert list(iter_report_rows(path))[1:] == [["orthovr1", "a.csv", 0.1], ["orthovr1", "b.csv", 0.2]]
+
+    with ReportWriter(path, header, key_columns=["Subject", "File"], resume=True) as report:
+        assert report.completed("orthovr1", "a.csv") and report.completed("orthovr1", "b.csv")
+        assert not report.completed("orthovr1", "c.csv")
+        report.write(["orthovr1", "c.csv", 0.3])
+    assert [row[1] for row in list(iter_report_rows(path))[1:]] == ["a.csv", "b.csv", "c.csv"]
+    assert not list(path.glob("*.partial"))
+
+
+def test_per_jump_run_records_the_trials_without_jumps(tmp_path):
+    write_synthetic_recording(tmp_path / "data" / "orthovr1" / "still.csv", duration=5.0, jumps=())
+    environment = {**os.environ, "PYTHONPATH": str(_ANALYSES_FOLDER), "DATA_PATH": str(tmp_path / "data")}
+    command = [sys.executable, str(_ANALYSES_FOLDER / "runner" / "main.py"), "--per-jump", "--no-xlsx", "--resume"]
+
+    subprocess.run(command, cwd=tmp_path, env=environment, capture_output=True, check=True)
+    rows = list(iter_report_rows(tmp_path / "metrics.csv", text_columns=["Subject", "File"]))[1:]
+    assert [row[:3] for row in rows] == [["orthovr1", "still.csv", 0]]
+    assert all(value is None for value in rows[0][3:])
+
+    output = subprocess.run(command, cwd=tmp_path, env=environment, capture_output=True, text=True, check=True)
+    assert "1 file(s) already analysed are skipped" in output.stdout
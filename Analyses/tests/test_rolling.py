@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from back_in_the_game_analyses import (
+    CORE_METRICS,
+    Data,
+    DataBackend,
+    DataMetrics,
+    DataTag,
+    rolling_horizontal_dispersion,
+    rolling_metrics,
+    rolling_window_starts,
+)
+
+
+@pytest.mark.parametrize("backend", [DataBackend.NUMPY, DataBackend.COMPACT])
+def test_rolling_metrics_match_the_extraction_of_each_window(recording_path, backend):
+    data = Data(recording_path, backend=backend)
+    rolling = rolling_metrics(data, duration=2.0)
+    starts = rolling_window_starts(data.time_array, 2.0)
+
+    n_frames = data.time_array.shape[0]
+    assert all(values.shape == (n_frames,) for values in rolling.values())
+    assert all(np.isnan(values[0]) for values in rolling.values())
+    for i in np.linspace(n_frames // 4, n_frames - 1, 20).astype(int):
+        expected = CORE_METRICS.compute(data, keys=rolling, t=slice(starts[i], i + 1))
+        for metric, value in expected.items():
+            # The running sums accumulate the rounding errors along the recording
+            assert rolling[metric][i] == pytest.approx(value, rel=1e-6), (metric, i)
+
+
+def test_rolling_dispersion_ignores_the_missing_positions(gap_recording_path):
+    data = Data(gap_recording_path, backend=DataBackend.NUMPY, resample=True, max_gap=0.1)
+    dispersion = rolling_horizontal_dispersion(data, DataTag.HEAD_POSITION, duration=2.0)
+    starts = rolling_window_starts(data.time_array, 2.0)
+
+    missing = np.flatnonzero(np.isnan(data.get_array(DataTag.HEAD_POSITION)).any(axis=1))
+    assert missing.size > 0
+    # The windows holding the gap, up to the one ending just after it
+    for i in (missing[0], missing[-1], missing[-1] + 1, missing[0] + 100):
+        (value,) = CORE_METRICS.compute(
+            data, keys=[DataMetrics.OVERALL_HEAD_HORIZONTAL_DISPERSION], t=slice(starts[i], i + 1)
+        ).values()
+        assert np.isfinite(dispersion[i])
+        assert dispersion[i] == pytest.approx(value, rel=1e-6), i
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from back_in_the_game_analyses import (
+    Data,
+    DataAxis,
+    DataBackend,
+    DataMetrics,
+    DataTag,
+    data_extraction,
+    resample_uniform,
+    sampling_report,
+)
+from back_in_the_game_analyses.maths import confidence_scale, fit_confidence_ellipse_array
+
+_DISPERSIONS = (
+    DataMetrics.OVERALL_HEAD_HORIZONTAL_DISPERSION,
+    DataMetrics.PRE_JUMP_HEAD_HORIZONTAL_DISPERSION,
+    DataMetrics.POST_JUMP_HEAD_HORIZONTAL_DISPERSION,
+)
+
+
+def test_sampling_report_detects_the_gap(gap_recording_path):
+    report = Data(gap_recording_path, backend=DataBackend.NUMPY).sampling
+    assert report.sampling_rate == pytest.approx(72.0, rel=1e-3)
+    assert report.n_gaps == 1
+    assert report.n_dropped_frames == 30
+    assert report.longest_gap == pytest.approx(31 / 72, rel=1e-2)
+
+
+def test_resample_uniform_leaves_long_gaps_missing():
+    time, arrays, n_missing = resample_uniform(
+        np.array([0.0, 0.1, 0.3, 0.4]), {"x": np.array([0.0, 1.0, 3.0, 4.0])}, 0.1, max_gap=0.15
+    )
+    np.testing.assert_allclose(time, [0.0, 0.1, 0.2, 0.3, 0.4])
+    np.testing.assert_allclose(arrays["x"], [0.0, 1.0, np.nan, 3.0, 4.0])
+    assert n_missing == 1
+
+
+def test_ellipse_ignores_missing_values_as_pandas():
+    values = np.random.default_rng(0).normal(size=(100, 2))
+    values[10:20] = np.nan
+    values[30, 0] = np.nan
+    df = pd.DataFrame(values)
+    cov = df.cov().to_numpy()
+    k2 = confidence_scale(0.95) ** 2
+    fitted = fit_confidence_ellipse_array(values)
+    assert (fitted.center_x, fitted.center_y) == pytest.approx(tuple(df.mean()), rel=1e-12)
+    # The squared axes are the eigenvalues of the covariance matrix, scaled by the chi-square quantile
+    assert fitted.a**2 + fitted.b**2 == pytest.approx(k2 * np.trace(cov), rel=1e-12)
+    assert fitted.a * fitted.b == pytest.approx(k2 * np.sqrt(np.linalg.det(cov)), rel=1e-12)
+
+
+@pytest.mark.parametrize("backend", list(DataBackend))
+def test_metrics_of_a_recording_with_a_gap(gap_recording_path, backend):
+    data = Data(gap_recording_path, backend=backend, resample=True, max_gap=0.1)
+    assert data.sampling.n_missing_frames > 0
+    assert np.isnan(data.get_array(DataTag.HEAD_POSITION, axis=DataAxis.HORIZONTAL)).any()
+
+    metrics = data_extraction(data)
+    for metric in _DISPERSIONS:
+        assert np.isfinite(metrics[metric]), metric
+    for key, value in metrics.items():
+        assert not isinstance(value, np.generic), key
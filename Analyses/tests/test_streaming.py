@@ -0,0 +1,94 @@
+import socket
+import threading
+
+import pytest
+
+from back_in_the_game_analyses import (
+    Data,
+    DataAxis,
+    DataBackend,
+    DataMetrics,
+    DataTag,
+    DataType,
+    StreamingData,
+    StreamingJumpDetector,
+    data_extraction,
+)
+from back_in_the_game_analyses.events import DataIndicesExtraction, JumpCrossings, all_jump_events
+from back_in_the_game_analyses.streaming import replay_csv, stream_jump_events
+
+_JUMP_METRICS = (DataMetrics.SQUAT_HEIGHT, DataMetrics.JUMP_HEIGHT, DataMetrics.JUMP_DISTANCE)
+
+
+def _offline_jumps(data: Data) -> list[dict[DataIndicesExtraction, int]]:
+    velocity = data.get_array(DataTag.HEAD_POSITION, data_type=DataType.VELOCITY, axis=DataAxis.VERTICAL)[:, 0]
+    acceleration = data.get_array(DataTag.HEAD_POSITION, data_type=DataType.ACCELERATION, axis=DataAxis.VERTICAL)
+    return all_jump_events(JumpCrossings(velocity, acceleration[:, 0]))
+
+
+def _stream(data: Data, capacity: int, update_every: int) -> StreamingJumpDetector:
+    streaming_data = StreamingData(tags=data.tags, capacity=capacity)
+    detector = StreamingJumpDetector(streaming_data)
+    time = data.time_array
+    arrays = {tag: data.get_array(tag) for tag in streaming_data.tags}
+    for i in range(time.shape[0]):
+        streaming_data.append(time[i], {tag: values[i] for tag, values in arrays.items()})
+        if (i + 1) % update_every == 0:
+            detector.update()
+    return detector
+
+
+def test_streamed_events_match_the_offline_extraction(recording_path):
+    data = Data(recording_path, backend=DataBackend.NUMPY)
+    expected = data_extraction(data)
+
+    detector = _stream(data, capacity=600, update_every=1)
+    jumps = detector.finalize()
+    assert jumps == _offline_jumps(data) and len(jumps) == 3
+    assert jumps[0] == expected[DataMetrics.JUMP_INDICES]
+    first = detector.jumps_metrics[0]
+    for metric in _JUMP_METRICS:
+        assert first[metric] == pytest.approx(expected[metric], rel=1e-12)
+    assert first[DataMetrics.JUMP_FLIGHT_TIME] == pytest.approx(expected[DataMetrics.JUMP_FLIGHT_TIME])
+
+
+def test_streamed_events_are_reported_once_per_jump(recording_path):
+    data = Data(recording_path, backend=DataBackend.NUMPY)
+    detector = _stream(data, capacity=600, update_every=1)
+    jumps = detector.finalize()
+
+    for jump, indices in enumerate(jumps):
+        events = [event for event in detector.events if event.jump == jump]
+        assert {event.event: event.index for event in events} == indices
+        assert len(events) == len(DataIndicesExtraction)
+    assert detector.indices == jumps[-1]
+
+
+def test_lagging_updates_skip_the_frames_that_left_the_buffer(recording_path):
+    data = Data(recording_path, backend=DataBackend.NUMPY)
+
+    # The frames are scanned before they leave the buffer, the lag only delays the events
+    detector = _stream(data, capacity=600, update_every=500)
+    assert not detector.lagged
+    assert detector.finalize() == _offline_jumps(data)
+
+    # Frames left the buffer before they were scanned: the jumps they held are missed, not mixed with the next ones
+    detector = _stream(data, capacity=200, update_every=250)
+    assert detector.lagged
+    jumps = detector.finalize()
+    assert jumps and all(indices in _offline_jumps(data) for indices in jumps)
+
+
+def test_replayed_recording_matches_the_offline_extraction(recording_path):
+    expected = data_extraction(Data(recording_path, backend=DataBackend.NUMPY))
+
+    server = socket.create_server(("127.0.0.1", 0))
+    replay = threading.Thread(target=replay_csv, args=(recording_path,), kwargs={"server": server})
+    replay.start()
+    detector = stream_jump_events(port=server.getsockname()[1])
+    replay.join()
+
+    # The packets hold float32 values, so the metrics only match up to their precision
+    assert detector.jumps[0] == expected[DataMetrics.JUMP_INDICES]
+    for metric in _JUMP_METRICS:
+        assert detector.jumps_metrics[0][metric] == pytest.approx(expected[metric], rel=1e-5)
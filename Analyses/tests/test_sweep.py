@@ -0,0 +1,40 @@
+import numpy as np
+
+from back_in_the_game_analyses import (
+    Data,
+    DataBackend,
+    DataMetrics,
+    DataTag,
+    DataType,
+    data_extraction,
+    threshold_sweep,
+)
+from back_in_the_game_analyses.events import DataIndicesExtraction
+from back_in_the_game_analyses.maths import compute_norm_array
+
+
+def test_metrics_are_computed_with_the_swept_window(recording_path):
+    data = Data(recording_path, backend=DataBackend.NUMPY)
+    table = threshold_sweep(data, windows=(6, 10), gravities=(-9.81, -50.0)).set_index(["window", "gravity"])
+
+    peak = DataMetrics.PRE_JUMP_LEFT_HAND_ACCELERATION_PEAK
+    for window in (6, 10):
+        row = table.loc[(window, -9.81)]
+        toe_off = int(row[DataIndicesExtraction.TOE_OFF.value])
+        acceleration = data.get_array(
+            DataTag.LEFT_HAND_POSITION, t=slice(None, toe_off), data_type=DataType.ACCELERATION, window=window
+        )
+        assert row[peak.value] == compute_norm_array(acceleration).max()
+    assert table.loc[(6, -9.81), peak.value] != table.loc[(10, -9.81), peak.value]
+
+
+def test_default_row_matches_the_extraction(recording_path):
+    data = Data(recording_path, backend=DataBackend.NUMPY)
+    expected = data_extraction(data)
+    metrics = [metric for metric in DataMetrics if metric != DataMetrics.JUMP_INDICES]
+    (row,) = threshold_sweep(data, metrics=metrics).to_dict("records")
+
+    for event, index in expected[DataMetrics.JUMP_INDICES].items():
+        assert row[event.value] == index, event
+    for metric in metrics:
+        assert row[metric.value] == expected[metric] or (np.isnan(row[metric.value]) and np.isnan(expected[metric]))